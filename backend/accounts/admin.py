@@ -7,6 +7,8 @@ from django.contrib.auth import get_user_model
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 from django.utils.html import format_html
 
+from .authentication import invalidate_cached_user
+
 User = get_user_model()
 
 
@@ -126,7 +128,11 @@ class CustomUserAdmin(BaseUserAdmin):
 
     @admin.action(description="Mark setup status: Live")
     def mark_setup_live(self, request, queryset):
-        n = queryset.update(setup_status="live")
+        ids = list(queryset.values_list("pk", flat=True))
+        n = User.objects.filter(pk__in=ids).update(setup_status="live")
+        # Bulk update skips post_save, so drop cached auth users (MeView shows setup_status)
+        for pk in ids:
+            invalidate_cached_user(pk)
         self.message_user(request, f"Marked {n} user(s) as Live.")
 
     def save_model(self, request, obj, form, change):
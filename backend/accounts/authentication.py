@@ -0,0 +1,89 @@
+"""
+JWT authentication with a short-lived user cache.
+
+Every authenticated API call (and each SSE connect) used to load the user row.
+Resolved users are now cached per (user id, token) for AUTH_USER_CACHE_SECONDS.
+Each user has a generation counter in the cache that is bumped whenever the
+user is saved or deleted (see signals.py), which orphans every cached entry
+for that user at once: deactivation, password changes and profile edits take
+effect on the next request.
+
+The invalidation only reaches other processes through a shared cache, so the
+user cache is off by default with the per-process one (settings.CACHE_SHARED).
+Unsafe methods (POST/PATCH/...) always load the user fresh, so writes never
+start from a cached copy.
+"""
+from __future__ import annotations
+
+import hashlib
+from typing import Callable
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.request import Request
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.settings import api_settings
+
+from .models import User
+
+
+def _generation_key(user_id) -> str:
+    return f"auth:user:{user_id}:gen"
+
+
+def _user_key(user_id, generation: int, raw_token: bytes | str) -> str:
+    if isinstance(raw_token, str):
+        raw_token = raw_token.encode()
+    digest = hashlib.sha256(raw_token).hexdigest()[:32]
+    return f"auth:user:{user_id}:{generation}:{digest}"
+
+
+def user_generation(user_id) -> int:
+    """The user's current generation; it changes whenever the user is saved or deleted."""
+    return cache.get(_generation_key(user_id), 0)
+
+
+def get_cached_user(user_id, raw_token: bytes | str, load: Callable[[], User | None]) -> User | None:
+    """Return the cached user for this id and token, or call `load` and cache its result."""
+    ttl = settings.AUTH_USER_CACHE_SECONDS
+    if ttl <= 0:
+        return load()
+    generation = user_generation(user_id)
+    key = _user_key(user_id, generation, raw_token)
+    user = cache.get(key)
+    if user is None:
+        user = load()
+        if user is not None:
+            cache.set(key, user, ttl)
+    return user
+
+
+def invalidate_cached_user(user_id) -> None:
+    """Drop every cached entry for this user (all tokens)."""
+    key = _generation_key(user_id)
+    cache.add(key, 0, timeout=None)
+    try:
+        cache.incr(key)
+    except ValueError:
+        # Evicted between add and incr
+        cache.set(key, 1, timeout=None)
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """JWTAuthentication that resolves the user through get_cached_user on safe requests."""
+
+    def authenticate(self, request: Request):
+        self._cacheable = request.method in SAFE_METHODS
+        return super().authenticate(request)
+
+    def get_user(self, validated_token):
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        if not getattr(self, "_cacheable", False) or user_id is None:
+            return super().get_user(validated_token)
+        # Inactive users and revoked tokens raise inside super().get_user, so only valid users are cached
+        return get_cached_user(
+            user_id,
+            validated_token.token,
+            lambda: JWTAuthentication.get_user(self, validated_token),
+        )
@@ -0,0 +1,129 @@
+"""
+Per-owner, per-domain version counters for cached results.
+
+Each tenant has one counter per data domain. Anything derived from a domain
+(stats, lists, catalogues) is cached under a key that embeds the current
+version of every domain it reads, e.g.
+
+    key = versioned_key(owner_id, "bookings:stats", ["bookings", "services"])
+    data = cached(key, compute)
+
+Model signals call bump_version() when rows change; the bump happens after the
+transaction commits, so no reader can cache pre-commit data under the new
+version. Old entries are never deleted, only orphaned, and expire with
+CACHE_RESULT_SECONDS. A bump also makes the owner's reads sticky to the
+primary database for a few seconds (config/db_router.py), so a lagging
+replica can't refill the cache with pre-write data. A counter missing from
+the cache (evicted or a fresh cache) starts from the current time in
+microseconds rather than 0, so it can never come back to a value that older
+entries were cached under.
+
+Bulk QuerySet.update()/delete() send no per-row signals; callers bump
+explicitly after them.
+
+A bump only orphans entries in caches that see it, so without a shared cache
+(settings.CACHE_SHARED) cached() computes every time instead of letting other
+workers serve results from before the write.
+"""
+from __future__ import annotations
+
+import hashlib
+import time
+from typing import Any, Callable, Iterable
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from config.db_router import mark_primary_sticky
+
+BOOKINGS = "bookings"
+SERVICES = "services"
+CLIENTS = "clients"
+ALERTS = "alerts"
+CALLS = "calls"
+DOMAINS = (BOOKINGS, SERVICES, CLIENTS, ALERTS, CALLS)
+
+
+def _version_key(owner_id, domain: str) -> str:
+    return f"ver:{owner_id}:{domain}"
+
+
+def _check(domains: Iterable[str]) -> list[str]:
+    domains = list(domains)
+    unknown = set(domains) - set(DOMAINS)
+    if unknown:
+        raise ValueError(f"Unknown cache domain(s): {', '.join(sorted(unknown))}")
+    return domains
+
+
+def _seed() -> int:
+    return time.time_ns() // 1000
+
+
+def get_versions(owner_id, domains: Iterable[str]) -> dict[str, int]:
+    """Current version of each domain for this owner (one cache round trip when all exist)."""
+    domains = _check(domains)
+    keys = {_version_key(owner_id, domain): domain for domain in domains}
+    found = cache.get_many(list(keys))
+    versions = {}
+    for key, domain in keys.items():
+        version = found.get(key)
+        if version is None:
+            seed = _seed()
+            # Another process may have created it meanwhile; use whichever won
+            version = seed if cache.add(key, seed, timeout=None) else cache.get(key, seed)
+        versions[domain] = version
+    return versions
+
+
+def get_version(owner_id, domain: str) -> int:
+    return get_versions(owner_id, [domain])[domain]
+
+
+def _bump_now(owner_id, domains: list[str]) -> None:
+    for domain in domains:
+        key = _version_key(owner_id, domain)
+        try:
+            cache.incr(key)
+        except ValueError:
+            # Never read (nothing cached under it) or evicted: a fresh seed is a new version
+            cache.set(key, _seed(), timeout=None)
+    # Until the replica has the change, read this owner's data (and refill caches) from the primary
+    mark_primary_sticky(owner_id)
+
+
+def bump_version(owner_id, *domains: str) -> None:
+    """Invalidate the owner's cached results for these domains once the transaction commits."""
+    if owner_id is None:
+        return
+    domains = _check(domains)
+    transaction.on_commit(lambda: _bump_now(owner_id, domains))
+
+
+def versioned_key(owner_id, name: str, domains: Iterable[str], *parts: Any) -> str:
+    """
+    Cache key for `name` for this owner, valid until any of `domains` is bumped.
+    Extra parts (query parameters, dates) are hashed into the key.
+    """
+    versions = get_versions(owner_id, domains)
+    version = ".".join(f"{domain}{versions[domain]}" for domain in sorted(versions))
+    key = f"{name}:{owner_id}:{version}"
+    if parts:
+        digest = hashlib.sha256(repr(parts).encode()).hexdigest()[:16]
+        key = f"{key}:{digest}"
+    return key
+
+
+_MISSING = object()
+
+
+def cached(key: str, compute: Callable[[], Any], timeout: int | None = None) -> Any:
+    """Return the value cached under key, computing and storing it on a miss."""
+    if not settings.CACHE_SHARED:
+        return compute()
+    value = cache.get(key, _MISSING)
+    if value is _MISSING:
+        value = compute()
+        cache.set(key, value, settings.CACHE_RESULT_SECONDS if timeout is None else timeout)
+    return value
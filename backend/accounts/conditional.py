@@ -0,0 +1,89 @@
+"""
+Conditional GET (ETag / If-None-Match) for owner-scoped read endpoints.
+
+The ETag is computed before the view runs, from the owner's data versions
+(accounts/cache_versions.py), the request path and any extra inputs the
+response depends on (time buckets, the user's timezone). A matching
+If-None-Match gets a 304 without touching the database beyond auth, so
+dashboards and the Vapi agent can revalidate as often as they like.
+
+Versions are read before the body is computed: a write committing in between
+only makes the next revalidation miss, never serves stale data as fresh.
+
+The versions must be shared by every process answering the owner, so all of
+this is off (no ETag, never 304) unless settings.CONDITIONAL_GET is set, which
+it is by default for every cache backend except per-process locmem.
+"""
+from __future__ import annotations
+
+import hashlib
+from functools import wraps
+from typing import Any, Callable, Iterable
+
+from django.conf import settings
+from django.http import HttpResponseNotModified
+from django.utils.http import parse_etags
+
+from .cache_versions import versioned_key
+
+# Browsers keep the response but revalidate it on every use
+CACHE_CONTROL = "private, no-cache"
+
+
+def owner_etag(owner_id, name: str, domains: Iterable[str], *parts: Any) -> str:
+    key = versioned_key(owner_id, name, domains, *parts)
+    return '"%s"' % hashlib.sha256(key.encode()).hexdigest()[:32]
+
+
+def not_modified(request, etag: str) -> bool:
+    """True if the request's If-None-Match already names this ETag (weak comparison)."""
+    if not settings.CONDITIONAL_GET or request.method not in ("GET", "HEAD"):
+        return False
+    header = request.META.get("HTTP_IF_NONE_MATCH")
+    if not header:
+        return False
+    etags = parse_etags(header)
+    return "*" in etags or any(tag.removeprefix("W/") == etag for tag in etags)
+
+
+def not_modified_response(etag: str) -> HttpResponseNotModified:
+    response = HttpResponseNotModified()
+    response["ETag"] = etag
+    response["Cache-Control"] = CACHE_CONTROL
+    return response
+
+
+def set_etag(response, etag: str):
+    if settings.CONDITIONAL_GET and response.status_code == 200:
+        response["ETag"] = etag
+        response["Cache-Control"] = CACHE_CONTROL
+    return response
+
+
+def conditional_for_owner(
+    name: str,
+    domains: Iterable[str],
+    vary: Callable[[Any], Iterable[Any]] | None = None,
+):
+    """
+    Decorate a viewset method (list, retrieve or an @action) so it answers
+    304 while none of `domains` changed for request.user. The full path
+    (query string included) is always part of the ETag; `vary(request)` adds
+    anything else the response depends on.
+    """
+    domains = tuple(domains)
+
+    def decorator(view_method):
+        @wraps(view_method)
+        def wrapper(self, request, *args, **kwargs):
+            if not settings.CONDITIONAL_GET:
+                return view_method(self, request, *args, **kwargs)
+            parts = (request.get_full_path(), *(vary(request) if vary else ()))
+            etag = owner_etag(request.user.id, name, domains, *parts)
+            if not_modified(request, etag):
+                return not_modified_response(etag)
+            return set_etag(view_method(self, request, *args, **kwargs), etag)
+
+        return wrapper
+
+    return decorator
@@ -143,6 +143,9 @@ class User(AbstractBaseUser, PermissionsMixin):
     USERNAME_FIELD = "email"
     REQUIRED_FIELDS: list[str] = []
 
+    # Values remembered at load/save so signals can detect transitions without re-reading the row
+    TRACKED_FIELDS = ("is_active", "timezone", "vapi_webhook_token")
+
     class Meta:
         verbose_name = "user"
         verbose_name_plural = "users"
@@ -150,3 +153,29 @@ class User(AbstractBaseUser, PermissionsMixin):
     def __str__(self) -> str:
         return self.email
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance.snapshot_tracked_fields()
+        return instance
+
+    def refresh_from_db(self, *args, **kwargs) -> None:
+        super().refresh_from_db(*args, **kwargs)
+        self.snapshot_tracked_fields()
+
+    def snapshot_tracked_fields(self, fields=None) -> None:
+        """Remember the current values of tracked fields (only `fields`, if given)."""
+        names = self.TRACKED_FIELDS if fields is None else set(self.TRACKED_FIELDS) & set(fields)
+        loaded = self.__dict__
+        self._loaded_values = {
+            **getattr(self, "_loaded_values", {}),
+            **{name: loaded[name] for name in names if name in loaded},
+        }
+
+    def loaded_value(self, name: str, default=None):
+        """Value of a tracked field as of the last load or save (default if unknown)."""
+        return getattr(self, "_loaded_values", {}).get(name, default)
+
+    def has_loaded_value(self, name: str) -> bool:
+        return name in getattr(self, "_loaded_values", {})
+
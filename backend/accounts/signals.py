@@ -2,11 +2,13 @@ from __future__ import annotations
 
 import logging
 
-from django.db.models.signals import post_save, pre_save
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
-from django.core.mail import send_mail
-from django.conf import settings
 
+from notifications.emails import queue_email
+
+from .authentication import invalidate_cached_user
 from .models import User
 
 logger = logging.getLogger(__name__)
@@ -14,37 +16,48 @@ logger = logging.getLogger(__name__)
 
 @receiver(pre_save, sender=User)
 def _store_previous_is_active(sender, instance: User, **kwargs) -> None:
-    """Store previous is_active so we can detect activation in post_save."""
-    if instance.pk:
-        try:
-            old = User.objects.get(pk=instance.pk)
-            instance._previous_is_active = old.is_active
-        except User.DoesNotExist:
-            instance._previous_is_active = True
+    """
+    Store previous is_active so we can detect activation in post_save.
+    Uses the value captured when the instance was loaded (User.from_db), so a
+    save costs no extra query. Only instances built by hand with an existing
+    pk (never loaded) fall back to reading the row.
+    """
+    if instance.has_loaded_value("is_active"):
+        instance._previous_is_active = instance.loaded_value("is_active")
+    elif instance.pk:
+        previous = User.objects.filter(pk=instance.pk).values_list("is_active", flat=True).first()
+        instance._previous_is_active = True if previous is None else previous
     else:
         instance._previous_is_active = getattr(instance, "is_active", True)
 
 
 @receiver(post_save, sender=User)
-def send_approval_email_on_activation(sender, instance: User, created: bool, **kwargs) -> None:
+@receiver(post_delete, sender=User)
+def _invalidate_cached_user(sender, instance: User, **kwargs) -> None:
+    """
+    Saved (e.g. deactivated, new password) or deleted: drop cached auth entries.
+    Only after commit: until then a concurrent request still reads the old row
+    and would cache it again under the new generation.
+    """
+    user_id = instance.pk
+    if user_id:
+        transaction.on_commit(lambda: invalidate_cached_user(user_id))
+
+
+@receiver(post_save, sender=User)
+def send_approval_email_on_activation(sender, instance: User, created: bool, update_fields=None, **kwargs) -> None:
     """When a user is activated (is_active False → True), send 'your account is live' email."""
+    previous = getattr(instance, "_previous_is_active", True)
+    # The saved values are the baseline for the next save of this instance
+    instance.snapshot_tracked_fields(update_fields)
     if created:
         return
-    previous = getattr(instance, "_previous_is_active", True)
     if previous is True or not instance.is_active:
         return
     # Transition: was inactive, now active → send approval email
     if not instance.email:
         return
 
-    # Only send if email backend is configured (e.g. Gmail)
-    if not getattr(settings, "EMAIL_HOST_USER", None):
-        logger.info(
-            "Skipping approval email for %s: EMAIL_HOST_USER not set",
-            instance.email,
-        )
-        return
-
     subject = "Your Elara account is ready"
     message = (
         f"Hi {instance.name or 'there'},\n\n"
@@ -56,17 +69,13 @@ def send_approval_email_on_activation(sender, instance: User, created: bool, **k
         "If you have any questions, reply to this email or contact support.\n\n"
         "Welcome to Elara!"
     )
-    from_email = getattr(settings, "DEFAULT_FROM_EMAIL", settings.EMAIL_HOST_USER)
-    recipient_list = [instance.email]
+    # Queued in the same transaction as the save; dispatch_notifications sends it,
+    # so a slow or failing SMTP server never blocks or aborts the activation. The
+    # savepoint keeps a failed INSERT from aborting the admin's save as well.
     try:
-        send_mail(
-            subject=subject,
-            message=message,
-            from_email=from_email,
-            recipient_list=recipient_list,
-            fail_silently=False,
-        )
-        logger.info("Sent approval email to %s", instance.email)
+        with transaction.atomic():
+            queued = queue_email(instance.email, subject, message, owner_id=instance.pk)
+        if queued:
+            logger.info("Queued approval email to %s", instance.email)
     except Exception:
-        logger.exception("Failed to send approval email to %s", instance.email)
-        raise
+        logger.exception("Failed to queue approval email to %s", instance.email)
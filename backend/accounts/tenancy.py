@@ -0,0 +1,119 @@
+"""
+Tenant scoping for owner-filtered models.
+
+Every business's data (Service, Booking, Client, Alert, CallSummary,
+SupportRequest) hangs off an `owner` FK to the User, and each query must be
+restricted to one owner. TenantManager gives those models:
+
+- `Model.objects.for_owner(user)`: the owner-scoped starting point for views.
+- `Model.objects.unscoped()`: an explicit opt-out for the few legitimate
+  cross-tenant queries (maintenance commands, broker lookups by id).
+
+With settings.TENANT_QUERY_GUARD set to "warn" or "raise" (intended for tests
+and development), evaluating a queryset on these models without an owner
+predicate emits TenantQueryWarning or raises CrossTenantQuery. The check looks
+for a filter on the model's own `owner` field (owner= or owner_id=) in the
+query's AND-ed conditions, so user.bookings.all() passes but a lookup through
+a relation, like filter(client__owner=user), does not. The test runner
+(config/test_runner.py) turns the guard on as "raise" unless it is set.
+"""
+from __future__ import annotations
+
+import warnings
+
+from django.conf import settings
+from django.db import models
+from django.db.models.lookups import Lookup
+from django.db.models.sql.where import AND
+
+
+class CrossTenantQuery(Exception):
+    """A tenant-model query without an owner predicate, with TENANT_QUERY_GUARD="raise"."""
+
+
+class TenantQueryWarning(RuntimeWarning):
+    """A tenant-model query without an owner predicate, with TENANT_QUERY_GUARD="warn"."""
+
+
+def _has_owner_predicate(node, alias: str) -> bool:
+    """True if the where-tree constrains the owner column of table alias in a branch every row must satisfy."""
+    if node.negated or (node.connector != AND and len(node.children) > 1):
+        return False
+    for child in node.children:
+        if isinstance(child, Lookup):
+            target = getattr(child.lhs, "target", None)
+            if target is not None and target.name == "owner" and child.lhs.alias == alias:
+                return True
+        elif hasattr(child, "children") and _has_owner_predicate(child, alias):
+            return True
+    return False
+
+
+class TenantQuerySet(models.QuerySet):
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self._tenant_unscoped = False
+
+    def _clone(self):
+        clone = super()._clone()
+        clone._tenant_unscoped = self._tenant_unscoped
+        return clone
+
+    def for_owner(self, owner) -> "TenantQuerySet":
+        """Restrict to one tenant. Accepts a User or a user id."""
+        if isinstance(owner, models.Model):
+            return self.filter(owner=owner)
+        return self.filter(owner_id=owner)
+
+    def unscoped(self) -> "TenantQuerySet":
+        """Mark this queryset as intentionally spanning tenants (skips the guard)."""
+        clone = self._chain()
+        clone._tenant_unscoped = True
+        return clone
+
+    def _check_tenant_scope(self) -> None:
+        mode = getattr(settings, "TENANT_QUERY_GUARD", "")
+        if not mode or self._tenant_unscoped or _has_owner_predicate(self.query.where, self.query.base_table):
+            return
+        message = (
+            f"{self.model.__name__} queried without an owner predicate; "
+            f"use .for_owner(user), or .unscoped() if this is intentionally cross-tenant."
+        )
+        if mode == "raise":
+            raise CrossTenantQuery(message)
+        warnings.warn(message, TenantQueryWarning, stacklevel=3)
+
+    def _fetch_all(self) -> None:
+        if self._result_cache is None:
+            self._check_tenant_scope()
+        super()._fetch_all()
+
+    def iterator(self, *args, **kwargs):
+        self._check_tenant_scope()
+        return super().iterator(*args, **kwargs)
+
+    def count(self) -> int:
+        if self._result_cache is None:
+            self._check_tenant_scope()
+        return super().count()
+
+    def exists(self) -> bool:
+        if self._result_cache is None:
+            self._check_tenant_scope()
+        return super().exists()
+
+    def aggregate(self, *args, **kwargs):
+        self._check_tenant_scope()
+        return super().aggregate(*args, **kwargs)
+
+    def update(self, **kwargs) -> int:
+        self._check_tenant_scope()
+        return super().update(**kwargs)
+
+    def delete(self):
+        self._check_tenant_scope()
+        return super().delete()
+
+
+class TenantManager(models.Manager.from_queryset(TenantQuerySet)):
+    pass
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+from unittest import mock
+
+from django.db import connection, transaction
+from django.test import TestCase, override_settings
+
+from bookings.models import Booking
+from notifications.models import OutboundEmail
+
+from .models import User
+from .tenancy import CrossTenantQuery
+
+
+def _failing_queue_email(*args, **kwargs):
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1 / 0")
+
+
+@override_settings(EMAIL_HOST_USER="accounts@example.com")
+class ApprovalEmailTests(TestCase):
+    def setUp(self) -> None:
+        self.user = User.objects.create_user(email="new@example.com", password="secret-pass-123", is_active=False)
+
+    def test_activation_queues_approval_email(self) -> None:
+        self.user.is_active = True
+        self.user.save()
+        self.assertTrue(OutboundEmail.objects.filter(to_email="new@example.com").exists())
+
+    def test_failed_queue_leaves_admin_save_usable(self) -> None:
+        self.user.is_active = True
+        with mock.patch("accounts.signals.queue_email", _failing_queue_email), transaction.atomic():
+            with self.assertLogs("accounts.signals", "ERROR"):
+                self.user.save()
+            self.assertTrue(User.objects.get(pk=self.user.pk).is_active)
+
+
+@override_settings(TENANT_QUERY_GUARD="raise")
+class TenantQueryGuardTests(TestCase):
+    def setUp(self) -> None:
+        self.owner = User.objects.create_user(email="owner@example.com", password="secret-pass-123")
+
+    def test_own_owner_predicate_passes(self) -> None:
+        self.assertFalse(Booking.objects.filter(owner=self.owner).exists())
+        self.assertFalse(Booking.objects.for_owner(self.owner.pk).exists())
+        self.assertFalse(self.owner.bookings.exists())
+        self.assertFalse(Booking.objects.unscoped().exists())
+
+    def test_related_owner_predicate_is_rejected(self) -> None:
+        # Another table's owner says nothing about these rows' owner
+        with self.assertRaises(CrossTenantQuery):
+            Booking.objects.filter(client__owner=self.owner).exists()
+        with self.assertRaises(CrossTenantQuery):
+            Booking.objects.filter(pk=1).exists()
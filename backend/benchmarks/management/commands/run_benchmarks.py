@@ -0,0 +1,117 @@
+"""
+Time every dashboard and Vapi endpoint against seeded tenants at several scales
+and write the results to JSON, so runs can be compared across commits:
+  python manage.py run_benchmarks
+  python manage.py run_benchmarks --scales small,medium,large --repeat 30
+  python manage.py run_benchmarks --compare benchmarks/results/<old-commit>.json
+
+Runs against a throwaway test database (test_<NAME>) unless --current-db is given.
+"""
+import json
+import os
+import platform
+import subprocess
+from datetime import datetime, timezone as dt_timezone
+
+import django
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.runner import DiscoverRunner
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+from benchmarks.runner import compare, run_suite
+from benchmarks.seed import SCALES, seed_tenant
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=settings.BASE_DIR,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+class Command(BaseCommand):
+    help = "Benchmark API endpoints against seeded tenants and write JSON results"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--scales", default="small,medium", help="Comma-separated (default: small,medium)")
+        parser.add_argument("--tenants", type=int, default=2, help="Tenants seeded per scale; the first is timed")
+        parser.add_argument("--repeat", type=int, default=20, help="Measured requests per endpoint")
+        parser.add_argument("--warmup", type=int, default=3, help="Unmeasured requests per endpoint")
+        parser.add_argument("--cold", action="store_true", help="Clear the cache before every request")
+        parser.add_argument("--only", default="", help="Comma-separated endpoint name prefixes, e.g. bookings,vapi")
+        parser.add_argument("--output", help="JSON file (default: benchmarks/results/<commit>.json)")
+        parser.add_argument("--compare", help="Earlier results JSON to print median ratios against")
+        parser.add_argument("--current-db", action="store_true", help="Seed into the configured database")
+        parser.add_argument("--keepdb", action="store_true", help="Keep the test database between runs")
+
+    def handle(self, *args, **options):
+        scales = [name.strip() for name in options["scales"].split(",") if name.strip()]
+        unknown = set(scales) - set(SCALES)
+        if unknown:
+            raise CommandError(f"Unknown scale(s): {', '.join(sorted(unknown))}")
+        only = [name.strip() for name in options["only"].split(",") if name.strip()]
+
+        setup_test_environment()
+        runner = old_config = None
+        if not options["current_db"]:
+            runner = DiscoverRunner(verbosity=0, interactive=False, keepdb=options["keepdb"])
+            old_config = runner.setup_databases()
+        try:
+            results = []
+            for scale_name in scales:
+                scale = SCALES[scale_name]
+                self.stdout.write(f"Seeding {options['tenants']} {scale_name} tenant(s): {scale}")
+                with transaction.atomic():
+                    owners = [
+                        seed_tenant(scale, seed=i, label=scale_name)
+                        for i in range(options["tenants"])
+                    ]
+                for row in run_suite(owners[0], options["repeat"], options["warmup"], options["cold"], only):
+                    row["scale"] = scale_name
+                    results.append(row)
+                    self.stdout.write(
+                        f"  {row['endpoint']:<28} {row['median_ms']:>9.2f} ms  "
+                        f"p95 {row['p95_ms']:>9.2f} ms  {row['queries']:>3} queries  "
+                        f"{row['response_bytes']:>8} B  [{row['status']}]"
+                    )
+        finally:
+            if runner is not None:
+                runner.teardown_databases(old_config)
+            teardown_test_environment()
+
+        commit = _git_commit()
+        report = {
+            "meta": {
+                "commit": commit,
+                "created_at": datetime.now(dt_timezone.utc).isoformat(),
+                "python": platform.python_version(),
+                "django": django.get_version(),
+                "database": connection.vendor,
+                "repeat": options["repeat"],
+                "warmup": options["warmup"],
+                "cold_cache": options["cold"],
+                "tenants_per_scale": options["tenants"],
+            },
+            "results": results,
+        }
+        output = options["output"] or os.path.join(settings.BASE_DIR, "benchmarks", "results", f"{commit}.json")
+        os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+        with open(output, "w") as f:
+            json.dump(report, f, indent=2)
+        self.stdout.write(self.style.SUCCESS(f"Wrote {len(results)} result(s) to {output}"))
+
+        if options["compare"]:
+            with open(options["compare"]) as f:
+                previous = json.load(f)
+            self.stdout.write(f"Median vs {previous.get('meta', {}).get('commit', options['compare'])}:")
+            for scale_name, endpoint, old, new, ratio in compare(previous, report):
+                flag = "  <-- slower" if ratio > 1.2 else ""
+                self.stdout.write(f"  {scale_name:<7} {endpoint:<28} {old:>9.2f} -> {new:>9.2f} ms  x{ratio:.2f}{flag}")
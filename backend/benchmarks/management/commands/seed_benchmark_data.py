@@ -0,0 +1,38 @@
+"""
+Seed benchmark tenants into the current database (e.g. a local copy for profiling):
+  python manage.py seed_benchmark_data --scale medium --tenants 3
+  python manage.py seed_benchmark_data --scale small --bookings 50000 --years 4
+"""
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from benchmarks.seed import SCALES, seed_tenant
+
+
+class Command(BaseCommand):
+    help = "Create deterministic benchmark tenants (clients, services, bookings, calls, alerts)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--scale", choices=sorted(SCALES), default="small")
+        parser.add_argument("--tenants", type=int, default=1, help="Tenants to create (default: 1)")
+        parser.add_argument("--seed", type=int, default=0, help="First random seed (default: 0)")
+        for name in ("clients", "services", "bookings", "years", "call-summaries", "alerts"):
+            parser.add_argument(f"--{name}", type=int, help=f"Override the scale's {name.replace('-', ' ')}")
+
+    def handle(self, *args, **options):
+        scale = SCALES[options["scale"]].override(
+            clients=options["clients"],
+            services=options["services"],
+            bookings=options["bookings"],
+            years=options["years"],
+            call_summaries=options["call_summaries"],
+            alerts=options["alerts"],
+        )
+        for i in range(options["tenants"]):
+            with transaction.atomic():
+                owner = seed_tenant(scale, seed=options["seed"] + i, label=options["scale"])
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"Seeded {owner.email} (Vapi token {owner.vapi_webhook_token}): {scale}"
+                )
+            )
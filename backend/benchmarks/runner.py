@@ -0,0 +1,177 @@
+"""
+Times the dashboard and Vapi endpoints in-process with Django's test client.
+
+Each endpoint is requested `warmup` times (not measured), then `repeat` times.
+The report records the median, p95, min and mean wall time in milliseconds,
+queries per request, and response bytes. With cold=True the cache is cleared
+before every request, so cached paths are measured at their worst.
+
+POST scenarios (endpoints with a body) run each request in a transaction that
+is rolled back afterwards, so every repeat writes against the same seeded data
+(vapi.reserve books the same free slot each time). Their on_commit work, such
+as the client stats refresh, is not run or timed.
+"""
+from __future__ import annotations
+
+import statistics
+import time
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Callable
+
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.test import Client as TestClient
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework_simplejwt.tokens import AccessToken
+
+from accounts.models import User
+
+
+@dataclass(frozen=True)
+class Endpoint:
+    name: str
+    # Builds the path for a tenant; query strings included
+    path: Callable[[User], str]
+    # Vapi helpers authenticate by token in the URL, not by JWT
+    authenticated: bool = True
+    # JSON body for a POST scenario; None requests the path with GET
+    body: Callable[[User], dict] | None = None
+
+
+def _today() -> str:
+    return timezone.localdate().isoformat()
+
+
+def _week_start() -> str:
+    today = timezone.localdate()
+    return (today - timedelta(days=today.weekday())).isoformat()
+
+
+def _reserve_body(owner: User) -> dict:
+    # Seeded bookings end within 30 days, so this slot is free
+    return {
+        "date": (timezone.localdate() + timedelta(days=60)).isoformat(),
+        "time": "10:00",
+        "name": "Benchmark Caller",
+        "phone": "+1 555 010 9999",
+    }
+
+
+ENDPOINTS: list[Endpoint] = [
+    Endpoint("dashboard", lambda u: "/api/v1/dashboard/"),
+    Endpoint("bookings.stats", lambda u: "/api/v1/bookings/stats/"),
+    Endpoint("bookings.revenue.day", lambda u: "/api/v1/bookings/revenue/?range=day"),
+    Endpoint("bookings.revenue.week", lambda u: "/api/v1/bookings/revenue/?range=week"),
+    Endpoint("bookings.revenue.month", lambda u: "/api/v1/bookings/revenue/?range=month"),
+    Endpoint("bookings.heatmap", lambda u: f"/api/v1/bookings/heatmap/?week_start={_week_start()}"),
+    Endpoint("bookings.available_slots", lambda u: f"/api/v1/bookings/available_slots/?date={_today()}"),
+    Endpoint("bookings.list", lambda u: "/api/v1/bookings/"),
+    Endpoint("services.list", lambda u: "/api/v1/bookings/services/"),
+    Endpoint("clients.list", lambda u: "/api/v1/clients/"),
+    Endpoint("clients.tagged_any", lambda u: "/api/v1/clients/?tags=VIP,Lapsed&page_size=50"),
+    Endpoint("clients.tagged_all", lambda u: "/api/v1/clients/?tags=VIP,Hair&tags_match=all&page_size=50"),
+    Endpoint("clients.tags", lambda u: "/api/v1/clients/tags/"),
+    Endpoint("call_summaries.list", lambda u: "/api/v1/call-summaries/"),
+    Endpoint("call_summaries.search", lambda u: "/api/v1/call-summaries/?search=parking"),
+    Endpoint("alerts.list", lambda u: "/api/v1/alerts/"),
+    Endpoint("alerts.unread_count", lambda u: "/api/v1/alerts/unread_count/"),
+    Endpoint("accounts.me", lambda u: "/api/v1/accounts/me/"),
+    Endpoint(
+        "vapi.services",
+        lambda u: f"/api/v1/vapi/services/{u.vapi_webhook_token}/",
+        authenticated=False,
+    ),
+    Endpoint(
+        "vapi.availability",
+        lambda u: f"/api/v1/vapi/availability/{u.vapi_webhook_token}/?date={_today()}",
+        authenticated=False,
+    ),
+    Endpoint(
+        "vapi.reserve",
+        lambda u: f"/api/v1/vapi/reserve/{u.vapi_webhook_token}/",
+        authenticated=False,
+        body=_reserve_body,
+    ),
+]
+
+
+def _percentile(samples: list[float], fraction: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def time_endpoint(
+    endpoint: Endpoint,
+    owner: User,
+    repeat: int,
+    warmup: int,
+    cold: bool = False,
+) -> dict:
+    headers = {}
+    if endpoint.authenticated:
+        headers["HTTP_AUTHORIZATION"] = f"Bearer {AccessToken.for_user(owner)}"
+    # Failing endpoints are reported with their status instead of aborting the run
+    client = TestClient(raise_request_exception=False, **headers)
+    path = endpoint.path(owner)
+    body = endpoint.body(owner) if endpoint.body else None
+
+    def request():
+        if body is None:
+            return client.get(path)
+        with transaction.atomic():
+            response = client.post(path, body, content_type="application/json")
+            transaction.set_rollback(True)
+        return response
+
+    for _ in range(warmup):
+        if cold:
+            cache.clear()
+        request()
+
+    samples: list[float] = []
+    queries: list[int] = []
+    size = status = 0
+    for _ in range(repeat):
+        if cold:
+            cache.clear()
+        with CaptureQueriesContext(connection) as captured:
+            start = time.perf_counter()
+            response = request()
+            samples.append((time.perf_counter() - start) * 1000)
+        queries.append(len(captured))
+        status = response.status_code
+        size = len(response.content) if not response.streaming else 0
+
+    return {
+        "endpoint": endpoint.name,
+        "path": path,
+        "status": status,
+        "median_ms": round(statistics.median(samples), 3),
+        "p95_ms": round(_percentile(samples, 0.95), 3),
+        "min_ms": round(min(samples), 3),
+        "mean_ms": round(statistics.fmean(samples), 3),
+        "queries": max(queries),
+        "response_bytes": size,
+    }
+
+
+def run_suite(owner: User, repeat: int, warmup: int, cold: bool = False, only: list[str] | None = None) -> list[dict]:
+    return [
+        time_endpoint(endpoint, owner, repeat, warmup, cold)
+        for endpoint in ENDPOINTS
+        if not only or any(endpoint.name.startswith(prefix) for prefix in only)
+    ]
+
+
+def compare(previous: dict, current: dict) -> list[tuple[str, str, float, float, float]]:
+    """(scale, endpoint, old median, new median, ratio) for endpoints present in both runs."""
+    old = {(r["scale"], r["endpoint"]): r["median_ms"] for r in previous.get("results", [])}
+    rows = []
+    for r in current["results"]:
+        key = (r["scale"], r["endpoint"])
+        if key in old and old[key]:
+            rows.append((*key, old[key], r["median_ms"], r["median_ms"] / old[key]))
+    return rows
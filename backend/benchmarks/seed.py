@@ -0,0 +1,213 @@
+"""
+Deterministic tenant seeding for benchmarks.
+
+seed_tenant() creates one business (User) with clients, services, bookings
+spread over several years, call summaries with transcripts, and recent alerts.
+Everything is derived from a seeded random.Random, so the same scale and seed
+always produce the same data. Rows are bulk-inserted, which skips signals:
+no SSE pushes, outbox rows or emails are produced.
+"""
+from __future__ import annotations
+
+import random
+import secrets
+from dataclasses import dataclass, replace
+from datetime import timedelta
+from decimal import Decimal
+
+from django.utils import timezone
+
+from accounts.models import User
+from bookings.models import Booking, Service
+from clients.models import Client
+from clients.stats import refresh_booking_stats
+from clients.tags import rebuild_client_tags
+from integrations.models import CallSummary
+from notifications.models import Alert
+
+BATCH_SIZE = 2000
+
+
+@dataclass(frozen=True)
+class Scale:
+    clients: int
+    services: int
+    bookings: int
+    years: int
+    call_summaries: int
+    alerts: int
+
+    def override(self, **counts) -> "Scale":
+        return replace(self, **{k: v for k, v in counts.items() if v is not None})
+
+
+SCALES: dict[str, Scale] = {
+    "small": Scale(clients=100, services=8, bookings=1_000, years=1, call_summaries=300, alerts=50),
+    "medium": Scale(clients=1_000, services=20, bookings=20_000, years=3, call_summaries=5_000, alerts=300),
+    "large": Scale(clients=5_000, services=40, bookings=100_000, years=5, call_summaries=25_000, alerts=1_000),
+}
+
+FIRST_NAMES = [
+    "Aisha", "Ben", "Carla", "Dmitri", "Elena", "Farah", "George", "Hana", "Imran", "Julia",
+    "Kofi", "Lena", "Mateo", "Nadia", "Omar", "Priya", "Quinn", "Rosa", "Sami", "Tara",
+]
+LAST_NAMES = [
+    "Ahmed", "Brown", "Chen", "Diaz", "Evans", "Fischer", "Garcia", "Hughes", "Ito", "Khan",
+    "Lopez", "Malik", "Nguyen", "Okafor", "Patel", "Rossi", "Silva", "Tanaka", "Weber", "Zhou",
+]
+SERVICE_NAMES = [
+    "Haircut", "Beard trim", "Colour", "Blow dry", "Facial", "Cleansing", "Massage", "Manicure",
+    "Pedicure", "Consultation", "Laser session", "Eyebrow threading", "Waxing", "Styling",
+    "Scalp treatment", "Makeup", "Lash lift", "Peel", "Microneedling", "Follow-up",
+]
+CATEGORIES = ["Hair", "Skin", "Nails", "Body", "Consultation"]
+TAGS = ["VIP", "New", "Hair", "Laser", "Regular", "Referral", "Lapsed"]
+TIMEZONES = ["Europe/London", "America/New_York", "Asia/Karachi", "Australia/Sydney"]
+OUTCOMES = ["Booking created", "Rescheduled", "Lead captured", "Question answered", "No booking"]
+
+
+def _transcript(rng: random.Random, caller: str, service: str, when: str) -> str:
+    lines = [
+        "AI: Thanks for calling, this is the booking assistant. How can I help?",
+        f"User: Hi, it's {caller}. I'd like to book a {service.lower()}.",
+        "AI: Of course. Which day works best for you?",
+        f"User: Would {when} work?",
+    ]
+    if rng.random() < 0.7:
+        lines += [
+            f"AI: {when} is available. Shall I confirm that for you?",
+            "User: Yes please.",
+            f"AI: Done. You're booked for a {service.lower()} on {when}. See you then!",
+        ]
+    else:
+        lines += [
+            "AI: That time is taken, but I have a slot an hour later.",
+            "User: Let me check my calendar and call back.",
+            "AI: No problem, have a great day.",
+        ]
+    # Some calls ramble on, which is what search has to scan through
+    lines += ["User: One more question about parking and prices."] * rng.randint(0, 6)
+    return "\n".join(lines)
+
+
+def _bulk_create(model, objs: list) -> list:
+    return model.objects.bulk_create(objs, batch_size=BATCH_SIZE)
+
+
+def _backdate(model, objs: list, created: list) -> None:
+    # created_at is auto_now_add (set to "now" on insert); rewrite it afterwards
+    for obj, moment in zip(objs, created):
+        obj.created_at = moment
+    model.objects.bulk_update(objs, ["created_at"], batch_size=BATCH_SIZE)
+
+
+def seed_tenant(scale: Scale, seed: int = 0, label: str = "bench") -> User:
+    """Create one tenant of the given scale and return its owner."""
+    rng = random.Random(seed)
+    now = timezone.now().replace(minute=0, second=0, microsecond=0)
+    span = timedelta(days=365 * scale.years)
+
+    owner = User.objects.create_user(
+        email=f"{label}-{seed}-{secrets.token_hex(4)}@benchmark.invalid",
+        password=None,
+        name=f"{label.title()} owner {seed}",
+        business_name=f"{label.title()} Studio {seed}",
+        timezone=rng.choice(TIMEZONES),
+        vapi_webhook_token=secrets.token_urlsafe(32),
+    )
+
+    services = _bulk_create(Service, [
+        Service(
+            owner=owner,
+            name=SERVICE_NAMES[i % len(SERVICE_NAMES)] + (f" {i // len(SERVICE_NAMES) + 1}" if i >= len(SERVICE_NAMES) else ""),
+            category=rng.choice(CATEGORIES),
+            price=Decimal(rng.randrange(15, 250)),
+        )
+        for i in range(scale.services)
+    ])
+
+    clients = []
+    for i in range(scale.clients):
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        clients.append(Client(
+            owner=owner,
+            name=f"{first} {last}",
+            email=f"{first}.{last}.{i}@example.com".lower(),
+            phone_number=f"+44 7{rng.randrange(100_000_000, 999_999_999)}",
+            tags=", ".join(rng.sample(TAGS, rng.randint(0, 3))),
+        ))
+    clients = _bulk_create(Client, clients)
+    _backdate(Client, clients, [now - span * rng.random() for _ in clients])
+
+    bookings = []
+    # Half-hours taken by confirmed bookings: the no-overlap constraint allows one at a time
+    taken = set()
+    for _ in range(scale.bookings):
+        # Mostly past bookings, some upcoming; business hours on the half hour
+        day = now - span * rng.random() + timedelta(days=30 * rng.random())
+        starts_at = day.replace(hour=rng.randint(8, 17), minute=rng.choice((0, 30)), second=0, microsecond=0)
+        ends_at = starts_at + timedelta(minutes=rng.choice((30, 60, 90)))
+        status = rng.choices(("confirmed", "pending", "cancelled"), (80, 12, 8))[0]
+        if status == "confirmed":
+            half_hours = {
+                starts_at + timedelta(minutes=30 * i)
+                for i in range((ends_at - starts_at) // timedelta(minutes=30))
+            }
+            if taken & half_hours:
+                status = "pending"
+            else:
+                taken |= half_hours
+        bookings.append(Booking(
+            owner=owner,
+            client=rng.choice(clients),
+            service=rng.choice(services) if services and rng.random() < 0.9 else None,
+            starts_at=starts_at,
+            ends_at=ends_at,
+            status=status,
+        ))
+    bookings = _bulk_create(Booking, bookings)
+    _backdate(Booking, bookings, [b.starts_at - timedelta(days=rng.randint(0, 14)) for b in bookings])
+    # bulk_create skipped the signals that maintain these
+    refresh_booking_stats(owner.id)
+    rebuild_client_tags(owner.id)
+
+    calls = []
+    for _ in range(scale.call_summaries):
+        client = rng.choice(clients)
+        service = rng.choice(services) if services else None
+        service_name = service.name if service else ""
+        booking = rng.choice(bookings) if bookings and rng.random() < 0.5 else None
+        ended_at = now - span * rng.random()
+        when = (ended_at + timedelta(days=rng.randint(1, 10))).strftime("%A at %H:00")
+        calls.append(CallSummary(
+            owner=owner,
+            vapi_call_id=secrets.token_hex(12),
+            caller_name=client.name,
+            caller_number=client.phone_number,
+            service_name=service_name,
+            price=service.price if service else None,
+            summary=f"{client.name} called about a {service_name.lower() or 'general question'}.",
+            transcript=_transcript(rng, client.name, service_name or "appointment", when),
+            outcome=rng.choice(OUTCOMES),
+            duration_seconds=rng.randint(30, 900),
+            started_at=ended_at - timedelta(minutes=rng.randint(1, 15)),
+            ended_at=ended_at,
+            related_client=client,
+            related_booking=booking,
+        ))
+    calls = _bulk_create(CallSummary, calls)
+    _backdate(CallSummary, calls, [call.ended_at for call in calls])
+
+    alerts = _bulk_create(Alert, [
+        Alert(
+            owner=owner,
+            type=rng.choice(("success", "warning", "info", "error")),
+            title="New call",
+            message=f"Call from {rng.choice(clients).name}" if clients else "Call",
+            is_read=rng.random() < 0.6,
+        )
+        for _ in range(scale.alerts)
+    ])
+    # Alerts only live for a week
+    _backdate(Alert, alerts, [now - timedelta(days=7) * rng.random() for _ in alerts])
+    return owner
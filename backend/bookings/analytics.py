@@ -0,0 +1,173 @@
+"""
+Dashboard aggregations over an owner's bookings.
+
+Shared by BookingViewSet (stats/revenue/heatmap) and the combined dashboard
+endpoint. Each function takes the owner id and the request's `now` (and
+timezone where relevant), so one request computes every section against the
+same clock.
+"""
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+from django.db.models import Sum
+from django.utils import timezone
+
+from .models import Booking
+from .slots import occupied, week_slots
+
+WEEK_DAYS = ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']
+REVENUE_RANGES = ('day', 'week', 'month')
+
+
+def percentage_change(old_value, new_value):
+    """Calculate percentage change between two values."""
+    if old_value == 0:
+        return 100.0 if new_value > 0 else 0.0
+    change = ((new_value - old_value) / old_value) * 100
+    return round(change, 1)
+
+
+def _revenue(owner_id: int, start: datetime, end: datetime) -> Decimal:
+    return Booking.objects.filter(
+        owner_id=owner_id,
+        starts_at__gte=start,
+        starts_at__lt=end,
+        service__isnull=False
+    ).aggregate(total=Sum('service__price'))['total'] or Decimal('0')
+
+
+def booking_stats(owner_id: int, now: datetime) -> dict:
+    this_month_start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    last_month_start = (this_month_start - timedelta(days=1)).replace(day=1)
+    bookings = Booking.objects.for_owner(owner_id)
+
+    # Total bookings (all time)
+    total_bookings = bookings.count()
+
+    # Bookings this month vs last month
+    bookings_this_month = bookings.filter(starts_at__gte=this_month_start).count()
+    bookings_last_month = bookings.filter(
+        starts_at__gte=last_month_start,
+        starts_at__lt=this_month_start
+    ).count()
+    bookings_change = percentage_change(bookings_last_month, bookings_this_month)
+
+    # Active customers (customers with bookings in last 30 days)
+    thirty_days_ago = now - timedelta(days=30)
+    active_customers = bookings.filter(
+        starts_at__gte=thirty_days_ago
+    ).values('client').distinct().count()
+
+    # Active customers last month
+    active_customers_last_month = bookings.filter(
+        starts_at__gte=last_month_start,
+        starts_at__lt=this_month_start
+    ).values('client').distinct().count()
+    customers_change = percentage_change(active_customers_last_month, active_customers)
+
+    # Monthly sales (sum of service prices from bookings this month)
+    monthly_sales = bookings.filter(
+        starts_at__gte=this_month_start,
+        service__isnull=False
+    ).aggregate(total=Sum('service__price'))['total'] or Decimal('0')
+    monthly_sales_last_month = _revenue(owner_id, last_month_start, this_month_start)
+    sales_change = percentage_change(float(monthly_sales_last_month), float(monthly_sales))
+
+    # Calls handled (using bookings count for now, can be extended later)
+    calls_handled = total_bookings
+    calls_handled_last_month = bookings_last_month
+    calls_change = percentage_change(calls_handled_last_month, calls_handled)
+
+    return {
+        'total_bookings': total_bookings,
+        'bookings_change': bookings_change,
+        'calls_handled': calls_handled,
+        'calls_change': calls_change,
+        'active_customers': active_customers,
+        'customers_change': customers_change,
+        'monthly_sales': float(monthly_sales),
+        'sales_change': sales_change,
+    }
+
+
+def booking_revenue(owner_id: int, range_type: str, now: datetime) -> list[dict]:
+    """Revenue chart points: last 7 days, 4 weeks or 12 months. Unknown ranges give []."""
+    data = []
+
+    if range_type == 'day':
+        # Last 7 days
+        for i in range(6, -1, -1):
+            day = (now - timedelta(days=i)).date()
+            day_start = timezone.make_aware(datetime.combine(day, datetime.min.time()))
+            revenue = _revenue(owner_id, day_start, day_start + timedelta(days=1))
+            data.append({
+                'label': day.strftime('%a'),
+                'value': float(revenue)
+            })
+
+    elif range_type == 'week':
+        # Last 4 weeks
+        for i in range(3, -1, -1):
+            week_start = now - timedelta(weeks=i+1)
+            week_end = now - timedelta(weeks=i)
+            revenue = _revenue(owner_id, week_start, week_end)
+            data.append({
+                'label': f'W{4-i}',
+                'value': float(revenue)
+            })
+
+    elif range_type == 'month':
+        # Last 12 months
+        for i in range(11, -1, -1):
+            month_start = (now - timedelta(days=30*i)).replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+            if i == 0:
+                month_end = now
+            else:
+                next_month = month_start + timedelta(days=32)
+                month_end = next_month.replace(day=1) - timedelta(seconds=1)
+            revenue = _revenue(owner_id, month_start, month_end)
+            data.append({
+                'label': month_start.strftime('%b'),
+                'value': float(revenue)
+            })
+
+    return data
+
+
+def current_week_start(now: datetime) -> date:
+    today = now.date()
+    return today - timedelta(days=today.weekday())
+
+
+def empty_heatmap_grid() -> list[list[dict]]:
+    return [
+        [
+            {'day': WEEK_DAYS[day_idx], 'label': f'{slot_idx // 2:02d}:{(slot_idx % 2) * 30:02d}', 'hasBooking': False}
+            for slot_idx in range(48)
+        ]
+        for day_idx in range(7)
+    ]
+
+
+def booking_heatmap(owner_id: int, week_start: date, tz_name: str) -> list[list[dict]]:
+    """7 x 48 half-hour grid (local to tz_name) marking slots overlapped by a confirmed booking."""
+    days = week_slots(tz_name, week_start, 30)
+
+    bookings = list(
+        Booking.objects.filter(
+            owner_id=owner_id,
+            status='confirmed',
+            starts_at__gte=days[0][0].start,
+            starts_at__lt=days[-1][-1].end
+        ).values_list('starts_at', 'ends_at')
+    )
+
+    return [
+        [
+            {'day': WEEK_DAYS[day_idx], 'label': slot.label, 'hasBooking': has_booking}
+            for slot, has_booking in zip(slots, occupied(slots, bookings))
+        ]
+        for day_idx, slots in enumerate(days)
+    ]
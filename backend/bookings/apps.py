@@ -6,3 +6,5 @@ class BookingsConfig(AppConfig):
     name = "bookings"
     verbose_name = "Bookings"
 
+    def ready(self) -> None:
+        import bookings.signals  # noqa: F401
@@ -0,0 +1,97 @@
+"""
+Free times for an owner's calendar, and recognising double-booking errors.
+
+Confirmed bookings of one owner can't overlap: the bookings_no_overlap
+exclusion constraint rejects the second INSERT/UPDATE even when two calls (or
+a call and the dashboard) race for the same slot. Writers create the booking
+inside a savepoint and, on an overlap error, offer other times computed here
+from the same slot templates as the availability endpoints.
+"""
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta
+
+from django.db import IntegrityError
+
+from .models import OVERLAP_CONSTRAINT, Booking
+from .slots import Slot, day_slots, occupied
+
+# The hours the Vapi agent offers, local to the owner
+OPEN_HOUR = 8
+CLOSE_HOUR = 18
+SLOT_MINUTES = 30
+
+
+def is_overlap_error(exc: IntegrityError) -> bool:
+    """True if the error is the no-overlap exclusion constraint rejecting a booking."""
+    diag = getattr(exc.__cause__, "diag", None)
+    return getattr(diag, "constraint_name", None) == OVERLAP_CONSTRAINT
+
+
+def busy_intervals(owner_id: int, start: datetime, end: datetime) -> list[tuple[datetime, datetime]]:
+    """Confirmed bookings overlapping [start, end)."""
+    return list(
+        Booking.objects.filter(
+            owner_id=owner_id,
+            status="confirmed",
+            starts_at__lt=end,
+            ends_at__gt=start,
+        ).values_list("starts_at", "ends_at")
+    )
+
+
+def opening_slots(tz_name: str, day: date, duration_minutes: int = SLOT_MINUTES) -> list[Slot]:
+    """Start times within opening hours, every SLOT_MINUTES, each lasting duration_minutes."""
+    starts = day_slots(tz_name, day, SLOT_MINUTES, OPEN_HOUR * 60, CLOSE_HOUR * 60)
+    length = timedelta(minutes=duration_minutes)
+    return [Slot(slot.label, slot.start, slot.start + length) for slot in starts if slot.exists]
+
+
+def free_times(
+    owner_id: int,
+    tz_name: str,
+    day: date,
+    duration_minutes: int = SLOT_MINUTES,
+    busy: list[tuple[datetime, datetime]] | None = None,
+) -> list[Slot]:
+    """The day's opening slots with no confirmed booking in the way."""
+    slots = opening_slots(tz_name, day, duration_minutes)
+    if not slots:
+        return []
+    if busy is None:
+        busy = busy_intervals(owner_id, slots[0].start, slots[-1].end)
+    return [slot for slot, taken in zip(slots, occupied(slots, busy)) if not taken]
+
+
+def alternatives(
+    owner_id: int,
+    tz_name: str,
+    day: date,
+    around: datetime,
+    duration_minutes: int,
+    now: datetime,
+    limit: int = 5,
+    days: int = 7,
+) -> list[tuple[date, Slot]]:
+    """
+    Up to `limit` free (local date, slot) times for a booking that didn't fit:
+    the closest to `around` on the same day, then the earliest on later days.
+    """
+    by_day = [opening_slots(tz_name, day + timedelta(days=i), duration_minutes) for i in range(days)]
+    all_slots = [slot for slots in by_day for slot in slots]
+    if not all_slots:
+        return []
+    # One query for the whole range
+    busy = busy_intervals(owner_id, all_slots[0].start, max(slot.end for slot in all_slots))
+    found: list[tuple[date, Slot]] = []
+    for i, slots in enumerate(by_day):
+        free = [
+            slot for slot, taken in zip(slots, occupied(slots, busy))
+            if not taken and slot.start > now
+        ]
+        if i == 0:
+            free.sort(key=lambda slot: abs(slot.start - around))
+        found += [(day + timedelta(days=i), slot) for slot in free[:limit - len(found)]]
+        if len(found) >= limit:
+            break
+    return found
@@ -0,0 +1,20 @@
+# Generated by Django 5.0.14 on 2026-10-19 18:24
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0003_service_category'),
+        ('clients', '0003_owner_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(fields=['owner', '-starts_at'], name='bookings_bo_owner_i_090377_idx'),
+        ),
+    ]
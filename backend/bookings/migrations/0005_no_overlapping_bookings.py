@@ -0,0 +1,45 @@
+# Generated by Django 5.0.14 on 2026-10-19 18:51
+
+import bookings.models
+import django.contrib.postgres.constraints
+import django.contrib.postgres.fields.ranges
+from django.conf import settings
+from django.db import migrations, models
+
+
+def demote_overlapping_bookings(apps, schema_editor):
+    """Keep the earliest of overlapping confirmed bookings; the others go back to pending."""
+    Booking = apps.get_model('bookings', 'Booking')
+    rows = (
+        Booking.objects.filter(status='confirmed', ends_at__gt=models.F('starts_at'))
+        .order_by('owner_id', 'starts_at', 'created_at', 'id')
+        .values_list('id', 'owner_id', 'starts_at', 'ends_at')
+    )
+    demoted = []
+    owner_id = busy_until = None
+    for pk, row_owner_id, starts_at, ends_at in rows.iterator(chunk_size=2000):
+        if row_owner_id != owner_id:
+            owner_id, busy_until = row_owner_id, None
+        if busy_until is not None and starts_at < busy_until:
+            demoted.append(pk)
+        else:
+            busy_until = ends_at
+    for i in range(0, len(demoted), 2000):
+        Booking.objects.filter(pk__in=demoted[i:i + 2000]).update(status='pending')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0004_owner_indexes'),
+        ('clients', '0005_tags'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(demote_overlapping_bookings, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='booking',
+            constraint=django.contrib.postgres.constraints.ExclusionConstraint(condition=models.Q(('ends_at__gt', models.F('starts_at')), ('status', 'confirmed')), expressions=[(bookings.models.Int8Range('owner', 'owner', django.contrib.postgres.fields.ranges.RangeBoundary(inclusive_upper=True)), '='), (bookings.models.TsTzRange('starts_at', 'ends_at', django.contrib.postgres.fields.ranges.RangeBoundary()), '&&')], name='bookings_no_overlap', violation_error_message='This time overlaps another confirmed booking.'),
+        ),
+    ]
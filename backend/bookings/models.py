@@ -1,10 +1,21 @@
 from __future__ import annotations
 
 from django.conf import settings
+from django.contrib.postgres.constraints import ExclusionConstraint
+from django.contrib.postgres.fields import (
+    BigIntegerRangeField,
+    DateTimeRangeField,
+    RangeBoundary,
+    RangeOperators,
+)
 from django.db import models
+from django.db.models import F, Func, Q
 
+from accounts.tenancy import TenantManager
 from clients.models import Client
 
+OVERLAP_CONSTRAINT = "bookings_no_overlap"
+
 
 class Service(models.Model):
     """
@@ -30,13 +41,33 @@ class Service(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = TenantManager()
+
     class Meta:
         ordering = ["name"]
+        # Also the owner-leading index for the name ordering
         unique_together = ("owner", "name")
 
     def __str__(self) -> str:
         return f"{self.name} ({self.price} {self.currency})"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # A price change re-values every client who booked this service (clients/stats.py)
+        instance._loaded_price = instance.__dict__.get("price")
+        return instance
+
+
+class TsTzRange(Func):
+    function = "TSTZRANGE"
+    output_field = DateTimeRangeField()
+
+
+class Int8Range(Func):
+    function = "INT8RANGE"
+    output_field = BigIntegerRangeField()
+
 
 class Booking(models.Model):
     """
@@ -78,9 +109,35 @@ class Booking(models.Model):
     notes = models.TextField(blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    objects = TenantManager()
+
     class Meta:
         ordering = ["-starts_at"]
+        indexes = [
+            models.Index(fields=["owner", "-starts_at"]),
+        ]
+        constraints = [
+            # One business, one calendar: confirmed bookings can't overlap. The owner is
+            # compared as a one-value range so plain GiST handles it (no btree_gist).
+            # Empty or inverted ranges overlap nothing and are left out.
+            ExclusionConstraint(
+                name=OVERLAP_CONSTRAINT,
+                expressions=[
+                    (Int8Range("owner", "owner", RangeBoundary(inclusive_upper=True)), RangeOperators.EQUAL),
+                    (TsTzRange("starts_at", "ends_at", RangeBoundary()), RangeOperators.OVERLAPS),
+                ],
+                condition=Q(status="confirmed", ends_at__gt=F("starts_at")),
+                violation_error_message="This time overlaps another confirmed booking.",
+            ),
+        ]
 
     def __str__(self) -> str:
         return f"{self.client} @ {self.starts_at:%Y-%m-%d %H:%M}"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # A booking moved to another client refreshes both clients' stats (clients/stats.py)
+        instance._loaded_client_id = instance.__dict__.get("client_id")
+        return instance
+
@@ -1,8 +1,12 @@
 from __future__ import annotations
 
 from django.contrib.auth import get_user_model
+from django.db import IntegrityError, transaction
 from rest_framework import serializers
 
+from clients.models import Client
+
+from .availability import is_overlap_error
 from .models import Booking, Service
 
 
@@ -55,9 +59,33 @@ class BookingSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['id', 'created_at']
 
+    def get_fields(self):
+        fields = super().get_fields()
+        # Only the requesting user's own clients and services can be referenced
+        request = self.context.get('request')
+        if request is not None and request.user.is_authenticated:
+            fields['client'].queryset = Client.objects.for_owner(request.user)
+            fields['service'].queryset = Service.objects.for_owner(request.user)
+        return fields
+
+    def _save_without_overlap(self, save):
+        # The database rejects overlapping confirmed bookings (bookings_no_overlap)
+        try:
+            with transaction.atomic():
+                return save()
+        except IntegrityError as e:
+            if is_overlap_error(e):
+                raise serializers.ValidationError(
+                    {'starts_at': ['This time overlaps another confirmed booking.']}
+                )
+            raise
+
     def create(self, validated_data):
         request = self.context.get('request')
         assert request is not None
         validated_data['owner'] = request.user
-        return super().create(validated_data)
+        return self._save_without_overlap(lambda: super(BookingSerializer, self).create(validated_data))
+
+    def update(self, instance, validated_data):
+        return self._save_without_overlap(lambda: super(BookingSerializer, self).update(instance, validated_data))
 
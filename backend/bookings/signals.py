@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from accounts.cache_versions import ALERTS, BOOKINGS, CALLS, SERVICES, bump_version
+from clients.stats import schedule_booking_stats_refresh
+
+from .models import Booking, Service
+
+# Booking fields the client aggregates depend on
+STATS_FIELDS = {"client", "client_id", "service", "service_id", "starts_at"}
+
+
+def _clients_who_booked(service: Service) -> list[int]:
+    return list(
+        Booking.objects.filter(owner_id=service.owner_id, service=service)
+        .order_by()
+        .values_list("client_id", flat=True)
+        .distinct()
+    )
+
+
+@receiver(post_save, sender=Service)
+@receiver(post_delete, sender=Service)
+def _bump_service_version(sender, instance: Service, **kwargs) -> None:
+    # Bookings show the service name and price, and lose the service on delete
+    bump_version(instance.owner_id, SERVICES, BOOKINGS)
+
+
+@receiver(post_save, sender=Service)
+def _revalue_clients_on_price_change(sender, instance: Service, created: bool, **kwargs) -> None:
+    previous = getattr(instance, "_loaded_price", None)
+    if not created and previous is not None and previous != instance.price:
+        schedule_booking_stats_refresh(instance.owner_id, _clients_who_booked(instance))
+    instance._loaded_price = instance.price
+
+
+@receiver(pre_delete, sender=Service)
+def _revalue_clients_on_service_delete(sender, instance: Service, **kwargs) -> None:
+    # Read before the delete unlinks the bookings (SET_NULL)
+    schedule_booking_stats_refresh(instance.owner_id, _clients_who_booked(instance))
+
+
+@receiver(post_save, sender=Booking)
+def _bump_booking_version(sender, instance: Booking, **kwargs) -> None:
+    bump_version(instance.owner_id, BOOKINGS)
+
+
+@receiver(post_delete, sender=Booking)
+def _bump_deleted_booking_version(sender, instance: Booking, **kwargs) -> None:
+    # Call summaries and alerts pointing at it are unlinked (SET_NULL)
+    bump_version(instance.owner_id, BOOKINGS, CALLS, ALERTS)
+
+
+@receiver(post_save, sender=Booking)
+@receiver(post_delete, sender=Booking)
+def _refresh_client_stats(sender, instance: Booking, **kwargs) -> None:
+    update_fields = kwargs.get("update_fields")
+    if update_fields is not None and not STATS_FIELDS & set(update_fields):
+        return
+    schedule_booking_stats_refresh(
+        instance.owner_id,
+        [instance.client_id, getattr(instance, "_loaded_client_id", None)],
+    )
+    instance._loaded_client_id = instance.client_id
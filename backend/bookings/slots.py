@@ -0,0 +1,128 @@
+"""
+Owner-local slot templates: the UTC boundaries of a day's wall-clock slots.
+
+The heatmap, available_slots and the Vapi availability endpoint all lay a day
+out in fixed local slots (09:00, 09:30, ...) and compare them to bookings
+stored in UTC. A day's template depends only on the timezone, the date and the
+slot layout, so it is computed once per process and memoized (day_slots).
+
+DST is resolved explicitly, per slot boundary:
+
+- a wall time that occurs twice (clocks going back) maps to its first
+  occurrence, so the slot before the next boundary also covers the repeated
+  hour: slots stay contiguous and every instant falls in exactly one slot;
+- a wall time that doesn't exist (clocks going forward) maps to the
+  transition instant, so slots starting in the gap are empty (start == end):
+  they keep their place in fixed grids but never contain a booking and are
+  never offered as free.
+"""
+from __future__ import annotations
+
+from datetime import date, datetime, time, timedelta, timezone as dt_timezone
+from functools import lru_cache
+from typing import Iterable, NamedTuple
+from zoneinfo import ZoneInfo
+
+MINUTES_PER_DAY = 24 * 60
+
+
+class Slot(NamedTuple):
+    # Local wall-clock start, e.g. "09:30"
+    label: str
+    start: datetime
+    # Equal to start for slots skipped by a DST change
+    end: datetime
+
+    @property
+    def exists(self) -> bool:
+        return self.end > self.start
+
+
+@lru_cache(maxsize=512)
+def _zone(name: str) -> ZoneInfo | None:
+    try:
+        return ZoneInfo(name)
+    except Exception:
+        return None
+
+
+def resolve_timezone(name: str | None) -> str:
+    """The IANA name if it is a valid timezone, else "UTC"."""
+    name = (name or "").strip()
+    return name if name and _zone(name) is not None else "UTC"
+
+
+def _to_utc(local: datetime, tz) -> datetime:
+    """UTC instant of a naive local wall time: its first occurrence, or the DST transition if skipped."""
+    earlier = local.replace(tzinfo=tz, fold=0).astimezone(dt_timezone.utc)
+    if earlier.astimezone(tz).replace(tzinfo=None) == local:
+        return earlier
+    # In a gap, fold=0 and fold=1 land on either side of the transition; bisect to it
+    lo, hi = sorted((earlier, local.replace(tzinfo=tz, fold=1).astimezone(dt_timezone.utc)))
+    while hi - lo > timedelta(seconds=1):
+        mid = lo + (hi - lo) / 2
+        if mid.astimezone(tz).replace(tzinfo=None) >= local:
+            hi = mid
+        else:
+            lo = mid
+    return hi.replace(microsecond=0)
+
+
+def local_to_utc(local: datetime, tz_name: str) -> datetime:
+    """UTC instant of a naive wall time in tz_name, resolved like slot boundaries (see above)."""
+    return _to_utc(local, _zone(tz_name))
+
+
+@lru_cache(maxsize=4096)
+def day_slots(
+    tz_name: str,
+    day: date,
+    slot_minutes: int,
+    start_minute: int = 0,
+    end_minute: int = MINUTES_PER_DAY,
+) -> tuple[Slot, ...]:
+    """
+    Slots of slot_minutes starting from start_minute (local, from midnight) while
+    before end_minute; the last one may run past it. tz_name must be resolved.
+    """
+    tz = _zone(tz_name)
+    midnight = datetime.combine(day, time.min)
+    starts = list(range(start_minute, end_minute, slot_minutes))
+    if not starts:
+        return ()
+    boundaries = [
+        _to_utc(midnight + timedelta(minutes=minute), tz)
+        for minute in [*starts, starts[-1] + slot_minutes]
+    ]
+    return tuple(
+        Slot(f"{minute // 60:02d}:{minute % 60:02d}", boundaries[i], boundaries[i + 1])
+        for i, minute in enumerate(starts)
+    )
+
+
+def week_slots(tz_name: str, week_start: date, slot_minutes: int) -> tuple[tuple[Slot, ...], ...]:
+    return tuple(day_slots(tz_name, week_start + timedelta(days=i), slot_minutes) for i in range(7))
+
+
+def occupied(slots: Iterable[Slot], busy: Iterable[tuple[datetime, datetime]]) -> list[bool]:
+    """For slots in time order, whether any [start, end) interval in busy overlaps each."""
+    # Merge the intervals, then sweep both sorted sequences once
+    merged: list[list[datetime]] = []
+    for start, end in sorted(busy):
+        if merged and start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    flags = []
+    i = 0
+    for slot in slots:
+        while i < len(merged) and merged[i][1] <= slot.start:
+            i += 1
+        flags.append(slot.exists and i < len(merged) and merged[i][0] < slot.end)
+    return flags
+
+
+def free_slots(slots: Iterable[Slot], busy: Iterable[tuple[datetime, datetime]]) -> list[Slot]:
+    """Existing slots not overlapped by any busy interval."""
+    slots = list(slots)
+    return [slot for slot, taken in zip(slots, occupied(slots, busy)) if slot.exists and not taken]
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+from decimal import Decimal
+from importlib import import_module
+
+from django.apps import apps
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+from rest_framework.test import APIClient
+
+from clients.models import Client
+
+from .models import OVERLAP_CONSTRAINT, Booking, Service
+from .slots import day_slots, free_slots, local_to_utc
+
+User = get_user_model()
+
+demote_overlapping_bookings = import_module(
+    "bookings.migrations.0005_no_overlapping_bookings"
+).demote_overlapping_bookings
+
+
+def _at(hour: int, minute: int = 0, days: int = 3) -> datetime:
+    day = datetime.now(dt_timezone.utc).date() + timedelta(days=days)
+    return datetime(day.year, day.month, day.day, hour, minute, tzinfo=dt_timezone.utc)
+
+
+class NoOverlapTests(TestCase):
+    def setUp(self) -> None:
+        self.owner = User.objects.create_user(email="owner@example.com", password="secret-pass-123")
+        self.client_row = Client.objects.create(owner=self.owner, name="Jane")
+        self.service = Service.objects.create(owner=self.owner, name="Cut", price=Decimal("20.00"))
+
+    def _booking(self, start: datetime, minutes: int = 30, owner=None, status: str = "confirmed") -> Booking:
+        owner = owner or self.owner
+        client = self.client_row if owner == self.owner else Client.objects.create(owner=owner, name="Bob")
+        return Booking.objects.create(
+            owner=owner, client=client, starts_at=start, ends_at=start + timedelta(minutes=minutes), status=status
+        )
+
+    def test_serializer_rejects_overlap_with_400(self) -> None:
+        self._booking(_at(10))
+        api = APIClient()
+        api.force_authenticate(self.owner)
+        response = api.post(
+            "/api/v1/bookings/",
+            {
+                "client": self.client_row.pk,
+                "service": self.service.pk,
+                "starts_at": _at(10, 15).isoformat(),
+                "ends_at": _at(10, 45).isoformat(),
+                "status": "confirmed",
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("starts_at", response.json())
+        self.assertEqual(Booking.objects.filter(owner=self.owner).count(), 1)
+
+    def test_demote_overlapping_bookings_keeps_the_earliest(self) -> None:
+        # Rows from before the constraint existed
+        with connection.cursor() as cursor:
+            cursor.execute(f"ALTER TABLE {Booking._meta.db_table} DROP CONSTRAINT {OVERLAP_CONSTRAINT}")
+        first = self._booking(_at(10), minutes=60)
+        overlapping = self._booking(_at(10, 30))
+        back_to_back = self._booking(_at(11))
+        # vapi_webhook_token is unique, blank included
+        other_owner = User.objects.create_user(
+            email="other@example.com", password="secret-pass-123", vapi_webhook_token="other-token"
+        )
+        elsewhere = self._booking(_at(10), owner=other_owner)
+
+        # In a migration it runs on historical models, which have no tenant guard
+        with self.settings(TENANT_QUERY_GUARD=""):
+            demote_overlapping_bookings(apps, None)
+
+        statuses = dict(Booking.objects.unscoped().values_list("pk", "status"))
+        self.assertEqual(statuses[first.pk], "confirmed")
+        self.assertEqual(statuses[overlapping.pk], "pending")
+        self.assertEqual(statuses[back_to_back.pk], "confirmed")
+        self.assertEqual(statuses[elsewhere.pk], "confirmed")
+
+
+def _utc(day: date, hour: int, minute: int = 0) -> datetime:
+    return datetime(day.year, day.month, day.day, hour, minute, tzinfo=dt_timezone.utc)
+
+
+class DaySlotsDstTests(SimpleTestCase):
+    """Slot boundaries across New York's 2026 DST changes (see bookings/slots.py)."""
+
+    TZ = "America/New_York"
+    SPRING = date(2026, 3, 8)
+    FALL = date(2026, 11, 1)
+
+    def _slots(self, day: date) -> dict:
+        return {slot.label: slot for slot in day_slots(self.TZ, day, 30)}
+
+    def test_spring_forward_gap(self) -> None:
+        slots = self._slots(self.SPRING)
+        # 02:00 EST never happens: the clocks jump to 03:00 EDT at 07:00 UTC
+        self.assertEqual((slots["01:30"].start, slots["01:30"].end), (_utc(self.SPRING, 6, 30), _utc(self.SPRING, 7)))
+        for label in ("02:00", "02:30"):
+            self.assertEqual(slots[label].start, _utc(self.SPRING, 7))
+            self.assertEqual(slots[label].end, slots[label].start)
+            self.assertFalse(slots[label].exists)
+        self.assertEqual((slots["03:00"].start, slots["03:00"].end), (_utc(self.SPRING, 7), _utc(self.SPRING, 7, 30)))
+        self.assertEqual(local_to_utc(datetime(2026, 3, 8, 2, 15), self.TZ), _utc(self.SPRING, 7))
+
+    def test_fall_back_overlap(self) -> None:
+        slots = self._slots(self.FALL)
+        # 01:00-02:00 happens twice (EDT, then EST); wall times map to the first
+        self.assertEqual(slots["01:00"].start, _utc(self.FALL, 5))
+        self.assertEqual(local_to_utc(datetime(2026, 11, 1, 1, 30), self.TZ), _utc(self.FALL, 5, 30))
+        # The slot before 02:00 EST also covers the repeated hour
+        self.assertEqual((slots["01:30"].start, slots["01:30"].end), (_utc(self.FALL, 5, 30), _utc(self.FALL, 7)))
+        ordered = list(slots.values())
+        self.assertTrue(all(a.end == b.start for a, b in zip(ordered, ordered[1:])))
+        self.assertEqual(ordered[-1].end - ordered[0].start, timedelta(hours=25))
+
+    def test_free_slots_skip_the_gap(self) -> None:
+        slots = day_slots(self.TZ, self.SPRING, 30)
+        busy = [(_utc(self.SPRING, 6, 30), _utc(self.SPRING, 7))]
+        free = {slot.label for slot in free_slots(slots, busy)}
+        self.assertEqual(len(free), 48 - 2 - 1)
+        self.assertFalse({"01:30", "02:00", "02:30"} & free)
+        self.assertIn("03:00", free)
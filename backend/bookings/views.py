@@ -1,22 +1,40 @@
 from __future__ import annotations
 
 import logging
-from datetime import datetime, timedelta, time
-from decimal import Decimal
-from zoneinfo import ZoneInfo
+from datetime import datetime
 
-from django.db.models import Count, Q, Sum
 from django.utils import timezone
 from rest_framework import permissions, viewsets
 from rest_framework.decorators import action
 from rest_framework.response import Response
 
+from accounts.cache_versions import BOOKINGS, SERVICES
+from accounts.conditional import conditional_for_owner
+
+from .analytics import (
+    booking_heatmap,
+    booking_revenue,
+    booking_stats,
+    current_week_start,
+    empty_heatmap_grid,
+)
 from .models import Booking, Service
 from .serializers import BookingSerializer, ServiceSerializer
+from .slots import day_slots, free_slots, resolve_timezone
 
 logger = logging.getLogger(__name__)
 
 
+def _current_minute(request) -> tuple:
+    # stats/revenue windows end at "now": let their ETags expire every minute
+    return (timezone.now().strftime('%Y-%m-%dT%H:%M'),)
+
+
+def _heatmap_vary(request) -> tuple:
+    # Without week_start the current week is used; the grid is in the user's timezone
+    return (timezone.now().date().isoformat(), getattr(request.user, 'timezone', None))
+
+
 class ServiceViewSet(viewsets.ModelViewSet):
     """
     CRUD endpoints for salon/business services that Elara can book.
@@ -27,7 +45,15 @@ class ServiceViewSet(viewsets.ModelViewSet):
 
     def get_queryset(self):
         # Only return services for the authenticated business owner.
-        return Service.objects.filter(owner=self.request.user).order_by("name")
+        return Service.objects.for_owner(self.request.user).order_by("name")
+
+    @conditional_for_owner("services", [SERVICES])
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
+    @conditional_for_owner("services", [SERVICES])
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
 
 
 class BookingViewSet(viewsets.ModelViewSet):
@@ -40,7 +66,7 @@ class BookingViewSet(viewsets.ModelViewSet):
 
     def get_queryset(self):
         # Only return bookings for the authenticated business owner.
-        queryset = Booking.objects.filter(owner=self.request.user).select_related('client', 'service').order_by('-starts_at')
+        queryset = Booking.objects.for_owner(self.request.user).select_related('client', 'service').order_by('-starts_at')
         
         # Filter by client if provided
         client_id = self.request.query_params.get('client')
@@ -50,232 +76,44 @@ class BookingViewSet(viewsets.ModelViewSet):
         return queryset
 
     @action(detail=False, methods=['get'])
+    @conditional_for_owner("bookings:stats", [BOOKINGS], vary=_current_minute)
     def stats(self, request):
         """Get dashboard statistics."""
-        user = request.user
-        now = timezone.now()
-        this_month_start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-        last_month_start = (this_month_start - timedelta(days=1)).replace(day=1)
-        last_month_end = this_month_start - timedelta(seconds=1)
-
-        # Total bookings (all time)
-        total_bookings = Booking.objects.filter(owner=user).count()
-
-        # Bookings this month vs last month
-        bookings_this_month = Booking.objects.filter(
-            owner=user,
-            starts_at__gte=this_month_start
-        ).count()
-        bookings_last_month = Booking.objects.filter(
-            owner=user,
-            starts_at__gte=last_month_start,
-            starts_at__lt=this_month_start
-        ).count()
-        bookings_change = self._calculate_percentage_change(bookings_last_month, bookings_this_month)
-
-        # Active customers (customers with bookings in last 30 days)
-        thirty_days_ago = now - timedelta(days=30)
-        active_customers = Booking.objects.filter(
-            owner=user,
-            starts_at__gte=thirty_days_ago
-        ).values('client').distinct().count()
-        
-        # Active customers last month
-        active_customers_last_month = Booking.objects.filter(
-            owner=user,
-            starts_at__gte=last_month_start,
-            starts_at__lt=this_month_start
-        ).values('client').distinct().count()
-        customers_change = self._calculate_percentage_change(active_customers_last_month, active_customers)
-
-        # Monthly sales (sum of service prices from bookings this month)
-        monthly_sales = Booking.objects.filter(
-            owner=user,
-            starts_at__gte=this_month_start,
-            service__isnull=False
-        ).aggregate(total=Sum('service__price'))['total'] or Decimal('0')
-        
-        # Monthly sales last month
-        monthly_sales_last_month = Booking.objects.filter(
-            owner=user,
-            starts_at__gte=last_month_start,
-            starts_at__lt=this_month_start,
-            service__isnull=False
-        ).aggregate(total=Sum('service__price'))['total'] or Decimal('0')
-        sales_change = self._calculate_percentage_change(float(monthly_sales_last_month), float(monthly_sales))
-
-        # Calls handled (using bookings count for now, can be extended later)
-        calls_handled = total_bookings
-        calls_handled_last_month = bookings_last_month
-        calls_change = self._calculate_percentage_change(calls_handled_last_month, calls_handled)
-
-        return Response({
-            'total_bookings': total_bookings,
-            'bookings_change': bookings_change,
-            'calls_handled': calls_handled,
-            'calls_change': calls_change,
-            'active_customers': active_customers,
-            'customers_change': customers_change,
-            'monthly_sales': float(monthly_sales),
-            'sales_change': sales_change,
-        })
+        return Response(booking_stats(request.user.id, timezone.now()))
 
     @action(detail=False, methods=['get'])
+    @conditional_for_owner("bookings:revenue", [BOOKINGS], vary=_current_minute)
     def revenue(self, request):
         """Get revenue data for charts."""
-        user = request.user
         range_type = request.query_params.get('range', 'day')  # day, week, month
-        
-        now = timezone.now()
-        data = []
-
-        if range_type == 'day':
-            # Last 7 days
-            for i in range(6, -1, -1):
-                date = (now - timedelta(days=i)).date()
-                day_start = timezone.make_aware(datetime.combine(date, datetime.min.time()))
-                day_end = day_start + timedelta(days=1)
-                
-                revenue = Booking.objects.filter(
-                    owner=user,
-                    starts_at__gte=day_start,
-                    starts_at__lt=day_end,
-                    service__isnull=False
-                ).aggregate(total=Sum('service__price'))['total'] or Decimal('0')
-                
-                day_name = date.strftime('%a')
-                data.append({
-                    'label': day_name,
-                    'value': float(revenue)
-                })
-        
-        elif range_type == 'week':
-            # Last 4 weeks
-            for i in range(3, -1, -1):
-                week_start = now - timedelta(weeks=i+1)
-                week_end = now - timedelta(weeks=i)
-                
-                revenue = Booking.objects.filter(
-                    owner=user,
-                    starts_at__gte=week_start,
-                    starts_at__lt=week_end,
-                    service__isnull=False
-                ).aggregate(total=Sum('service__price'))['total'] or Decimal('0')
-                
-                data.append({
-                    'label': f'W{4-i}',
-                    'value': float(revenue)
-                })
-        
-        elif range_type == 'month':
-            # Last 12 months
-            for i in range(11, -1, -1):
-                month_start = (now - timedelta(days=30*i)).replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-                if i == 0:
-                    month_end = now
-                else:
-                    next_month = month_start + timedelta(days=32)
-                    month_end = next_month.replace(day=1) - timedelta(seconds=1)
-                
-                revenue = Booking.objects.filter(
-                    owner=user,
-                    starts_at__gte=month_start,
-                    starts_at__lt=month_end,
-                    service__isnull=False
-                ).aggregate(total=Sum('service__price'))['total'] or Decimal('0')
-                
-                month_name = month_start.strftime('%b')
-                data.append({
-                    'label': month_name,
-                    'value': float(revenue)
-                })
-
-        return Response(data)
+        return Response(booking_revenue(request.user.id, range_type, timezone.now()))
 
     @action(detail=False, methods=['get'])
+    @conditional_for_owner("bookings:heatmap", [BOOKINGS], vary=_heatmap_vary)
     def heatmap(self, request):
         """Get bookings heatmap data for a specific week. Returns empty grid on any error to avoid 500."""
-        user = request.user
         week_start_str = request.query_params.get('week_start')
-        week_days = ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']
-        empty_grid = [
-            [
-                {'day': week_days[day_idx], 'label': f'{slot_idx // 2:02d}:{(slot_idx % 2) * 30:02d}', 'hasBooking': False}
-                for slot_idx in range(48)
-            ]
-            for day_idx in range(7)
-        ]
-        fallback_week_start = week_start_str
-        if not fallback_week_start:
-            today = timezone.now().date()
-            days_since_monday = today.weekday()
-            fallback_week_start = (today - timedelta(days=days_since_monday)).isoformat()
+        fallback_week_start = week_start_str or current_week_start(timezone.now()).isoformat()
 
         try:
             if not week_start_str:
-                today = timezone.now().date()
-                days_since_monday = today.weekday()
-                week_start = today - timedelta(days=days_since_monday)
+                week_start = current_week_start(timezone.now())
             else:
                 week_start = datetime.strptime(week_start_str, '%Y-%m-%d').date()
-
-            week_end = week_start + timedelta(days=7)
             # Use query param if sent, else the user's saved timezone from account settings
-            tz_str = (
+            tz_name = resolve_timezone(
                 request.query_params.get('tz')
                 or getattr(request.user, 'timezone', None)
-                or 'UTC'
-            ).strip() or 'UTC'
-            try:
-                tz = ZoneInfo(tz_str)
-            except Exception:
-                tz = timezone.utc
-
-            week_start_dt = datetime.combine(week_start, time.min).replace(tzinfo=tz).astimezone(timezone.utc)
-            week_end_dt = datetime.combine(week_end, time.min).replace(tzinfo=tz).astimezone(timezone.utc)
-
-            bookings = list(
-                Booking.objects.filter(
-                    owner=user,
-                    status='confirmed',
-                    starts_at__gte=week_start_dt,
-                    starts_at__lt=week_end_dt
-                ).values_list('starts_at', 'ends_at')
             )
-
-            grid = []
-            for day_idx in range(7):
-                day_date = week_start + timedelta(days=day_idx)
-                day_row = []
-                for slot_idx in range(48):
-                    hours = slot_idx // 2
-                    minutes = (slot_idx % 2) * 30
-                    slot_start_local = datetime.combine(
-                        day_date, time(hour=hours, minute=minutes, second=0, microsecond=0)
-                    ).replace(tzinfo=tz)
-                    slot_end_local = slot_start_local + timedelta(minutes=30)
-                    slot_start_utc = slot_start_local.astimezone(timezone.utc)
-                    slot_end_utc = slot_end_local.astimezone(timezone.utc)
-                    has_booking = any(
-                        start < slot_end_utc and end > slot_start_utc
-                        for start, end in bookings
-                    )
-                    day_row.append({
-                        'day': week_days[day_idx],
-                        'label': f'{hours:02d}:{minutes:02d}',
-                        'hasBooking': has_booking
-                    })
-                grid.append(day_row)
-
             return Response({
                 'week_start': week_start_str or week_start.isoformat(),
-                'grid': grid
+                'grid': booking_heatmap(request.user.id, week_start, tz_name)
             })
         except Exception as e:
             logger.exception("bookings heatmap error: tz=%s week_start=%s", request.query_params.get('tz'), week_start_str)
             return Response({
                 'week_start': fallback_week_start,
-                'grid': empty_grid
+                'grid': empty_heatmap_grid()
             }, status=200)
 
     @action(detail=False, methods=['get'])
@@ -309,17 +147,16 @@ class BookingViewSet(viewsets.ModelViewSet):
         slot_minutes = int(request.query_params.get('slot_minutes') or 30)
         start_hour = int(request.query_params.get('start_hour') or 8)
         end_hour = int(request.query_params.get('end_hour') or 18)
-        if slot_minutes <= 0 or start_hour < 0 or end_hour <= start_hour:
+        if slot_minutes <= 0 or start_hour < 0 or end_hour <= start_hour or end_hour > 24:
             return Response(
                 {'error': 'Invalid slot_minutes/start_hour/end_hour'},
                 status=400,
             )
 
-        day_start = timezone.make_aware(
-            datetime.combine(day, datetime.min.time().replace(hour=start_hour, minute=0, second=0, microsecond=0))
-        )
-        day_end = timezone.make_aware(
-            datetime.combine(day, datetime.min.time().replace(hour=end_hour, minute=0, second=0, microsecond=0))
+        # Hours are in the server's timezone (TIME_ZONE)
+        slots = day_slots(
+            resolve_timezone(timezone.get_current_timezone_name()),
+            day, slot_minutes, start_hour * 60, end_hour * 60,
         )
 
         # Only confirmed bookings occupy a slot; cancelled/deleted free the slot
@@ -327,32 +164,12 @@ class BookingViewSet(viewsets.ModelViewSet):
             Booking.objects.filter(
                 owner=user,
                 status='confirmed',
-                starts_at__lt=day_end,
-                ends_at__gt=day_start,
+                starts_at__lt=slots[-1].end,
+                ends_at__gt=slots[0].start,
             ).values_list('starts_at', 'ends_at')
         )
 
-        slots = []
-        slot_start = day_start
-        while slot_start < day_end:
-            slot_end = slot_start + timedelta(minutes=slot_minutes)
-            # Slot is free if no existing booking overlaps [slot_start, slot_end)
-            occupied = any(
-                start < slot_end and end > slot_start
-                for start, end in existing
-            )
-            if not occupied:
-                slots.append(slot_start.strftime('%H:%M'))
-            slot_start = slot_end
-
         return Response({
             'date': date_str,
-            'slots': slots,
+            'slots': [slot.label for slot in free_slots(slots, existing)],
         })
-
-    def _calculate_percentage_change(self, old_value, new_value):
-        """Calculate percentage change between two values."""
-        if old_value == 0:
-            return 100.0 if new_value > 0 else 0.0
-        change = ((new_value - old_value) / old_value) * 100
-        return round(change, 1)
@@ -6,3 +6,5 @@ class ClientsConfig(AppConfig):
     name = "clients"
     verbose_name = "Clients"
 
+    def ready(self) -> None:
+        import clients.signals  # noqa: F401
@@ -0,0 +1,279 @@
+"""
+Finding and merging duplicate clients of one owner.
+
+The Vapi webhook creates a client for every caller it can't match, so tenants
+collect copies of the same person under formatting variants of one number
+("+1 (555) 010-2030", "555-010-2030"). Candidates are blocked by a phone key
+(the last 10 digits) and by a hash of the lowercased email, so only clients
+sharing a block are compared. Each pair in a block is scored:
+
+- same phone key or same email: +0.6 each,
+- names: up to +0.4 by similarity; a placeholder name ("Caller") counts half,
+- both have an email (or phone) and they differ: -0.5 (-0.3).
+
+Pairs at or above the threshold are grouped into clusters, best pairs first.
+Two clusters are only joined if none of their members contradict each other
+(different real names, emails or numbers), so a "Caller" placeholder sharing a
+number with both Jane and Bob can't chain them together. The
+client with the most bookings (then the oldest) survives; bookings, call
+summaries and alerts of the others are re-pointed to it with one UPDATE per
+table and chunk, their tags, notes and missing contact details are folded into
+it, and they are deleted. Each chunk is one transaction with the clients
+locked, so a webhook can't attach new rows to a client being merged away.
+"""
+from __future__ import annotations
+
+import hashlib
+import re
+from dataclasses import dataclass, field
+from difflib import SequenceMatcher
+from itertools import combinations
+
+from django.db import transaction
+from django.db.models import Case, IntegerField, Value, When
+
+from accounts.cache_versions import ALERTS, BOOKINGS, CALLS, bump_version
+from bookings.models import Booking
+from integrations.models import CallSummary
+from notifications.models import Alert
+
+from .models import Client
+from .stats import refresh_booking_stats
+from .tags import format_tags, parse_tags
+
+DEFAULT_THRESHOLD = 0.8
+# Larger blocks (a shared front-desk number, a placeholder email) are skipped, not compared pairwise
+MAX_BLOCK_SIZE = 50
+CHUNK_SIZE = 200
+PLACEHOLDER_NAMES = {"", "caller", "unknown", "customer"}
+
+_TAGS_MAX_LENGTH = Client._meta.get_field("tags").max_length
+
+
+def phone_key(phone: str | None) -> str:
+    """Last 10 digits of the number, so country-code and formatting variants collide."""
+    digits = re.sub(r"\D", "", phone or "")
+    return digits[-10:] if len(digits) >= 7 else ""
+
+
+def email_key(email: str | None) -> str:
+    email = (email or "").strip().lower()
+    return hashlib.sha256(email.encode()).hexdigest()[:16] if email else ""
+
+
+def _name(value: str | None) -> str:
+    return " ".join(re.sub(r"[^\w\s]", " ", (value or "").lower()).split())
+
+
+def name_similarity(a: str, b: str) -> float:
+    a, b = _name(a), _name(b)
+    if a in PLACEHOLDER_NAMES or b in PLACEHOLDER_NAMES:
+        return 0.5
+    if a == b:
+        return 1.0
+    tokens_a, tokens_b = set(a.split()), set(b.split())
+    # "Sam" vs "Sam Lee"
+    if tokens_a <= tokens_b or tokens_b <= tokens_a:
+        return 0.9
+    return SequenceMatcher(None, a, b).ratio()
+
+
+@dataclass
+class _Candidate:
+    id: int
+    name: str
+    email: str
+    phone: str
+    bookings_count: int
+    created_at: object
+
+    @property
+    def phone_key(self) -> str:
+        return phone_key(self.phone)
+
+    @property
+    def email_key(self) -> str:
+        return email_key(self.email)
+
+
+def _compatible(a: _Candidate, b: _Candidate) -> bool:
+    """False if the two clients are clearly different people."""
+    if a.phone_key and b.phone_key and a.phone_key != b.phone_key:
+        return False
+    if a.email_key and b.email_key and a.email_key != b.email_key:
+        return False
+    return name_similarity(a.name, b.name) >= 0.5
+
+
+def match_score(a: _Candidate, b: _Candidate) -> float:
+    score = 0.4 * name_similarity(a.name, b.name)
+    if a.phone_key and b.phone_key:
+        score += 0.6 if a.phone_key == b.phone_key else -0.3
+    if a.email_key and b.email_key:
+        score += 0.6 if a.email_key == b.email_key else -0.5
+    return round(score, 3)
+
+
+@dataclass
+class DuplicateCluster:
+    survivor_id: int
+    duplicate_ids: list[int]
+    # Lowest pair score that joined the cluster
+    score: float
+    names: dict[int, str] = field(default_factory=dict)
+
+
+def find_duplicates(owner_id: int, threshold: float = DEFAULT_THRESHOLD) -> tuple[list[DuplicateCluster], int]:
+    """Clusters of the owner's duplicate clients, and how many oversized blocks were skipped."""
+    candidates = {
+        row[0]: _Candidate(*row)
+        for row in Client.objects.for_owner(owner_id).values_list(
+            "id", "name", "email", "phone_number", "bookings_count", "created_at"
+        )
+    }
+    blocks: dict[str, list[int]] = {}
+    for candidate in candidates.values():
+        if candidate.phone_key:
+            blocks.setdefault(f"p:{candidate.phone_key}", []).append(candidate.id)
+        if candidate.email_key:
+            blocks.setdefault(f"e:{candidate.email_key}", []).append(candidate.id)
+
+    skipped = 0
+    pairs: dict[tuple[int, int], float] = {}
+    for ids in blocks.values():
+        if len(ids) < 2:
+            continue
+        if len(ids) > MAX_BLOCK_SIZE:
+            skipped += 1
+            continue
+        for a, b in combinations(sorted(ids), 2):
+            if (a, b) not in pairs:
+                pairs[(a, b)] = match_score(candidates[a], candidates[b])
+
+    # Cluster id (the first member) of each client, and each cluster's members
+    cluster_of = {pk: pk for pk in candidates}
+    groups = {pk: [candidates[pk]] for pk in candidates}
+    low_scores: dict[int, float] = {}
+    for (a, b), score in sorted(pairs.items(), key=lambda item: -item[1]):
+        if score < threshold:
+            break
+        ca, cb = cluster_of[a], cluster_of[b]
+        if ca == cb or not all(_compatible(x, y) for x in groups[ca] for y in groups[cb]):
+            continue
+        for member in groups[cb]:
+            cluster_of[member.id] = ca
+        groups[ca] += groups.pop(cb)
+        low_scores[ca] = min(score, low_scores.get(ca, score), low_scores.pop(cb, score))
+
+    clusters = []
+    for cluster_id, group in groups.items():
+        if len(group) < 2:
+            continue
+        group.sort(key=lambda c: (-c.bookings_count, c.created_at, c.id))
+        clusters.append(DuplicateCluster(
+            survivor_id=group[0].id,
+            duplicate_ids=[c.id for c in group[1:]],
+            score=low_scores[cluster_id],
+            names={c.id: c.name for c in group},
+        ))
+    clusters.sort(key=lambda c: c.survivor_id)
+    return clusters, skipped
+
+
+def _repoint(queryset, field_name: str, mapping: dict[int, int]) -> int:
+    """Point rows at each duplicate to its survivor in one UPDATE."""
+    if not mapping:
+        return 0
+    return queryset.filter(**{f"{field_name}__in": list(mapping)}).update(**{
+        field_name: Case(
+            *(When(**{field_name: dup}, then=Value(survivor)) for dup, survivor in mapping.items()),
+            output_field=IntegerField(),
+        )
+    })
+
+
+def _fold(survivor: Client, duplicates: list[Client]) -> list[str]:
+    """Copy what the duplicates add into the survivor; returns the changed field names."""
+    changed = []
+    for name in ("email", "phone_number"):
+        if not getattr(survivor, name):
+            value = next((getattr(d, name) for d in duplicates if getattr(d, name)), "")
+            if value:
+                setattr(survivor, name, value)
+                changed.append(name)
+    if _name(survivor.name) in PLACEHOLDER_NAMES:
+        real = next((d.name for d in duplicates if _name(d.name) not in PLACEHOLDER_NAMES), "")
+        if real:
+            survivor.name = real
+            changed.append("name")
+    notes = [survivor.notes.strip()] if survivor.notes.strip() else []
+    kept = len(notes)
+    for d in duplicates:
+        note = d.notes.strip()
+        if note and not any(note in n for n in notes):
+            notes.append(note)
+    if len(notes) > kept:
+        survivor.notes = "\n\n".join(notes)
+        changed.append("notes")
+    tags = parse_tags(", ".join([survivor.tags, *(d.tags for d in duplicates)]))
+    while tags and len(format_tags(tags)) > _TAGS_MAX_LENGTH:
+        tags.pop()
+    if format_tags(tags) != survivor.tags:
+        survivor.tags = format_tags(tags)
+        changed.append("tags")
+    return changed
+
+
+@dataclass
+class MergeResult:
+    clusters: int = 0
+    clients_removed: int = 0
+    bookings: int = 0
+    call_summaries: int = 0
+    alerts: int = 0
+
+
+def merge_clusters(owner_id: int, clusters: list[DuplicateCluster]) -> MergeResult:
+    """Merge each cluster into its survivor, CHUNK_SIZE clusters per transaction."""
+    result = MergeResult()
+    for start in range(0, len(clusters), CHUNK_SIZE):
+        chunk = clusters[start:start + CHUNK_SIZE]
+        mapping = {dup: c.survivor_id for c in chunk for dup in c.duplicate_ids}
+        survivor_ids = [c.survivor_id for c in chunk]
+        with transaction.atomic():
+            # Locked until commit: new bookings/calls can't reference a client being removed
+            locked = {
+                client.pk: client
+                for client in Client.objects.for_owner(owner_id)
+                .select_for_update()
+                .filter(pk__in=[*survivor_ids, *mapping])
+                .order_by("pk")
+            }
+            # Skip clusters whose survivor was deleted since find_duplicates()
+            mapping = {dup: survivor for dup, survivor in mapping.items() if dup in locked and survivor in locked}
+            if not mapping:
+                continue
+            result.bookings += _repoint(Booking.objects.for_owner(owner_id), "client_id", mapping)
+            result.call_summaries += _repoint(
+                CallSummary.objects.for_owner(owner_id), "related_client_id", mapping
+            )
+            result.alerts += _repoint(Alert.objects.for_owner(owner_id), "related_client_id", mapping)
+
+            for cluster in chunk:
+                survivor = locked.get(cluster.survivor_id)
+                duplicates = [locked[pk] for pk in cluster.duplicate_ids if mapping.get(pk) == cluster.survivor_id]
+                if survivor is None or not duplicates:
+                    continue
+                changed = _fold(survivor, duplicates)
+                if changed:
+                    # Signals re-sync the survivor's tag links and bump CLIENTS/BOOKINGS
+                    survivor.save(update_fields=changed)
+                result.clusters += 1
+
+            # Nothing references the duplicates any more; their tag links cascade
+            _, deleted = Client.objects.for_owner(owner_id).filter(pk__in=list(mapping)).delete()
+            result.clients_removed += deleted.get(Client._meta.label, 0)
+            refresh_booking_stats(owner_id, set(mapping.values()))
+            # The UPDATEs above send no signals
+            bump_version(owner_id, BOOKINGS, CALLS, ALERTS)
+    return result
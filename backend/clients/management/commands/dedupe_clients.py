@@ -0,0 +1,75 @@
+"""
+Merge duplicate clients (mostly callers the Vapi webhook created twice) into
+one, moving their bookings, call summaries, alerts, tags and notes. Report
+first with --dry-run:
+  python manage.py dedupe_clients --dry-run [--owner ID] [--threshold 0.8]
+  python manage.py dedupe_clients [--owner ID]
+"""
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from clients.dedupe import DEFAULT_THRESHOLD, MAX_BLOCK_SIZE, find_duplicates, merge_clusters
+
+
+class Command(BaseCommand):
+    help = "Find and merge duplicate clients per owner"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--owner", type=int, help="Only this owner's (user id) clients")
+        parser.add_argument(
+            "--threshold",
+            type=float,
+            default=DEFAULT_THRESHOLD,
+            help=f"Minimum match score to merge a pair (default: {DEFAULT_THRESHOLD})",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only list the clusters that would be merged",
+        )
+
+    def handle(self, *args, **options):
+        threshold = options["threshold"]
+        if not 0 < threshold <= 1.6:
+            raise CommandError("--threshold must be between 0 and 1.6")
+        owners = get_user_model().objects.filter(clients__isnull=False).distinct()
+        if options["owner"]:
+            owners = owners.filter(pk=options["owner"])
+        verbose = options["verbosity"] > 1
+        clusters_total = removed_total = 0
+        for owner_id in owners.order_by("pk").values_list("pk", flat=True):
+            clusters, skipped = find_duplicates(owner_id, threshold)
+            if skipped:
+                self.stderr.write(
+                    f"owner {owner_id}: skipped {skipped} block(s) of more than {MAX_BLOCK_SIZE} "
+                    "clients sharing a phone or email"
+                )
+            if not clusters:
+                continue
+            if options["dry_run"]:
+                duplicates = sum(len(c.duplicate_ids) for c in clusters)
+                self.stdout.write(f"owner {owner_id}: {len(clusters)} cluster(s), {duplicates} duplicate(s)")
+                if verbose or options["owner"]:
+                    for c in clusters:
+                        others = ", ".join(f"#{pk} {c.names[pk]!r}" for pk in c.duplicate_ids)
+                        self.stdout.write(
+                            f"  keep #{c.survivor_id} {c.names[c.survivor_id]!r} <- {others} (score {c.score})"
+                        )
+                clusters_total += len(clusters)
+                removed_total += duplicates
+                continue
+            result = merge_clusters(owner_id, clusters)
+            self.stdout.write(
+                f"owner {owner_id}: merged {result.clients_removed} client(s) into {result.clusters}; "
+                f"moved {result.bookings} booking(s), {result.call_summaries} call(s), {result.alerts} alert(s)"
+            )
+            clusters_total += result.clusters
+            removed_total += result.clients_removed
+        if options["dry_run"]:
+            self.stdout.write(self.style.SUCCESS(
+                f"Would merge {removed_total} duplicate client(s) into {clusters_total}."
+            ))
+        else:
+            self.stdout.write(self.style.SUCCESS(
+                f"Merged {removed_total} duplicate client(s) into {clusters_total}."
+            ))
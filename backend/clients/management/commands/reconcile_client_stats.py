@@ -0,0 +1,58 @@
+"""
+Rebuild Client.bookings_count, last_booking_at and lifetime_value from bookings,
+and the clients' tag links from their tags strings. Signals keep both current;
+run this after bulk imports or raw SQL on clients or bookings, or periodically
+as a safety net (--dry-run checks the booking stats only):
+  python manage.py reconcile_client_stats [--owner ID] [--dry-run]
+"""
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db.models import F, Q
+
+from clients.models import Client
+from clients.stats import booking_stats_annotations, refresh_booking_stats
+from clients.tags import rebuild_client_tags
+
+
+class Command(BaseCommand):
+    help = "Recompute per-client booking aggregates and tag links"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--owner", type=int, help="Only this owner's (user id) clients")
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report how many clients are out of date",
+        )
+
+    def handle(self, *args, **options):
+        owners = get_user_model().objects.filter(clients__isnull=False).distinct()
+        if options["owner"]:
+            owners = owners.filter(pk=options["owner"])
+        stale_total = updated_total = links_total = 0
+        for owner_id in owners.order_by("pk").values_list("pk", flat=True):
+            if options["dry_run"]:
+                stale = (
+                    Client.objects.for_owner(owner_id)
+                    .annotate(**booking_stats_annotations(owner_id, prefix="actual_"))
+                    .filter(
+                        ~Q(bookings_count=F("actual_bookings_count"))
+                        | ~Q(lifetime_value=F("actual_lifetime_value"))
+                        | ~Q(last_booking_at=F("actual_last_booking_at"))
+                        | Q(last_booking_at__isnull=True, actual_last_booking_at__isnull=False)
+                        | Q(last_booking_at__isnull=False, actual_last_booking_at__isnull=True)
+                    )
+                    .count()
+                )
+                stale_total += stale
+                if stale:
+                    self.stdout.write(f"owner {owner_id}: {stale} client(s) out of date")
+            else:
+                updated_total += refresh_booking_stats(owner_id)
+                links_total += rebuild_client_tags(owner_id)
+        if options["dry_run"]:
+            self.stdout.write(self.style.SUCCESS(f"{stale_total} client(s) out of date."))
+        else:
+            self.stdout.write(self.style.SUCCESS(
+                f"Recomputed stats for {updated_total} client(s); rebuilt {links_total} tag link(s)."
+            ))
@@ -0,0 +1,19 @@
+# Generated by Django 5.0.14 on 2026-10-19 18:24
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clients', '0002_client_notes_client_tags'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='client',
+            index=models.Index(fields=['owner', '-created_at'], name='clients_cli_owner_i_4261ee_idx'),
+        ),
+    ]
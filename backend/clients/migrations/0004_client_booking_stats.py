@@ -0,0 +1,71 @@
+# Generated by Django 5.0.14 on 2026-10-19 18:39
+
+from django.conf import settings
+from decimal import Decimal
+
+from django.db import migrations, models
+from django.db.models import Count, Max, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+
+
+def backfill_booking_stats(apps, schema_editor):
+    Client = apps.get_model('clients', 'Client')
+    Booking = apps.get_model('bookings', 'Booking')
+    per_client = Booking.objects.filter(client=OuterRef('pk')).order_by().values('client')
+    Client.objects.update(
+        bookings_count=Coalesce(
+            Subquery(per_client.annotate(n=Count('pk')).values('n')),
+            Value(0),
+            output_field=models.IntegerField(),
+        ),
+        last_booking_at=Subquery(per_client.annotate(last=Max('starts_at')).values('last')),
+        lifetime_value=Coalesce(
+            Subquery(per_client.annotate(total=Sum('service__price')).values('total')),
+            Value(Decimal('0')),
+            output_field=models.DecimalField(max_digits=12, decimal_places=2),
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0004_owner_indexes'),
+        ('clients', '0003_owner_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='client',
+            name='bookings_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='client',
+            name='last_booking_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='client',
+            name='lifetime_value',
+            field=models.DecimalField(decimal_places=2, default=0, editable=False, max_digits=12),
+        ),
+        migrations.RunPython(backfill_booking_stats, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='client',
+            index=models.Index(fields=['owner', 'name'], name='clients_cli_owner_i_ae608d_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='client',
+            index=models.Index(fields=['owner', '-bookings_count'], name='clients_cli_owner_i_6a2f82_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='client',
+            index=models.Index(fields=['owner', '-lifetime_value'], name='clients_cli_owner_i_f06a7f_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='client',
+            index=models.Index(models.F('owner'), models.OrderBy(models.F('last_booking_at'), descending=True, nulls_last=True), name='clients_owner_last_booking'),
+        ),
+    ]
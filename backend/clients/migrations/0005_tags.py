@@ -0,0 +1,74 @@
+# Generated by Django 5.0.14 on 2026-10-19 18:41
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def split_tags(apps, schema_editor):
+    Client = apps.get_model('clients', 'Client')
+    Tag = apps.get_model('clients', 'Tag')
+    ClientTag = apps.get_model('clients', 'ClientTag')
+    tag_ids = {}
+    links = []
+    rows = Client.objects.exclude(tags='').values_list('id', 'owner_id', 'tags').order_by('owner_id', 'id')
+    for client_id, owner_id, tags in rows.iterator(chunk_size=2000):
+        seen = set()
+        for raw in tags.split(','):
+            name = ' '.join(raw.split())[:100]
+            key = name.lower()
+            if not name or key in seen:
+                continue
+            seen.add(key)
+            if (owner_id, key) not in tag_ids:
+                tag_ids[(owner_id, key)] = Tag.objects.create(owner_id=owner_id, name=name, key=key).pk
+            links.append(ClientTag(client_id=client_id, tag_id=tag_ids[(owner_id, key)]))
+            if len(links) >= 2000:
+                ClientTag.objects.bulk_create(links)
+                links = []
+    ClientTag.objects.bulk_create(links)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('clients', '0004_client_booking_stats'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Tag',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100)),
+                ('key', models.CharField(max_length=100)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('owner', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='client_tags', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['name'],
+            },
+        ),
+        migrations.CreateModel(
+            name='ClientTag',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('client', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='tag_links', to='clients.client')),
+                ('tag', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='client_links', to='clients.tag')),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='tag',
+            constraint=models.UniqueConstraint(fields=('owner', 'key'), name='clients_tag_owner_key'),
+        ),
+        migrations.AddIndex(
+            model_name='clienttag',
+            index=models.Index(fields=['tag', 'client'], name='clients_cli_tag_id_7104a0_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='clienttag',
+            constraint=models.UniqueConstraint(fields=('client', 'tag'), name='clients_clienttag_unique'),
+        ),
+        migrations.RunPython(split_tags, migrations.RunPython.noop),
+    ]
@@ -2,6 +2,9 @@ from __future__ import annotations
 
 from django.conf import settings
 from django.db import models
+from django.db.models import F
+
+from accounts.tenancy import TenantManager
 
 
 class Client(models.Model):
@@ -20,6 +23,7 @@ class Client(models.Model):
     email = models.EmailField(blank=True)
     phone_number = models.CharField(max_length=50, blank=True)
     notes = models.TextField(blank=True)
+    # Mirrored into Tag/ClientTag rows for filtering (clients/tags.py)
     tags = models.CharField(
         max_length=255,
         blank=True,
@@ -27,9 +31,79 @@ class Client(models.Model):
     )
     created_at = models.DateTimeField(auto_now_add=True)
 
+    # Denormalized from the client's bookings (clients/stats.py); kept current by
+    # Booking/Service signals, rebuilt by `manage.py reconcile_client_stats`.
+    bookings_count = models.PositiveIntegerField(default=0, editable=False)
+    last_booking_at = models.DateTimeField(null=True, blank=True, editable=False)
+    lifetime_value = models.DecimalField(max_digits=12, decimal_places=2, default=0, editable=False)
+
+    objects = TenantManager()
+
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["owner", "-created_at"]),
+            # Sort orders offered by the customers page
+            models.Index(fields=["owner", "name"]),
+            models.Index(fields=["owner", "-bookings_count"]),
+            models.Index(fields=["owner", "-lifetime_value"]),
+            models.Index(
+                "owner",
+                F("last_booking_at").desc(nulls_last=True),
+                name="clients_owner_last_booking",
+            ),
+        ]
 
     def __str__(self) -> str:
         return self.name
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Tag links are only re-synced when the tags string changed (clients/signals.py)
+        instance._loaded_tags = instance.__dict__.get("tags")
+        return instance
+
+
+class Tag(models.Model):
+    """A customer segment label, unique per owner regardless of case."""
+
+    owner = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="client_tags",
+    )
+    # As first entered, for display
+    name = models.CharField(max_length=100)
+    # Lowercased name, used for matching
+    key = models.CharField(max_length=100)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    objects = TenantManager()
+
+    class Meta:
+        ordering = ["name"]
+        constraints = [
+            models.UniqueConstraint(fields=["owner", "key"], name="clients_tag_owner_key"),
+        ]
+
+    def __str__(self) -> str:
+        return self.name
+
+
+class ClientTag(models.Model):
+    """Links a client to one of its owner's tags. Scoped through the tag's owner."""
+
+    # Both covered by the composite indexes below
+    client = models.ForeignKey(Client, on_delete=models.CASCADE, related_name="tag_links", db_index=False)
+    tag = models.ForeignKey(Tag, on_delete=models.CASCADE, related_name="client_links", db_index=False)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["client", "tag"], name="clients_clienttag_unique"),
+        ]
+        indexes = [
+            # Segment lookups: clients having a tag
+            models.Index(fields=["tag", "client"]),
+        ]
+
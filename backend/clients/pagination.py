@@ -0,0 +1,22 @@
+"""
+Opt-in page-number pagination for the customers list.
+
+Only applies when ?page= or ?page_size= is given; without either the list
+stays a plain array for existing clients. Sorted by an indexed column
+(see ClientViewSet.ORDERINGS), each page is an index range read.
+"""
+from __future__ import annotations
+
+from rest_framework.pagination import PageNumberPagination
+
+
+class ClientPagination(PageNumberPagination):
+    page_size = 50
+    max_page_size = 200
+    page_size_query_param = "page_size"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        params = request.query_params
+        if self.page_query_param not in params and self.page_size_query_param not in params:
+            return None
+        return super().paginate_queryset(queryset, request, view)
@@ -3,11 +3,10 @@ from __future__ import annotations
 from rest_framework import serializers
 
 from .models import Client
+from .tags import format_tags, parse_tags
 
 
 class ClientSerializer(serializers.ModelSerializer):
-    bookings_count = serializers.IntegerField(read_only=True)
-
     class Meta:
         model = Client
         fields = [
@@ -19,8 +18,14 @@ class ClientSerializer(serializers.ModelSerializer):
             "tags",
             "created_at",
             "bookings_count",
+            "last_booking_at",
+            "lifetime_value",
         ]
-        read_only_fields = ["id", "created_at"]
+        read_only_fields = ["id", "created_at", "bookings_count", "last_booking_at", "lifetime_value"]
+
+    def validate_tags(self, value: str) -> str:
+        # "vip,  VIP , Hair" -> "vip, Hair": the string matches the normalized tag links
+        return format_tags(parse_tags(value))
 
     def create(self, validated_data):
         request = self.context.get("request")
@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from accounts.cache_versions import ALERTS, BOOKINGS, CALLS, CLIENTS, bump_version
+
+from .models import Client
+from .tags import sync_client_tags
+
+
+@receiver(post_save, sender=Client)
+def _bump_client_version(sender, instance: Client, **kwargs) -> None:
+    # Bookings show the client's name
+    bump_version(instance.owner_id, CLIENTS, BOOKINGS)
+
+
+@receiver(post_save, sender=Client)
+def _sync_tag_links(sender, instance: Client, created: bool, **kwargs) -> None:
+    changed = instance.tags != getattr(instance, "_loaded_tags", None)
+    # A new client without tags has no links to sync
+    if changed and (instance.tags or not created):
+        sync_client_tags(instance)
+    instance._loaded_tags = instance.tags
+
+
+@receiver(post_delete, sender=Client)
+def _bump_deleted_client_version(sender, instance: Client, **kwargs) -> None:
+    # Its bookings are deleted; call summaries and alerts are unlinked (SET_NULL)
+    bump_version(instance.owner_id, CLIENTS, BOOKINGS, CALLS, ALERTS)
@@ -0,0 +1,84 @@
+"""
+Per-client booking aggregates: bookings_count, last_booking_at, lifetime_value.
+
+The columns are recomputed from the bookings table rather than adjusted in
+place, so moved bookings, edited prices and concurrent writes can't drift them:
+the refresh runs after the transaction commits and its UPDATE always starts
+after the last commit, so the last refresh for a client sees every booking.
+lifetime_value sums current service prices, like the dashboard revenue.
+
+Bookings written with bulk_create/update()/delete() send no signals; run
+`manage.py reconcile_client_stats` after those (the benchmark seeder does).
+"""
+from __future__ import annotations
+
+from decimal import Decimal
+from threading import local
+from typing import Iterable
+
+from django.db import transaction
+from django.db.models import Count, DecimalField, IntegerField, Max, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+
+from accounts.cache_versions import CLIENTS, bump_version
+from bookings.models import Booking
+
+from .models import Client
+
+_pending = local()
+
+
+def booking_stats_annotations(owner_id: int, prefix: str = "") -> dict:
+    """The three aggregates as correlated subqueries over the owner's bookings, keyed by field name."""
+    per_client = (
+        Booking.objects.filter(owner_id=owner_id, client=OuterRef("pk"))
+        .order_by()
+        .values("client")
+    )
+    return {
+        f"{prefix}bookings_count": Coalesce(
+            Subquery(per_client.annotate(n=Count("pk")).values("n")),
+            Value(0),
+            output_field=IntegerField(),
+        ),
+        f"{prefix}last_booking_at": Subquery(per_client.annotate(last=Max("starts_at")).values("last")),
+        f"{prefix}lifetime_value": Coalesce(
+            Subquery(per_client.annotate(total=Sum("service__price")).values("total")),
+            Value(Decimal("0")),
+            output_field=DecimalField(max_digits=12, decimal_places=2),
+        ),
+    }
+
+
+def refresh_booking_stats(owner_id: int, client_ids: Iterable[int] | None = None) -> int:
+    """Recompute the aggregates for some (default: all) of the owner's clients. Returns rows updated."""
+    clients = Client.objects.for_owner(owner_id)
+    if client_ids is not None:
+        clients = clients.filter(pk__in=list(client_ids))
+    updated = clients.update(**booking_stats_annotations(owner_id))
+    # The client list's cached pages and ETags depend on these columns
+    bump_version(owner_id, CLIENTS)
+    return updated
+
+
+def _flush() -> None:
+    pending = getattr(_pending, "clients", None) or {}
+    _pending.clients = {}
+    for owner_id, client_ids in pending.items():
+        refresh_booking_stats(owner_id, client_ids)
+
+
+def schedule_booking_stats_refresh(owner_id: int, client_ids: Iterable[int | None]) -> None:
+    """
+    Refresh these clients once the transaction commits. Clients collected during
+    one transaction (e.g. a cascade deleting many bookings) are refreshed together.
+    """
+    client_ids = {pk for pk in client_ids if pk is not None}
+    if owner_id is None or not client_ids:
+        return
+    pending = getattr(_pending, "clients", None)
+    if pending is None:
+        pending = _pending.clients = {}
+    pending.setdefault(owner_id, set()).update(client_ids)
+    # Only the first callback after a commit finds work; the rest are no-ops
+    transaction.on_commit(_flush)
@@ -0,0 +1,108 @@
+"""
+Normalized client tags.
+
+Client.tags stays the comma-separated string the API reads and writes; each
+tag in it is also a Tag row (one per owner and lowercased name) linked through
+ClientTag. Segment filters and per-tag counts use the links, which are exact
+(no substring matches) and indexed by tag:
+
+- any-of: clients with a link to one of the tag ids (a semi-join),
+- all-of: clients with links to all of them (grouped by client).
+
+Links are re-synced when a client's tags string changes (clients/signals.py).
+Clients written with bulk_create/update() skip that; rebuild_client_tags()
+(also run by `manage.py reconcile_client_stats`) redoes a whole tenant.
+"""
+from __future__ import annotations
+
+from typing import Iterable
+
+from django.db import transaction
+from django.db.models import Count, QuerySet
+
+from .models import Client, ClientTag, Tag
+
+MAX_TAG_LENGTH = 100
+BATCH_SIZE = 2000
+
+
+def parse_tags(value: str | None) -> list[str]:
+    """Split a comma-separated string into distinct tags (case-insensitive), keeping order."""
+    names: dict[str, str] = {}
+    for raw in (value or "").split(","):
+        name = " ".join(raw.split())[:MAX_TAG_LENGTH]
+        if name and name.lower() not in names:
+            names[name.lower()] = name
+    return list(names.values())
+
+
+def format_tags(names: Iterable[str]) -> str:
+    return ", ".join(names)
+
+
+def _tag_ids(owner_id: int, names: Iterable[str]) -> dict[str, int]:
+    """Ids of the owner's tags for these names (by lowercased key), creating missing ones."""
+    wanted = {name.lower(): name for name in names}
+    if not wanted:
+        return {}
+    existing = dict(Tag.objects.for_owner(owner_id).filter(key__in=wanted).values_list("key", "id"))
+    missing = [Tag(owner_id=owner_id, name=name, key=key) for key, name in wanted.items() if key not in existing]
+    if missing:
+        # A concurrent request may create the same tag; the unique constraint settles it
+        Tag.objects.bulk_create(missing, ignore_conflicts=True)
+        existing = dict(Tag.objects.for_owner(owner_id).filter(key__in=wanted).values_list("key", "id"))
+    return existing
+
+
+def sync_client_tags(client: Client) -> None:
+    """Make the client's tag links match its tags string."""
+    tag_ids = set(_tag_ids(client.owner_id, parse_tags(client.tags)).values())
+    with transaction.atomic():
+        ClientTag.objects.filter(client=client).exclude(tag_id__in=tag_ids).delete()
+        ClientTag.objects.bulk_create(
+            [ClientTag(client=client, tag_id=tag_id) for tag_id in tag_ids],
+            ignore_conflicts=True,
+        )
+
+
+def rebuild_client_tags(owner_id: int) -> int:
+    """Recreate every tag link of one owner from the clients' tags strings. Returns links created."""
+    rows = list(
+        Client.objects.for_owner(owner_id).exclude(tags="").values_list("id", "tags")
+    )
+    parsed = [(client_id, parse_tags(tags)) for client_id, tags in rows]
+    ids = _tag_ids(owner_id, [name for _, names in parsed for name in names])
+    links = [
+        ClientTag(client_id=client_id, tag_id=ids[name.lower()])
+        for client_id, names in parsed
+        for name in names
+    ]
+    with transaction.atomic():
+        ClientTag.objects.filter(tag__owner_id=owner_id).delete()
+        ClientTag.objects.bulk_create(links, batch_size=BATCH_SIZE)
+    return len(links)
+
+
+def filter_by_tags(queryset: QuerySet, owner_id: int, names: Iterable[str], match: str = "any") -> QuerySet:
+    """Clients (of queryset) having any or all of the named tags. Unknown tags match nothing."""
+    keys = {name.lower() for name in names}
+    if not keys:
+        return queryset
+    tag_ids = list(Tag.objects.for_owner(owner_id).filter(key__in=keys).values_list("id", flat=True))
+    if not tag_ids or (match == "all" and len(tag_ids) < len(keys)):
+        return queryset.none()
+    links = ClientTag.objects.filter(tag_id__in=tag_ids).values("client_id")
+    if match == "all":
+        links = links.annotate(n=Count("tag_id")).filter(n=len(tag_ids))
+    return queryset.filter(pk__in=links.values("client_id"))
+
+
+def tag_counts(owner_id: int) -> list[dict]:
+    """The owner's tags in use, with how many clients have each, most used first."""
+    return list(
+        Tag.objects.for_owner(owner_id)
+        .annotate(count=Count("client_links"))
+        .filter(count__gt=0)
+        .order_by("-count", "name")
+        .values("name", "count")
+    )
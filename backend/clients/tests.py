@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from bookings.models import Booking, Service
+from integrations.models import CallSummary
+from notifications.models import Alert
+
+from .dedupe import MAX_BLOCK_SIZE, find_duplicates, match_score, merge_clusters, _Candidate
+from .models import Client
+
+User = get_user_model()
+
+
+def _candidate(pk: int, name: str, phone: str = "", email: str = "") -> _Candidate:
+    return _Candidate(pk, name, email, phone, 0, timezone.now())
+
+
+class DedupeTests(TestCase):
+    """Duplicate detection never chains different people, and merging moves everything."""
+
+    def setUp(self) -> None:
+        self.owner = User.objects.create_user(email="owner@example.com", password="secret-pass-123")
+
+    def _client(self, name: str, phone: str = "", email: str = "") -> Client:
+        return Client.objects.create(owner=self.owner, name=name, phone_number=phone, email=email)
+
+    def test_match_score(self) -> None:
+        same_number = match_score(
+            _candidate(1, "Jane Doe", "+1 (555) 010-2030"), _candidate(2, "jane doe", "555-010-2030")
+        )
+        self.assertGreaterEqual(same_number, 0.8)
+        different_emails = match_score(
+            _candidate(1, "Jane Doe", "5550102030", "jane@example.com"),
+            _candidate(2, "Bob Stone", "5550102030", "bob@example.com"),
+        )
+        self.assertLess(different_emails, 0.8)
+
+    def test_placeholder_does_not_chain_different_people(self) -> None:
+        jane = self._client("Jane Doe", "+1 555 010 2030", "jane@example.com")
+        bob = self._client("Bob Stone", "555-010-2030", "bob@example.com")
+        self._client("Caller", "(555) 010 2030")
+
+        clusters, skipped = find_duplicates(self.owner.pk)
+
+        self.assertEqual(skipped, 0)
+        for cluster in clusters:
+            members = {cluster.survivor_id, *cluster.duplicate_ids}
+            self.assertFalse({jane.pk, bob.pk} <= members)
+
+    def test_oversized_block_is_skipped(self) -> None:
+        for i in range(MAX_BLOCK_SIZE + 1):
+            self._client(f"Caller {i}", "555 010 9999")
+
+        clusters, skipped = find_duplicates(self.owner.pk)
+
+        self.assertEqual(skipped, 1)
+        self.assertEqual(clusters, [])
+
+    def test_merge_repoints_rows_and_refreshes_stats(self) -> None:
+        service = Service.objects.create(owner=self.owner, name="Cut", price=Decimal("20.00"))
+        survivor = self._client("Jane Doe", "+1 555 010 2030")
+        duplicate = self._client("jane doe", "555-010-2030", "jane@example.com")
+        start = timezone.now() + timedelta(days=1)
+        with self.captureOnCommitCallbacks(execute=True):
+            kept = Booking.objects.create(
+                owner=self.owner, client=survivor, service=service, starts_at=start, ends_at=start + timedelta(hours=1)
+            )
+            moved = Booking.objects.create(
+                owner=self.owner,
+                client=duplicate,
+                service=service,
+                starts_at=start + timedelta(hours=2),
+                ends_at=start + timedelta(hours=3),
+            )
+        call = CallSummary.objects.create(owner=self.owner, related_client=duplicate, related_booking=moved)
+        alert = Alert.objects.create(
+            owner=self.owner, type="info", title="Booking", message="", related_client=duplicate
+        )
+
+        # One booking each: the tie goes to the older client
+        clusters, _ = find_duplicates(self.owner.pk)
+        self.assertEqual([(c.survivor_id, c.duplicate_ids) for c in clusters], [(survivor.pk, [duplicate.pk])])
+        with self.captureOnCommitCallbacks(execute=True):
+            result = merge_clusters(self.owner.pk, clusters)
+
+        self.assertEqual((result.clusters, result.clients_removed), (1, 1))
+        self.assertFalse(Client.objects.for_owner(self.owner).filter(pk=duplicate.pk).exists())
+        self.assertEqual(Booking.objects.for_owner(self.owner).get(pk=moved.pk).client_id, survivor.pk)
+        self.assertEqual(Booking.objects.for_owner(self.owner).get(pk=kept.pk).client_id, survivor.pk)
+        self.assertEqual(CallSummary.objects.for_owner(self.owner).get(pk=call.pk).related_client_id, survivor.pk)
+        self.assertEqual(Alert.objects.for_owner(self.owner).get(pk=alert.pk).related_client_id, survivor.pk)
+        survivor.refresh_from_db()
+        self.assertEqual(survivor.bookings_count, 2)
+        self.assertEqual(survivor.lifetime_value, Decimal("40.00"))
+        self.assertEqual(survivor.last_booking_at, moved.starts_at)
+        # Missing contact details are folded in
+        self.assertEqual(survivor.email, "jane@example.com")
+
+
+class BookingStatsTests(TestCase):
+    """The per-client aggregates follow bookings and service prices after commit."""
+
+    def setUp(self) -> None:
+        self.owner = User.objects.create_user(email="owner@example.com", password="secret-pass-123")
+        self.service = Service.objects.create(owner=self.owner, name="Cut", price=Decimal("20.00"))
+        self.jane = Client.objects.create(owner=self.owner, name="Jane Doe")
+        self.bob = Client.objects.create(owner=self.owner, name="Bob Stone")
+        self.start = timezone.now() + timedelta(days=1)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.booking = Booking.objects.create(
+                owner=self.owner,
+                client=self.jane,
+                service=self.service,
+                starts_at=self.start,
+                ends_at=self.start + timedelta(hours=1),
+            )
+
+    def _stats(self, client: Client) -> tuple:
+        client.refresh_from_db()
+        return client.bookings_count, client.last_booking_at, client.lifetime_value
+
+    def test_moving_a_booking_refreshes_both_clients(self) -> None:
+        self.assertEqual(self._stats(self.jane), (1, self.start, Decimal("20.00")))
+        with self.captureOnCommitCallbacks(execute=True):
+            self.booking.client = self.bob
+            self.booking.save()
+        self.assertEqual(self._stats(self.jane), (0, None, Decimal("0.00")))
+        self.assertEqual(self._stats(self.bob), (1, self.start, Decimal("20.00")))
+
+    def test_price_change_refreshes_lifetime_value(self) -> None:
+        with self.captureOnCommitCallbacks(execute=True):
+            self.service.price = Decimal("35.00")
+            self.service.save()
+        self.assertEqual(self._stats(self.jane), (1, self.start, Decimal("35.00")))
+
+
+class TagFilterTests(TestCase):
+    """?tags= matches any of the tags by default, or all of them with ?tags_match=all."""
+
+    def setUp(self) -> None:
+        self.owner = User.objects.create_user(email="owner@example.com", password="secret-pass-123")
+        self.both = Client.objects.create(owner=self.owner, name="Both", tags="VIP, Hair")
+        self.vip = Client.objects.create(owner=self.owner, name="VIP only", tags="vip")
+        Client.objects.create(owner=self.owner, name="Laser", tags="Laser, VIP-list")
+        self.api = APIClient()
+        self.api.force_authenticate(self.owner)
+
+    def _names(self, query: str) -> set[str]:
+        response = self.api.get(f"/api/v1/clients/?{query}")
+        self.assertEqual(response.status_code, 200)
+        return {client["name"] for client in response.json()}
+
+    def test_any_of(self) -> None:
+        # Exact, case-insensitive tag matches: "VIP-list" is not "vip"
+        self.assertEqual(self._names("tags=vip,hair"), {"Both", "VIP only"})
+        self.assertEqual(self._names("tags=hair&tags_match=any"), {"Both"})
+
+    def test_all_of(self) -> None:
+        self.assertEqual(self._names("tags=VIP,Hair&tags_match=all"), {"Both"})
+        self.assertEqual(self._names("tags=vip,laser&tags_match=all"), set())
+
+    def test_unknown_match_mode_is_rejected(self) -> None:
+        response = self.api.get("/api/v1/clients/?tags=vip&tags_match=some")
+        self.assertEqual(response.status_code, 400)
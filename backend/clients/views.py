@@ -1,24 +1,70 @@
 from __future__ import annotations
 
-from django.db.models import Count
+from django.db.models import F
 from rest_framework import permissions, viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+from accounts.cache_versions import BOOKINGS, CLIENTS, cached, versioned_key
+from accounts.conditional import conditional_for_owner
 
 from .models import Client
+from .pagination import ClientPagination
 from .serializers import ClientSerializer
+from .tags import filter_by_tags, parse_tags, tag_counts
 
 
 class ClientViewSet(viewsets.ModelViewSet):
     """
     CRUD endpoints for business clients/customers.
+
+    ?ordering= sorts by one of ORDERINGS (prefix "-" for descending); each has
+    an owner-leading index. ?page=/?page_size= paginate (see ClientPagination).
+    ?tags=VIP,Hair keeps clients with any of the tags, or all of them with
+    ?tags_match=all. GET tags/ lists the owner's tags with client counts.
     """
 
     serializer_class = ClientSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = ClientPagination
+
+    ORDERINGS = ("created_at", "name", "bookings_count", "last_booking_at", "lifetime_value")
+
+    def _ordering(self) -> list:
+        value = (self.request.query_params.get("ordering") or "-created_at").strip()
+        field = value.lstrip("-")
+        if field not in self.ORDERINGS:
+            raise ValidationError({"ordering": f"Use one of: {', '.join(self.ORDERINGS)} (optionally prefixed with -)."})
+        descending = value.startswith("-")
+        column = f"-{field}" if descending else field
+        if field == "last_booking_at":
+            # Matches the index: never-booked clients come last when sorting by most recent
+            column = F(field).desc(nulls_last=True) if descending else F(field).asc(nulls_first=True)
+        # id keeps pages stable on ties
+        return [column, "-id" if descending else "id"]
 
     def get_queryset(self):
-        queryset = Client.objects.filter(owner=self.request.user).order_by('-created_at')
-        # Annotate with bookings count
-        queryset = queryset.annotate(
-            bookings_count=Count('bookings')
-        )
-        return queryset
+        queryset = Client.objects.for_owner(self.request.user)
+        if self.action != "list":
+            return queryset.order_by("-created_at")
+        params = self.request.query_params
+        tags = parse_tags(params.get("tags"))
+        if tags:
+            match = params.get("tags_match") or "any"
+            if match not in ("any", "all"):
+                raise ValidationError({"tags_match": "Use any or all."})
+            queryset = filter_by_tags(queryset, self.request.user.id, tags, match)
+        return queryset.order_by(*self._ordering())
+
+    # bookings_count and friends change with bookings, not just clients
+    @conditional_for_owner("clients", [CLIENTS, BOOKINGS])
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
+    @action(detail=False, methods=["get"])
+    @conditional_for_owner("clients:tags", [CLIENTS])
+    def tags(self, request):
+        """Tags in use with their client counts: [{"name": "VIP", "count": 12}, ...]."""
+        key = versioned_key(request.user.id, "clients:tags", [CLIENTS])
+        return Response(cached(key, lambda: tag_counts(request.user.id)))
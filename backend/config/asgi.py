@@ -3,6 +3,11 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+# Served over ASGI: idle SSE alert streams can live on the event loop instead of a thread.
+os.environ.setdefault("ALERTS_STREAM_ASYNC", "true")
+# Requests hop between threads under ASGI, so per-thread persistent connections would
+# accumulate; close them after each request unless a pooler (PgBouncer) is configured.
+os.environ.setdefault("DB_CONN_MAX_AGE", "0")
 
 application = get_asgi_application()
 
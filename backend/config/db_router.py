@@ -0,0 +1,167 @@
+"""
+Optional read replica (DB_REPLICA_HOST) with read-your-writes stickiness.
+
+Without a "replica" alias in DATABASES everything stays on "default". With one:
+
+- ReplicaRoutingMiddleware allows replica reads for GET/HEAD/OPTIONS requests,
+  unless the view is marked with @primary_db (e.g. the in-call Vapi helpers).
+  Writes, webhooks and every other method stay on the primary, as do
+  management commands and anything outside a request.
+- Code can opt in or out explicitly with `with replica_reads():` /
+  `with primary_reads():`.
+- A user who just wrote, or whose data was just changed (cache_versions bumps
+  call mark_primary_sticky), reads from the primary for
+  DB_REPLICA_STICKY_SECONDS, longer than the replica's expected lag. This also
+  keeps versioned caches from being refilled with pre-write replica data. The
+  flag lives in the cache, so settings refuse a replica without a shared one.
+- Users are always read from the primary, so deactivation and password
+  changes are never undone by a lagging replica through the auth cache.
+- Inside a transaction on the primary, reads stay on the primary.
+"""
+from __future__ import annotations
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+
+PRIMARY = "default"
+REPLICA = "replica"
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+# True while replica reads are allowed; the current HttpRequest for stickiness checks
+_replica_allowed: ContextVar[bool] = ContextVar("replica_allowed", default=False)
+_current_request: ContextVar = ContextVar("replica_request", default=None)
+
+
+def replica_configured() -> bool:
+    return REPLICA in settings.DATABASES
+
+
+def _sticky_key(user_id) -> str:
+    return f"db:sticky:{user_id}"
+
+
+def mark_primary_sticky(user_id) -> None:
+    """Read this user's data from the primary until the replica has caught up."""
+    if user_id is not None and replica_configured():
+        cache.set(_sticky_key(user_id), True, settings.DB_REPLICA_STICKY_SECONDS)
+
+
+def _request_is_sticky(request) -> bool:
+    # request.user is set on the HttpRequest once DRF has authenticated
+    sticky = getattr(request, "_replica_sticky", None)
+    if sticky is None:
+        user = getattr(request, "user", None)
+        if user is None or not user.is_authenticated:
+            return False
+        sticky = request._replica_sticky = bool(cache.get(_sticky_key(user.pk)))
+    return sticky
+
+
+@contextmanager
+def replica_reads():
+    token = _replica_allowed.set(True)
+    try:
+        yield
+    finally:
+        _replica_allowed.reset(token)
+
+
+@contextmanager
+def primary_reads():
+    token = _replica_allowed.set(False)
+    try:
+        yield
+    finally:
+        _replica_allowed.reset(token)
+
+
+def primary_db(view):
+    """Mark a view so its reads always go to the primary."""
+    view.use_primary_db = True
+    return view
+
+
+class PrimaryReplicaRouter:
+    def db_for_read(self, model, **hints):
+        if not replica_configured() or not _replica_allowed.get():
+            return PRIMARY
+        if model._meta.label == settings.AUTH_USER_MODEL:
+            return PRIMARY
+        if connections[PRIMARY].in_atomic_block:
+            return PRIMARY
+        request = _current_request.get()
+        if request is not None and _request_is_sticky(request):
+            return PRIMARY
+        return REPLICA
+
+    def db_for_write(self, model, **hints):
+        return PRIMARY
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Same data on both aliases
+        return {obj1._state.db, obj2._state.db} <= {PRIMARY, REPLICA, None}
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == PRIMARY
+
+
+class ReplicaRoutingMiddleware:
+    """Allows replica reads for safe requests and makes writers sticky to the primary."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response) -> None:
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def _enter(self, request):
+        return (
+            _replica_allowed.set(request.method in SAFE_METHODS and replica_configured()),
+            _current_request.set(request),
+        )
+
+    @staticmethod
+    def _exit(tokens) -> None:
+        _replica_allowed.reset(tokens[0])
+        _current_request.reset(tokens[1])
+
+    @staticmethod
+    def _mark_writer(request, response) -> None:
+        if request.method in SAFE_METHODS or response.status_code >= 400:
+            return
+        user = getattr(request, "user", None)
+        if user is not None and user.is_authenticated:
+            mark_primary_sticky(user.pk)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        tokens = self._enter(request)
+        try:
+            response = self.get_response(request)
+        finally:
+            self._exit(tokens)
+        self._mark_writer(request, response)
+        return response
+
+    async def __acall__(self, request):
+        tokens = self._enter(request)
+        try:
+            response = await self.get_response(request)
+        finally:
+            self._exit(tokens)
+        self._mark_writer(request, response)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if getattr(view_func, "use_primary_db", False):
+            _replica_allowed.set(False)
+        return None
@@ -0,0 +1,357 @@
+"""
+Per-endpoint request metrics in Prometheus text format.
+
+MetricsMiddleware records, per resolved URL name and HTTP method:
+- request latency (histogram) and response counts by status class,
+- DB queries per request (histogram) and total query time, collected with
+  connection.execute_wrapper on every configured database,
+- response bytes (not counted for streaming responses such as SSE).
+
+Everything is aggregated in-process. With gunicorn's several workers, set
+METRICS_MULTIPROC_DIR to a directory shared by the workers (cleared at deploy
+start, like prometheus_client's multiprocess mode): each worker periodically
+writes its totals to its own file there, and /metrics sums all files, so any
+worker can answer the scrape with numbers for the whole server.
+"""
+from __future__ import annotations
+
+import copy
+import hmac
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from bisect import bisect_left
+from contextlib import ExitStack
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connections
+from django.http import HttpResponse
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+
+# Seconds between a worker's snapshot writes in multiprocess mode
+FLUSH_INTERVAL = 5.0
+
+_NAMESPACE = "elara"
+
+
+def _new_series() -> dict:
+    return {
+        "requests": {},
+        "latency_buckets": [0] * len(LATENCY_BUCKETS),
+        "latency_sum": 0.0,
+        "latency_count": 0,
+        "query_buckets": [0] * len(QUERY_COUNT_BUCKETS),
+        "query_total": 0,
+        "query_requests": 0,
+        "query_seconds": 0.0,
+        "response_bytes": 0,
+    }
+
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._series: dict[tuple[str, str], dict] = {}
+        self._file: str | None = None
+        self._pid: int | None = None
+        self._last_flush = 0.0
+
+    def observe(
+        self,
+        view: str,
+        method: str,
+        status: int,
+        seconds: float,
+        queries: int,
+        query_seconds: float,
+        response_bytes: int | None,
+    ) -> None:
+        status_class = f"{status // 100}xx"
+        with self._lock:
+            series = self._series.get((view, method))
+            if series is None:
+                series = self._series[(view, method)] = _new_series()
+            series["requests"][status_class] = series["requests"].get(status_class, 0) + 1
+            index = bisect_left(LATENCY_BUCKETS, seconds)
+            if index < len(LATENCY_BUCKETS):
+                series["latency_buckets"][index] += 1
+            series["latency_sum"] += seconds
+            series["latency_count"] += 1
+            index = bisect_left(QUERY_COUNT_BUCKETS, queries)
+            if index < len(QUERY_COUNT_BUCKETS):
+                series["query_buckets"][index] += 1
+            series["query_total"] += queries
+            series["query_requests"] += 1
+            series["query_seconds"] += query_seconds
+            if response_bytes is not None:
+                series["response_bytes"] += response_bytes
+        self.maybe_flush()
+
+    def snapshot(self) -> dict[str, dict]:
+        """Copy of this process's series, keyed "view|method"."""
+        with self._lock:
+            return {"|".join(key): copy.deepcopy(series) for key, series in self._series.items()}
+
+    # Multiprocess support
+
+    def _directory(self) -> str:
+        return getattr(settings, "METRICS_MULTIPROC_DIR", "") or ""
+
+    def _own_file(self, directory: str) -> str:
+        # A fresh name per process (and after fork), so a reused pid never overwrites
+        # a dead worker's totals and counters stay monotonic across restarts.
+        if self._file is None or self._pid != os.getpid():
+            self._pid = os.getpid()
+            self._file = os.path.join(directory, f"metrics-{self._pid}-{uuid.uuid4().hex[:8]}.json")
+        return self._file
+
+    def maybe_flush(self, force: bool = False) -> None:
+        directory = self._directory()
+        if not directory:
+            return
+        now = time.monotonic()
+        if not force and now - self._last_flush < FLUSH_INTERVAL:
+            return
+        # Another thread is already writing this process's file
+        if not self._flush_lock.acquire(blocking=force):
+            return
+        try:
+            self._last_flush = now
+            path = self._own_file(directory)
+            tmp = f"{path}.tmp"
+            with open(tmp, "w") as f:
+                json.dump(self.snapshot(), f)
+            os.replace(tmp, path)
+        except OSError:
+            logger.exception("Could not write metrics snapshot to %s", directory)
+        finally:
+            self._flush_lock.release()
+
+    def collect(self) -> dict[str, dict]:
+        """Totals for this process, or for every worker in multiprocess mode."""
+        directory = self._directory()
+        if not directory:
+            return self.snapshot()
+        self.maybe_flush(force=True)
+        merged: dict[str, dict] = {}
+        for name in os.listdir(directory):
+            if not (name.startswith("metrics-") and name.endswith(".json")):
+                continue
+            try:
+                with open(os.path.join(directory, name)) as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                continue
+            for key, series in data.items():
+                _merge(merged.setdefault(key, _new_series()), series)
+        return merged
+
+
+def _merge(into: dict, series: dict) -> None:
+    for status_class, count in series["requests"].items():
+        into["requests"][status_class] = into["requests"].get(status_class, 0) + count
+    for name in ("latency_buckets", "query_buckets"):
+        into[name] = [a + b for a, b in zip(into[name], series[name])]
+    for name in (
+        "latency_sum",
+        "latency_count",
+        "query_total",
+        "query_requests",
+        "query_seconds",
+        "response_bytes",
+    ):
+        into[name] += series[name]
+
+
+registry = MetricsRegistry()
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _histogram_lines(name: str, labels: str, buckets, counts, total, count) -> list[str]:
+    lines = []
+    cumulative = 0
+    for bound, n in zip(buckets, counts):
+        cumulative += n
+        lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+    lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {count}')
+    lines.append(f"{name}_sum{{{labels}}} {total}")
+    lines.append(f"{name}_count{{{labels}}} {count}")
+    return lines
+
+
+def render_metrics(data: dict[str, dict]) -> str:
+    requests_name = f"{_NAMESPACE}_http_requests_total"
+    latency_name = f"{_NAMESPACE}_http_request_duration_seconds"
+    queries_name = f"{_NAMESPACE}_db_queries_per_request"
+    query_time_name = f"{_NAMESPACE}_db_query_duration_seconds_total"
+    size_name = f"{_NAMESPACE}_http_response_size_bytes_total"
+    sections: dict[str, list[str]] = {
+        requests_name: [
+            f"# HELP {requests_name} Requests by URL name, method and status class.",
+            f"# TYPE {requests_name} counter",
+        ],
+        latency_name: [
+            f"# HELP {latency_name} Time until the response object was ready.",
+            f"# TYPE {latency_name} histogram",
+        ],
+        queries_name: [
+            f"# HELP {queries_name} Database queries executed per request.",
+            f"# TYPE {queries_name} histogram",
+        ],
+        query_time_name: [
+            f"# HELP {query_time_name} Time spent in database queries.",
+            f"# TYPE {query_time_name} counter",
+        ],
+        size_name: [
+            f"# HELP {size_name} Response body bytes (streaming responses excluded).",
+            f"# TYPE {size_name} counter",
+        ],
+    }
+    for key in sorted(data):
+        view, method = key.split("|", 1)
+        series = data[key]
+        labels = f'view="{_escape(view)}",method="{_escape(method)}"'
+        for status_class, count in sorted(series["requests"].items()):
+            sections[requests_name].append(
+                f'{requests_name}{{{labels},status="{status_class}"}} {count}'
+            )
+        sections[latency_name] += _histogram_lines(
+            latency_name,
+            labels,
+            LATENCY_BUCKETS,
+            series["latency_buckets"],
+            series["latency_sum"],
+            series["latency_count"],
+        )
+        sections[queries_name] += _histogram_lines(
+            queries_name,
+            labels,
+            QUERY_COUNT_BUCKETS,
+            series["query_buckets"],
+            series["query_total"],
+            series["query_requests"],
+        )
+        sections[query_time_name].append(f"{query_time_name}{{{labels}}} {series['query_seconds']}")
+        sections[size_name].append(f"{size_name}{{{labels}}} {series['response_bytes']}")
+    return "\n".join(line for lines in sections.values() for line in lines) + "\n"
+
+
+class _QueryTimer:
+    """execute_wrapper that counts queries and their time for one request."""
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.seconds = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.seconds += time.perf_counter() - start
+            self.count += 1
+
+
+def _wrap_connections(stack: ExitStack, timer: _QueryTimer) -> None:
+    """Route this thread's queries on every database through timer until stack closes."""
+    for connection in connections.all():
+        stack.enter_context(connection.execute_wrapper(timer))
+
+
+def _view_name(request) -> str:
+    match = getattr(request, "resolver_match", None)
+    if match is None:
+        return "<unresolved>"
+    return match.view_name or match.route or "<unnamed>"
+
+
+def _response_size(response) -> int | None:
+    if getattr(response, "streaming", False):
+        return None
+    return len(response.content)
+
+
+class MetricsMiddleware:
+    """
+    Records latency, query count/time and response size per URL name and method.
+    Connections are per thread: under ASGI, sync views and the async ORM run their
+    queries in the request's thread-sensitive worker thread, so the wrapper is
+    installed (and removed) there.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response) -> None:
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        timer = _QueryTimer()
+        start = time.perf_counter()
+        with ExitStack() as stack:
+            _wrap_connections(stack, timer)
+            response = self.get_response(request)
+        registry.observe(
+            _view_name(request),
+            request.method,
+            response.status_code,
+            time.perf_counter() - start,
+            timer.count,
+            timer.seconds,
+            _response_size(response),
+        )
+        return response
+
+    async def __acall__(self, request):
+        timer = _QueryTimer()
+        start = time.perf_counter()
+        stack = ExitStack()
+        await sync_to_async(_wrap_connections)(stack, timer)
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(stack.close)()
+        registry.observe(
+            _view_name(request),
+            request.method,
+            response.status_code,
+            time.perf_counter() - start,
+            timer.count,
+            timer.seconds,
+            _response_size(response),
+        )
+        return response
+
+
+def metrics_view(request) -> HttpResponse:
+    """
+    Prometheus scrape endpoint. Requires `Authorization: Bearer <METRICS_TOKEN>`;
+    without a token it only answers in DEBUG (404 otherwise, like any unknown URL).
+    """
+    token = getattr(settings, "METRICS_TOKEN", "")
+    if not token:
+        if not settings.DEBUG:
+            return HttpResponse(status=404)
+    elif not hmac.compare_digest(request.headers.get("Authorization", ""), f"Bearer {token}"):
+        return HttpResponse(status=401)
+    return HttpResponse(
+        render_metrics(registry.collect()),
+        content_type="text/plain; version=0.0.4; charset=utf-8",
+    )
@@ -38,9 +38,14 @@ INSTALLED_APPS = [
     "integrations",
     "notifications",
     "support",
+    "benchmarks",
+    "dashboard",
 ]
 
 MIDDLEWARE = [
+    # First, so latency covers the whole middleware stack
+    "config.metrics.MetricsMiddleware",
+    "config.db_router.ReplicaRoutingMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
     "corsheaders.middleware.CorsMiddleware",
@@ -73,6 +78,15 @@ TEMPLATES = [
 WSGI_APPLICATION = "config.wsgi.application"
 ASGI_APPLICATION = "config.asgi.application"
 
+# Connection reuse. Django 5.0 on psycopg2 has no built-in pool, so connections are
+# either kept per worker thread (DB_CONN_MAX_AGE seconds; -1 = forever, 0 = close after
+# each request) or pooled externally by PgBouncer (DB_PGBOUNCER=true, transaction mode).
+# config.asgi defaults DB_CONN_MAX_AGE to 0: under ASGI each request may run in a
+# different thread, so persistent connections pile up; use PgBouncer there instead.
+# SSE streams release their connection after the initial replay (see notifications/views.py).
+DB_CONN_MAX_AGE = env.int("DB_CONN_MAX_AGE", default=60)
+DB_PGBOUNCER = env.bool("DB_PGBOUNCER", default=False)
+
 DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.postgresql",
@@ -81,9 +95,83 @@ DATABASES = {
         "PASSWORD": env("DB_PASSWORD", default="elara"),
         "HOST": env("DB_HOST", default="localhost"),
         "PORT": env("DB_PORT", default="5432"),
+        "CONN_MAX_AGE": None if DB_CONN_MAX_AGE < 0 else DB_CONN_MAX_AGE,
+        # Ping reused connections once per request so a restarted server or bouncer
+        # costs a reconnect instead of a failed request.
+        "CONN_HEALTH_CHECKS": env.bool("DB_CONN_HEALTH_CHECKS", default=True),
+        # Transaction pooling can't keep named cursors (QuerySet.iterator()) across statements
+        "DISABLE_SERVER_SIDE_CURSORS": DB_PGBOUNCER,
+        "OPTIONS": {
+            "connect_timeout": env.int("DB_CONNECT_TIMEOUT", default=5),
+        },
     }
 }
 
+# Optional read replica (config/db_router.py): safe API requests read from it, writes,
+# webhooks and the Vapi helpers use the primary. After a write the user's reads stay on
+# the primary for DB_REPLICA_STICKY_SECONDS (keep it above the replica's usual lag).
+DB_REPLICA_HOST = env("DB_REPLICA_HOST", default="")
+if DB_REPLICA_HOST:
+    DATABASES["replica"] = {
+        **DATABASES["default"],
+        "HOST": DB_REPLICA_HOST,
+        "PORT": env("DB_REPLICA_PORT", default=DATABASES["default"]["PORT"]),
+        "NAME": env("DB_REPLICA_NAME", default=DATABASES["default"]["NAME"]),
+        "USER": env("DB_REPLICA_USER", default=DATABASES["default"]["USER"]),
+        "PASSWORD": env("DB_REPLICA_PASSWORD", default=DATABASES["default"]["PASSWORD"]),
+        "OPTIONS": dict(DATABASES["default"]["OPTIONS"]),
+        "TEST": {"MIRROR": "default"},
+    }
+DATABASE_ROUTERS = ["config.db_router.PrimaryReplicaRouter"]
+DB_REPLICA_STICKY_SECONDS = env.int("DB_REPLICA_STICKY_SECONDS", default=10)
+
+# Cache shared by auth, unread counters and per-owner versioned results (accounts/cache_versions.py).
+# CACHE_BACKEND: "locmem" (per process, dev), "file" (CACHE_LOCATION directory, one host),
+# "db" (table CACHE_LOCATION, run `manage.py createcachetable` once) or "redis" (REDIS_URL,
+# needs the `redis` package). Only redis and db are shared between hosts.
+CACHE_BACKEND = env("CACHE_BACKEND", default="locmem")
+_CACHE_BACKENDS = {
+    "locmem": ("django.core.cache.backends.locmem.LocMemCache", "elara"),
+    "file": ("django.core.cache.backends.filebased.FileBasedCache", str(BASE_DIR / ".cache")),
+    "db": ("django.core.cache.backends.db.DatabaseCache", "elara_cache"),
+    "redis": ("django.core.cache.backends.redis.RedisCache", "redis://localhost:6379/1"),
+}
+if CACHE_BACKEND not in _CACHE_BACKENDS:
+    raise ValueError(f"CACHE_BACKEND must be one of {', '.join(_CACHE_BACKENDS)}, got {CACHE_BACKEND!r}")
+_cache_class, _cache_location = _CACHE_BACKENDS[CACHE_BACKEND]
+if CACHE_BACKEND == "redis":
+    _cache_location = env("REDIS_URL", default=_cache_location)
+else:
+    _cache_location = env("CACHE_LOCATION", default=_cache_location)
+
+# Whether every process serving requests sees the same cache. With locmem an invalidation
+# only reaches the worker that made it, so caches other workers would serve stale are off
+# unless this is set (e.g. CACHE_SHARED=true for a single-process server).
+CACHE_SHARED = env.bool("CACHE_SHARED", default=CACHE_BACKEND != "locmem")
+
+# ETag/304 answers are only as fresh as the version counters behind them; without a shared
+# cache the other workers would keep answering 304 to stale ETags.
+CONDITIONAL_GET = env.bool("CONDITIONAL_GET", default=CACHE_SHARED)
+
+# Replica stickiness is a cache flag; if the next request lands on a worker that can't see
+# it, that worker reads pre-write data from the replica (and may cache it).
+if DB_REPLICA_HOST and not CACHE_SHARED:
+    raise ValueError("DB_REPLICA_HOST needs a shared cache: set CACHE_BACKEND (redis or db) or CACHE_SHARED")
+
+CACHES = {
+    "default": {
+        "BACKEND": _cache_class,
+        "LOCATION": _cache_location,
+        "KEY_PREFIX": env("CACHE_KEY_PREFIX", default="elara"),
+        "TIMEOUT": env.int("CACHE_DEFAULT_TIMEOUT", default=300),
+        "OPTIONS": {"MAX_ENTRIES": env.int("CACHE_MAX_ENTRIES", default=10000)}
+        if CACHE_BACKEND in ("locmem", "file", "db")
+        else {},
+    }
+}
+# Upper bound for results cached under per-owner version keys; writes invalidate them earlier.
+CACHE_RESULT_SECONDS = env.int("CACHE_RESULT_SECONDS", default=300)
+
 AUTH_USER_MODEL = "accounts.User"
 
 AUTH_PASSWORD_VALIDATORS = [
@@ -116,13 +204,35 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "accounts.authentication.CachedJWTAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": (
         "rest_framework.permissions.IsAuthenticated",
     ),
 }
 
+# Seconds an authenticated user is cached per (user, token); 0 disables. Saving a
+# user invalidates their entries (see accounts/authentication.py), which only reaches
+# other workers through a shared cache, so it is off by default without one.
+AUTH_USER_CACHE_SECONDS = env.int("AUTH_USER_CACHE_SECONDS", default=60 if CACHE_SHARED else 0)
+
+# Prometheus metrics at /metrics (config/metrics.py). With several gunicorn workers,
+# point METRICS_MULTIPROC_DIR at a directory shared by them and emptied on deploy.
+METRICS_MULTIPROC_DIR = env("METRICS_MULTIPROC_DIR", default="")
+# Scrapes must send "Authorization: Bearer <METRICS_TOKEN>". Required in production: while
+# unset, /metrics returns 404 unless DEBUG is on.
+METRICS_TOKEN = env("METRICS_TOKEN", default="")
+
+# Threads used by /api/v1/dashboard/ to compute uncached sections concurrently (1 = in
+# the request thread). Each thread opens its own database connection while it runs.
+DASHBOARD_WORKERS = env.int("DASHBOARD_WORKERS", default=1)
+
+# Flag queries on owner-scoped models that lack an owner filter (accounts/tenancy.py):
+# "" (off), "warn" or "raise". Meant for development; `manage.py test` runs with "raise"
+# unless this is set (config/test_runner.py).
+TENANT_QUERY_GUARD = env("TENANT_QUERY_GUARD", default="")
+TEST_RUNNER = "config.test_runner.TenantGuardRunner"
+
 # CORS – allow frontend (Next.js) to talk to this API in development.
 CORS_ALLOW_ALL_ORIGINS = env.bool("CORS_ALLOW_ALL_ORIGINS", default=True)
 
@@ -138,6 +248,25 @@ if not DEBUG:
 # If unset, the first active user is used (single-tenant).
 VAPI_DEFAULT_OWNER_EMAIL = env("VAPI_DEFAULT_OWNER_EMAIL", default="")
 
+# Live alerts (SSE): serve /api/v1/alerts/stream/ from the async view. Only valid under
+# ASGI (config.asgi enables it by default); under WSGI the blocking stream is used.
+ALERTS_STREAM_ASYNC = env.bool("ALERTS_STREAM_ASYNC", default=False)
+# How alerts reach SSE clients connected to other processes/hosts. PostgresBroker uses
+# LISTEN/NOTIFY on the default database; InMemoryBroker is process-local (tests, dev).
+# LISTEN does not work through PgBouncer in transaction mode; with DB_PGBOUNCER, point the
+# broker's listener connection straight at PostgreSQL (NOTIFY itself can go via the bouncer).
+ALERTS_BROKER_DB_HOST = env("ALERTS_BROKER_DB_HOST", default="")
+ALERTS_BROKER_DB_PORT = env("ALERTS_BROKER_DB_PORT", default="")
+ALERTS_BROKER_BACKEND = env(
+    "ALERTS_BROKER_BACKEND",
+    default="notifications.broker.PostgresBroker",
+)
+
+# Outbound alert webhooks (sms_webhook_url) are sent by `manage.py dispatch_notifications`.
+# Batch size > 1 POSTs {"alerts": [...]} envelopes instead of one alert per request.
+NOTIFICATION_DISPATCH_WORKERS = env.int("NOTIFICATION_DISPATCH_WORKERS", default=8)
+ALERT_WEBHOOK_BATCH_SIZE = env.int("ALERT_WEBHOOK_BATCH_SIZE", default=1)
+
 
 # Email (e.g. Gmail) for sending "your account is ready" and other transactional emails.
 # See backend/docs/GMAIL_EMAIL_SETUP.md for Gmail App Password setup.
@@ -150,6 +279,8 @@ EMAIL_PORT = env.int("EMAIL_PORT", default=587)
 EMAIL_USE_TLS = env.bool("EMAIL_USE_TLS", default=True)
 EMAIL_HOST_USER = env("EMAIL_HOST_USER", default="")
 EMAIL_HOST_PASSWORD = env("EMAIL_HOST_PASSWORD", default="")
+# Seconds per SMTP operation; bounds how long the outbox worker can hang on one email
+EMAIL_TIMEOUT = env.int("EMAIL_TIMEOUT", default=10)
 DEFAULT_FROM_EMAIL = env("DEFAULT_FROM_EMAIL", default=EMAIL_HOST_USER or "noreply@example.com")
 
 
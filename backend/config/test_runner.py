@@ -0,0 +1,13 @@
+"""Test runner that runs the suite with the tenant query guard on (accounts/tenancy.py)."""
+from __future__ import annotations
+
+from django.conf import settings
+from django.test.runner import DiscoverRunner
+
+
+class TenantGuardRunner(DiscoverRunner):
+    """DiscoverRunner with TENANT_QUERY_GUARD="raise" unless the environment already sets a mode."""
+
+    def setup_test_environment(self, **kwargs) -> None:
+        super().setup_test_environment(**kwargs)
+        settings.TENANT_QUERY_GUARD = settings.TENANT_QUERY_GUARD or "raise"
@@ -1,10 +1,14 @@
 from django.contrib import admin
 from django.urls import include, path
 
+from .metrics import metrics_view
+
 urlpatterns = [
     path("admin/", admin.site.urls),
+    path("metrics", metrics_view, name="metrics"),
     path("api/v1/accounts/", include("accounts.urls")),
     path("api/v1/bookings/", include("bookings.urls")),
+    path("api/v1/dashboard/", include("dashboard.urls")),
     path("api/v1/clients/", include("clients.urls")),
     path("api/v1/alerts/", include("notifications.urls")),
     path("api/v1/support/", include("support.urls")),
@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+from datetime import datetime
+
+from django.conf import settings
+from django.db import connections
+from django.utils import timezone
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from accounts.cache_versions import ALERTS, BOOKINGS, CALLS, SERVICES, cached, versioned_key
+from accounts.conditional import conditional_for_owner
+from bookings.analytics import (
+    REVENUE_RANGES,
+    booking_heatmap,
+    booking_revenue,
+    booking_stats,
+    current_week_start,
+)
+from bookings.slots import resolve_timezone
+from integrations.models import CallSummary
+from integrations.serializers import RecentCallSerializer
+from notifications.counters import get_unread_count
+
+logger = logging.getLogger(__name__)
+
+SECTIONS = ("stats", "revenue", "heatmap", "unread_count", "recent_calls")
+RECENT_CALLS_DEFAULT = 5
+RECENT_CALLS_MAX = 20
+
+
+def _dashboard_vary(request) -> tuple:
+    # Same inputs as the stats/revenue/heatmap endpoints' ETags
+    return (timezone.now().strftime("%Y-%m-%dT%H:%M"), getattr(request.user, "timezone", None))
+
+
+def _recent_calls(owner_id: int, limit: int) -> list[dict]:
+    calls = CallSummary.objects.for_owner(owner_id).order_by("-created_at")[:limit]
+    return list(RecentCallSerializer(calls, many=True).data)
+
+
+def _outcome(compute) -> tuple:
+    try:
+        return compute(), None
+    except Exception as exc:
+        return None, exc
+
+
+def _in_own_connection(compute):
+    # Worker threads get their own DB connections; close them rather than leak some per thread
+    def run():
+        try:
+            return compute()
+        finally:
+            connections.close_all()
+
+    return run
+
+
+class DashboardView(APIView):
+    """
+    Everything the dashboard home page shows, in one request:
+    stats, revenue (?range=day|week|month), heatmap (?week_start=, ?tz=),
+    unread alert count and the latest call summaries (?calls=N).
+    ?sections=stats,heatmap limits the response to some sections.
+
+    All sections use the same clock, timezone and week. With a shared cache
+    each one is cached under the owner's data versions, so it is only
+    recomputed after a relevant write (or, for clock-dependent sections, once
+    a minute). With DASHBOARD_WORKERS > 1 uncached sections are computed
+    concurrently.
+    """
+
+    @conditional_for_owner("dashboard", [BOOKINGS, SERVICES, CALLS, ALERTS], vary=_dashboard_vary)
+    def get(self, request: Request) -> Response:
+        owner_id = request.user.id
+        params = request.query_params
+        now = timezone.now()
+        minute = now.strftime("%Y-%m-%dT%H:%M")
+
+        requested = [s.strip() for s in (params.get("sections") or "").split(",") if s.strip()]
+        unknown = sorted(set(requested) - set(SECTIONS))
+        if unknown:
+            return Response({"error": f"Unknown section(s): {', '.join(unknown)}"}, status=400)
+        sections = requested or list(SECTIONS)
+
+        range_type = params.get("range", "day")
+        if range_type not in REVENUE_RANGES:
+            return Response({"error": f"range must be one of {', '.join(REVENUE_RANGES)}"}, status=400)
+        try:
+            week_start = (
+                datetime.strptime(params["week_start"], "%Y-%m-%d").date()
+                if params.get("week_start")
+                else current_week_start(now)
+            )
+            calls_limit = min(int(params.get("calls") or RECENT_CALLS_DEFAULT), RECENT_CALLS_MAX)
+        except ValueError:
+            return Response({"error": "Invalid week_start (YYYY-MM-DD) or calls"}, status=400)
+        tz_name = resolve_timezone(params.get("tz") or getattr(request.user, "timezone", None))
+
+        compute = {
+            "stats": lambda: cached(
+                versioned_key(owner_id, "dashboard:stats", [BOOKINGS, SERVICES], minute),
+                lambda: booking_stats(owner_id, now),
+            ),
+            "revenue": lambda: cached(
+                versioned_key(owner_id, "dashboard:revenue", [BOOKINGS, SERVICES], range_type, minute),
+                lambda: booking_revenue(owner_id, range_type, now),
+            ),
+            "heatmap": lambda: cached(
+                versioned_key(owner_id, "dashboard:heatmap", [BOOKINGS], week_start, tz_name),
+                lambda: booking_heatmap(owner_id, week_start, tz_name),
+            ),
+            # Already served from its own cached counter
+            "unread_count": lambda: get_unread_count(owner_id),
+            "recent_calls": lambda: cached(
+                versioned_key(owner_id, "dashboard:recent_calls", [CALLS], calls_limit),
+                lambda: _recent_calls(owner_id, calls_limit),
+            ),
+        }
+
+        workers = min(settings.DASHBOARD_WORKERS, len(sections))
+        if workers > 1:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                # copy_context: threads inherit the request's replica routing (config/db_router.py)
+                futures = {
+                    name: pool.submit(copy_context().run, _outcome, _in_own_connection(compute[name]))
+                    for name in sections
+                }
+            outcomes = {name: future.result() for name, future in futures.items()}
+        else:
+            outcomes = {name: _outcome(compute[name]) for name in sections}
+
+        data = {
+            "generated_at": now.isoformat(),
+            "timezone": tz_name,
+            "week_start": week_start.isoformat(),
+            "errors": [],
+        }
+        for name in sections:
+            value, exc = outcomes[name]
+            if exc is not None:
+                # One broken section shouldn't blank the whole dashboard
+                logger.error("Dashboard section %s failed", name, exc_info=exc)
+                data["errors"].append(name)
+            data[name] = value
+        return Response(data)
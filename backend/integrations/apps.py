@@ -6,3 +6,5 @@ class IntegrationsConfig(AppConfig):
     name = "integrations"
     verbose_name = "Integrations"
 
+    def ready(self) -> None:
+        import integrations.signals  # noqa: F401
@@ -0,0 +1,117 @@
+"""
+Pre-rendered service catalogue for the Vapi services endpoint.
+
+The agent fetches the same service list many times per call. The JSON body
+(bytes) and its ETag are rendered once per owner, services version and
+timezone and kept in the cache, and the webhook token's owner is cached too,
+so a request is answered from a few cache reads without touching the database:
+
+- the token resolves to (owner id, timezone). Deactivating or deleting the
+  owner, or rotating the token, deletes the entry once the change commits
+  (integrations/signals.py); the entry is also re-checked against the owner's
+  auth generation (accounts/authentication.py), bumped after every save;
+- the catalogue is cached under the owner's SERVICES version, so any service
+  change orphans it. Service and timezone changes also rebuild it right after
+  commit (integrations/signals.py), so the next in-call request is a hit.
+
+Both caches need invalidations to reach every worker: without a shared cache
+(settings.CACHE_SHARED) each request resolves the token and renders the
+catalogue from the database.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+
+from accounts.authentication import user_generation
+from accounts.cache_versions import SERVICES, cached, versioned_key
+
+User = get_user_model()
+
+
+def _token_key(token: str) -> str:
+    return "vapi:token:%s" % hashlib.sha256(token.encode()).hexdigest()[:32]
+
+
+def owner_timezone_name(value: str | None) -> str:
+    return (value or "").strip() or "UTC"
+
+
+def resolve_owner(token: str) -> tuple[int, str] | None:
+    """(owner id, timezone name) of the active user with this webhook token, or None."""
+    token = (token or "").strip()
+    if not token:
+        return None
+    key = _token_key(token)
+    entry = cache.get(key) if settings.CACHE_SHARED else None
+    if entry is not None:
+        owner_id, tz_name, generation = entry
+        if user_generation(owner_id) == generation:
+            return owner_id, tz_name
+    row = (
+        User.objects.filter(vapi_webhook_token=token, is_active=True)
+        .values_list("pk", "timezone")
+        .first()
+    )
+    if row is None:
+        # Unknown tokens aren't cached, so guessing can't fill the cache
+        return None
+    owner_id, tz_name = row[0], owner_timezone_name(row[1])
+    if settings.CACHE_SHARED:
+        cache.set(key, (owner_id, tz_name, user_generation(owner_id)), settings.CACHE_RESULT_SECONDS)
+    return owner_id, tz_name
+
+
+def forget_tokens(*tokens: str | None) -> None:
+    """Drop the cached owners of these tokens once the current transaction commits."""
+    keys = [_token_key(token.strip()) for token in tokens if token and token.strip()]
+    if keys and settings.CACHE_SHARED:
+        transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+def _render(owner_id: int, tz_name: str) -> tuple[bytes, str]:
+    from bookings.models import Service
+
+    services = list(
+        Service.objects.for_owner(owner_id)
+        .filter(is_active=True)
+        .order_by("name")
+        .values("id", "name", "category", "price", "currency", "is_active")
+    )
+    # Same encoding JsonResponse used (Decimal prices as strings)
+    body = json.dumps(
+        {"ok": True, "services": services, "timezone": tz_name}, cls=DjangoJSONEncoder
+    ).encode()
+    return body, '"%s"' % hashlib.sha256(body).hexdigest()[:32]
+
+
+def service_catalogue(owner_id: int, tz_name: str) -> tuple[bytes, str]:
+    """The owner's active services as a JSON body and its ETag, rendered on a cache miss."""
+    key = versioned_key(owner_id, "vapi:services", [SERVICES], tz_name)
+    return cached(key, lambda: _render(owner_id, tz_name))
+
+
+def schedule_catalogue_rebuild(owner_id: int, tz_name: str | None = None) -> None:
+    """Render the catalogue after commit (after the SERVICES bump), ready for the next request."""
+    if owner_id is None or not settings.CACHE_SHARED:
+        # Nothing to warm: without a shared cache every request renders it
+        return
+
+    def rebuild() -> None:
+        name = tz_name
+        if name is None:
+            row = User.objects.filter(pk=owner_id).values_list("timezone", "vapi_webhook_token").first()
+            if row is None or not row[1]:
+                # Not connected to Vapi: nothing will ask for it
+                return
+            name = owner_timezone_name(row[0])
+        service_catalogue(owner_id, name)
+
+    # A failed warm-up only means the next request renders it
+    transaction.on_commit(rebuild, robust=True)
@@ -0,0 +1,21 @@
+# Generated by Django 5.0.14 on 2026-10-19 18:24
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0004_owner_indexes'),
+        ('clients', '0003_owner_indexes'),
+        ('integrations', '0001_call_summary'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='callsummary',
+            index=models.Index(fields=['owner', '-created_at'], name='integration_owner_i_ebb397_idx'),
+        ),
+    ]
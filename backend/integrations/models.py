@@ -3,6 +3,8 @@ from __future__ import annotations
 from django.conf import settings
 from django.db import models
 
+from accounts.tenancy import TenantManager
+
 
 class CallSummary(models.Model):
     """
@@ -69,9 +71,14 @@ class CallSummary(models.Model):
         related_name="call_summaries",
     )
 
+    objects = TenantManager()
+
     class Meta:
         ordering = ["-created_at"]
         verbose_name_plural = "Call summaries"
+        indexes = [
+            models.Index(fields=["owner", "-created_at"]),
+        ]
 
     def __str__(self) -> str:
         return f"{self.caller_name or self.caller_number or 'Call'} @ {self.created_at}"
@@ -56,3 +56,15 @@ class CallSummarySerializer(serializers.ModelSerializer):
                 if not (data.get("outcome") or "").strip():
                     data["outcome"] = inferred.get("outcome") or ""
         return data
+
+
+class RecentCallSerializer(CallSummarySerializer):
+    """Call summary without the transcript, for the dashboard's recent calls list."""
+
+    class Meta(CallSummarySerializer.Meta):
+        fields = [
+            field
+            for field in CallSummarySerializer.Meta.fields
+            if field not in ("transcript", "vapi_call_id")
+        ]
+        read_only_fields = fields
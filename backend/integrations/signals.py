@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from accounts.cache_versions import CALLS, bump_version
+from bookings.models import Service
+
+from .catalogue import forget_tokens, owner_timezone_name, schedule_catalogue_rebuild
+from .models import CallSummary
+
+User = get_user_model()
+
+
+# No post_delete receiver: it would make the bulk delete-all load every row
+# (transcripts included) just to send signals. Views bump after deletes instead.
+@receiver(post_save, sender=CallSummary)
+def _bump_call_version(sender, instance: CallSummary, **kwargs) -> None:
+    bump_version(instance.owner_id, CALLS)
+
+
+# Connected after bookings' receivers, so the rebuild runs after the SERVICES bump
+@receiver(post_save, sender=Service)
+@receiver(post_delete, sender=Service)
+def _rebuild_service_catalogue(sender, instance: Service, **kwargs) -> None:
+    schedule_catalogue_rebuild(instance.owner_id)
+
+
+def _changed(instance, name: str) -> bool:
+    return instance.has_loaded_value(name) and instance.loaded_value(name) != getattr(instance, name)
+
+
+@receiver(pre_save, sender=User)
+def _note_owner_changes(sender, instance, **kwargs) -> None:
+    # Read before accounts' post_save receiver re-snapshots the loaded values
+    instance._timezone_changed = _changed(instance, "timezone")
+    instance._previous_vapi_token = (
+        instance.loaded_value("vapi_webhook_token")
+        if _changed(instance, "vapi_webhook_token") or _changed(instance, "is_active")
+        else None
+    )
+
+
+@receiver(post_save, sender=User)
+def _forget_vapi_token(sender, instance, **kwargs) -> None:
+    # Deactivated or token rotated: the old token must stop resolving right away
+    previous = getattr(instance, "_previous_vapi_token", None)
+    if previous is not None:
+        forget_tokens(previous, instance.vapi_webhook_token)
+
+
+@receiver(post_delete, sender=User)
+def _forget_deleted_vapi_token(sender, instance, **kwargs) -> None:
+    forget_tokens(instance.loaded_value("vapi_webhook_token"), instance.vapi_webhook_token)
+
+
+@receiver(post_save, sender=User)
+def _rebuild_catalogue_for_timezone(sender, instance, **kwargs) -> None:
+    if getattr(instance, "_timezone_changed", False) and instance.vapi_webhook_token:
+        schedule_catalogue_rebuild(instance.pk, owner_timezone_name(instance.timezone))
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+from datetime import datetime, time, timedelta, timezone as dt_timezone
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+
+from bookings.models import Booking
+from clients.models import Client
+
+User = get_user_model()
+
+
+class VapiReserveTests(TestCase):
+    def setUp(self) -> None:
+        self.owner = User.objects.create_user(
+            email="owner@example.com", password="secret-pass-123", vapi_webhook_token="reserve-token", timezone="UTC"
+        )
+        self.day = datetime.now(dt_timezone.utc).date() + timedelta(days=3)
+        self.url = "/api/v1/vapi/reserve/reserve-token/"
+
+    def _reserve(self, at: str, **body):
+        payload = {"date": self.day.isoformat(), "time": at, "name": "Jane Caller", "phone": "+1 555 010 2030"}
+        return self.client.post(self.url, {**payload, **body}, content_type="application/json")
+
+    def test_reserve_books_the_slot(self) -> None:
+        response = self._reserve("10:00")
+        self.assertEqual(response.status_code, 201)
+        data = response.json()
+        self.assertTrue(data["ok"])
+        booking = Booking.objects.for_owner(self.owner).get(pk=data["booking"]["id"])
+        self.assertEqual(booking.status, "confirmed")
+        self.assertEqual(booking.starts_at, datetime.combine(self.day, time(10), dt_timezone.utc))
+        self.assertEqual(booking.client.phone_number, "+1 555 010 2030")
+
+    def test_clash_offers_alternatives_and_creates_no_client(self) -> None:
+        self.assertEqual(self._reserve("10:00").status_code, 201)
+        clients = Client.objects.filter(owner=self.owner).count()
+
+        response = self._reserve("10:15", name="Bob Other", phone="+1 555 999 0000")
+
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertFalse(data["ok"])
+        self.assertEqual(data["reason"], "slot_unavailable")
+        offered = [(offer["date"], offer["time"]) for offer in data["alternatives"]]
+        self.assertTrue(1 <= len(offered) <= 5)
+        self.assertNotIn((self.day.isoformat(), "10:00"), offered)
+        # Same day first, closest to the requested time
+        self.assertEqual(offered[0][0], self.day.isoformat())
+        self.assertIn(offered[0][1], ("09:30", "10:30"))
+        # The clash rolled back the caller's new client
+        self.assertEqual(Client.objects.filter(owner=self.owner).count(), clients)
+        self.assertEqual(Booking.objects.filter(owner=self.owner).count(), 1)
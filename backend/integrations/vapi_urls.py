@@ -21,5 +21,11 @@ urlpatterns: list = [
         vapi_views.vapi_available_slots_by_token,
         name="availability-by-token",
     ),
+    # Book a slot (or get alternatives) in one request
+    path(
+        "reserve/<str:token>/",
+        vapi_views.vapi_reserve_by_token,
+        name="reserve-by-token",
+    ),
 ]
 
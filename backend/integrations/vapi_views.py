@@ -5,15 +5,19 @@ import logging
 import re
 from decimal import Decimal
 from datetime import datetime, timedelta
-from zoneinfo import ZoneInfo
 
 from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.http import JsonResponse
+from django.db import IntegrityError, transaction
+from django.http import HttpResponse, JsonResponse
 from django.utils import timezone
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
 
+from accounts.conditional import not_modified, not_modified_response, set_etag
+from config.db_router import primary_db
+
+from .catalogue import resolve_owner, service_catalogue
 from .models import CallSummary
 from .summary_utils import infer_from_summary
 
@@ -45,7 +49,7 @@ def _resolve_service_from_call_description(owner_id: int, call_service_name: str
         return None
     # Prefer longest service name match (e.g. "Leak repair in sink" over "Leak")
     best = max(matches, key=lambda x: len(x[1]))
-    return Service.objects.filter(id=best[0]).first()
+    return Service.objects.filter(owner_id=owner_id, id=best[0]).first()
 
 
 def _create_alert_for_call_summary(instance: CallSummary) -> None:
@@ -77,6 +81,7 @@ def _link_call_summary_to_booking_and_client(instance: CallSummary) -> None:
     try:
         owner_id = instance.owner_id
         from clients.models import Client
+        from bookings.availability import is_overlap_error
         from bookings.models import Booking, Service
 
         caller = (_normalize_phone(instance.caller_number) or "").strip()
@@ -140,15 +145,22 @@ def _link_call_summary_to_booking_and_client(instance: CallSummary) -> None:
                 start = timezone.make_aware(start)
             # All bookings are fixed at 30 minutes
             end = start + timedelta(minutes=30)
-            booking = Booking.objects.create(
+            placeholder = dict(
                 owner_id=owner_id,
                 client_id=related_client.id,
                 service_id=service.id if service else None,
                 starts_at=start,
                 ends_at=end,
-                status="confirmed",
                 notes=f"From voice call: {(instance.summary or '')[:500]}",
             )
+            try:
+                with transaction.atomic():
+                    booking = Booking.objects.create(status="confirmed", **placeholder)
+            except IntegrityError as e:
+                if not is_overlap_error(e):
+                    raise
+                # The slot is taken: keep it for the owner to reschedule
+                booking = Booking.objects.create(status="pending", **placeholder)
             instance.related_booking_id = booking.id
         instance.save(update_fields=["related_client_id", "related_booking_id"])
     except Exception as e:
@@ -362,8 +374,9 @@ def vapi_webhook_by_token(request, token: str):
         )
 
 
+@primary_db
 @require_http_methods(["GET"])
-def vapi_services_by_token(request, token: str) -> JsonResponse:
+def vapi_services_by_token(request, token: str) -> HttpResponse:
     """
     Lightweight services endpoint for Vapi.
 
@@ -371,21 +384,17 @@ def vapi_services_by_token(request, token: str) -> JsonResponse:
 
     Returns active services for the client identified by vapi_webhook_token.
     Intended to be called from the Vapi agent during a call (no JWT needed).
+    Served from the pre-rendered catalogue (integrations/catalogue.py).
     """
     try:
-        from bookings.models import Service
-
-        owner = _get_owner_by_webhook_token(token)
-        if not owner:
+        resolved = resolve_owner(token)
+        if not resolved:
             return JsonResponse({"ok": False, "reason": "unknown_token"}, status=200)
 
-        services = list(
-            Service.objects.filter(owner=owner, is_active=True)
-            .order_by("name")
-            .values("id", "name", "category", "price", "currency", "is_active")
-        )
-        tz_str = (getattr(owner, "timezone", None) or "").strip() or "UTC"
-        return JsonResponse({"ok": True, "services": services, "timezone": tz_str})
+        body, etag = service_catalogue(*resolved)
+        if not_modified(request, etag):
+            return not_modified_response(etag)
+        return set_etag(HttpResponse(body, content_type="application/json"), etag)
     except Exception as e:
         logger.exception("Vapi services endpoint failed: %s", e)
         return JsonResponse(
@@ -394,6 +403,8 @@ def vapi_services_by_token(request, token: str) -> JsonResponse:
         )
 
 
+# Read during calls, right after the agent may have booked: never from a lagging replica
+@primary_db
 @require_http_methods(["GET"])
 def vapi_available_slots_by_token(request, token: str) -> JsonResponse:
     """
@@ -404,11 +415,13 @@ def vapi_available_slots_by_token(request, token: str) -> JsonResponse:
     Returns free 30-minute slots for that date for the client identified
     by vapi_webhook_token. Intended for in-call availability checks.
     """
-    from bookings.models import Booking
+    from bookings.availability import SLOT_MINUTES, free_times
+    from bookings.slots import resolve_timezone
 
-    owner = _get_owner_by_webhook_token(token)
-    if not owner:
+    resolved = resolve_owner(token)
+    if not resolved:
         return JsonResponse({"ok": False, "reason": "unknown_token"}, status=200)
+    owner_id, tz_str = resolved
 
     date_str = request.GET.get("date") or ""
     if not date_str:
@@ -425,48 +438,9 @@ def vapi_available_slots_by_token(request, token: str) -> JsonResponse:
         )
 
     # Use owner's timezone from account settings so 08:00–18:00 is in their local time
-    tz_str = (getattr(owner, "timezone", None) or "").strip() or "UTC"
-    try:
-        tz = ZoneInfo(tz_str)
-    except Exception:
-        tz = timezone.utc
-        tz_str = "UTC"
-
-    slot_minutes = 30
-    start_hour = 8
-    end_hour = 18
-
-    # Build day window in owner's timezone, then convert to UTC for DB query
-    day_start_local = datetime.combine(
-        day,
-        datetime.min.time().replace(hour=start_hour, minute=0, second=0, microsecond=0),
-    ).replace(tzinfo=tz)
-    day_end_local = datetime.combine(
-        day,
-        datetime.min.time().replace(hour=end_hour, minute=0, second=0, microsecond=0),
-    ).replace(tzinfo=tz)
-    day_start_utc = day_start_local.astimezone(timezone.utc)
-    day_end_utc = day_end_local.astimezone(timezone.utc)
-
-    existing = list(
-        Booking.objects.filter(
-            owner=owner,
-            status="confirmed",
-            starts_at__lt=day_end_utc,
-            ends_at__gt=day_start_utc,
-        ).values_list("starts_at", "ends_at")
-    )
-
-    slots: list[str] = []
-    slot_start_local = day_start_local
-    while slot_start_local < day_end_local:
-        slot_end_local = slot_start_local + timedelta(minutes=slot_minutes)
-        slot_start_utc = slot_start_local.astimezone(timezone.utc)
-        slot_end_utc = slot_end_local.astimezone(timezone.utc)
-        occupied = any(start < slot_end_utc and end > slot_start_utc for start, end in existing)
-        if not occupied:
-            slots.append(slot_start_local.strftime("%H:%M"))
-        slot_start_local = slot_end_local
+    tz_str = resolve_timezone(tz_str)
+    slot_minutes = SLOT_MINUTES
+    slots = [slot.label for slot in free_times(owner_id, tz_str, day, slot_minutes)]
 
     return JsonResponse(
         {
@@ -477,3 +451,151 @@ def vapi_available_slots_by_token(request, token: str) -> JsonResponse:
             "slots": slots,
         }
     )
+
+
+def _find_or_create_client(owner_id: int, name: str, phone: str, email: str):
+    """The owner's client with this phone number (any formatting) or email, else a new one."""
+    from clients.dedupe import phone_key
+    from clients.models import Client
+
+    clients = Client.objects.for_owner(owner_id)
+    key = phone_key(phone)
+    if key:
+        # Narrow in SQL by the last digits, compare the full key in Python
+        for client in clients.filter(phone_number__endswith=key[-4:]).order_by("created_at"):
+            if phone_key(client.phone_number) == key:
+                return client
+    if email:
+        client = clients.filter(email__iexact=email).order_by("created_at").first()
+        if client:
+            return client
+    return Client.objects.create(owner_id=owner_id, name=name or "Caller", phone_number=phone, email=email)
+
+
+def _slot_json(day, slot) -> dict:
+    return {
+        "date": day.isoformat(),
+        "time": slot.label,
+        "starts_at": slot.start.isoformat(),
+        "ends_at": slot.end.isoformat(),
+    }
+
+
+@csrf_exempt
+@require_http_methods(["POST"])
+def vapi_reserve_by_token(request, token: str) -> JsonResponse:
+    """
+    Book a slot for the caller in one step.
+
+    URL: /api/v1/vapi/reserve/<token>/
+    Body (JSON): {"date": "YYYY-MM-DD", "time": "HH:MM", "duration_minutes": 30,
+                  "service": "...", "name": "...", "phone": "...", "email": "...", "notes": "..."}
+
+    date/time are in the owner's timezone. Creates a confirmed booking unless
+    it would overlap another confirmed one; the database enforces that, so
+    concurrent calls can't both get the slot. On a clash the response carries
+    up to 5 free alternatives (same day closest first, then following days)
+    instead, so the agent can offer them without another request.
+    """
+    from bookings.availability import SLOT_MINUTES, alternatives, is_overlap_error
+    from bookings.models import Booking, Service
+    from bookings.slots import local_to_utc, resolve_timezone
+
+    resolved = resolve_owner(token)
+    if not resolved:
+        return JsonResponse({"ok": False, "reason": "unknown_token"}, status=200)
+    owner_id, tz_str = resolved
+    tz_str = resolve_timezone(tz_str)
+
+    try:
+        body = json.loads(request.body or "{}")
+    except json.JSONDecodeError:
+        return JsonResponse({"ok": False, "error": "invalid_json"}, status=400)
+    if not isinstance(body, dict):
+        return JsonResponse({"ok": False, "error": "invalid_json"}, status=400)
+
+    try:
+        day = datetime.strptime(str(body.get("date") or ""), "%Y-%m-%d").date()
+        at = datetime.strptime(str(body.get("time") or ""), "%H:%M").time()
+        duration = int(body.get("duration_minutes") or SLOT_MINUTES)
+    except (TypeError, ValueError):
+        return JsonResponse(
+            {
+                "ok": False,
+                "error": "invalid_param",
+                "detail": 'Send "date" (YYYY-MM-DD), "time" (HH:MM) and optionally "duration_minutes"',
+            },
+            status=400,
+        )
+    if not 5 <= duration <= 8 * 60:
+        return JsonResponse(
+            {"ok": False, "error": "invalid_param", "detail": "duration_minutes must be 5-480"},
+            status=400,
+        )
+
+    name = str(body.get("name") or "").strip()[:255]
+    phone = str(body.get("phone") or "").strip()[:50]
+    email = str(body.get("email") or "").strip()[:254]
+    if not (name or phone or email):
+        return JsonResponse(
+            {"ok": False, "error": "missing_param", "detail": 'Send the caller\'s "name" or "phone"'},
+            status=400,
+        )
+
+    starts_at = local_to_utc(datetime.combine(day, at), tz_str)
+    ends_at = starts_at + timedelta(minutes=duration)
+    now = timezone.now()
+    if starts_at <= now:
+        return JsonResponse({"ok": False, "error": "in_past"}, status=400)
+
+    service = None
+    service_name = str(body.get("service") or "").strip()
+    if service_name:
+        service = (
+            Service.objects.for_owner(owner_id).filter(name__iexact=service_name, is_active=True).first()
+            or _resolve_service_from_call_description(owner_id, service_name)
+        )
+
+    try:
+        # A clash rolls back the new client too
+        with transaction.atomic():
+            client = _find_or_create_client(owner_id, name, phone, email)
+            booking = Booking.objects.create(
+                owner_id=owner_id,
+                client=client,
+                service=service,
+                starts_at=starts_at,
+                ends_at=ends_at,
+                status="confirmed",
+                notes=str(body.get("notes") or "Booked by voice agent")[:2000],
+            )
+    except IntegrityError as e:
+        if not is_overlap_error(e):
+            raise
+        offers = alternatives(owner_id, tz_str, day, starts_at, duration, now)
+        return JsonResponse(
+            {
+                "ok": False,
+                "reason": "slot_unavailable",
+                "timezone": tz_str,
+                "alternatives": [_slot_json(offer_day, slot) for offer_day, slot in offers],
+            },
+            status=200,
+        )
+
+    return JsonResponse(
+        {
+            "ok": True,
+            "timezone": tz_str,
+            "booking": {
+                "id": booking.id,
+                "date": day.isoformat(),
+                "time": at.strftime("%H:%M"),
+                "starts_at": starts_at.isoformat(),
+                "ends_at": ends_at.isoformat(),
+                "service": service.name if service else None,
+                "client_id": client.id,
+            },
+        },
+        status=201,
+    )
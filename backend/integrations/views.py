@@ -5,6 +5,8 @@ from rest_framework import permissions, viewsets
 from rest_framework.decorators import action
 from rest_framework.response import Response
 
+from accounts.cache_versions import CALLS, bump_version
+
 from .models import CallSummary
 from .serializers import CallSummarySerializer
 
@@ -19,7 +21,7 @@ class CallSummaryViewSet(viewsets.ModelViewSet):
     http_method_names = ["get", "post", "delete", "head", "options"]
 
     def get_queryset(self):
-        queryset = CallSummary.objects.filter(owner=self.request.user).order_by(
+        queryset = CallSummary.objects.for_owner(self.request.user).order_by(
             "-created_at"
         )
         search = (self.request.query_params.get("search") or "").strip()
@@ -35,8 +37,14 @@ class CallSummaryViewSet(viewsets.ModelViewSet):
             queryset = queryset.filter(service_name__iexact=service)
         return queryset
 
+    def perform_destroy(self, instance: CallSummary) -> None:
+        owner_id = instance.owner_id
+        super().perform_destroy(instance)
+        bump_version(owner_id, CALLS)
+
     @action(detail=False, methods=["post"], url_path="delete-all")
     def delete_all(self, request):
         """Delete all call summaries for the current user."""
-        deleted, _ = CallSummary.objects.filter(owner=request.user).delete()
+        deleted, _ = CallSummary.objects.for_owner(request.user).delete()
+        bump_version(request.user.id, CALLS)
         return Response(status=204)
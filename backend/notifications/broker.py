@@ -0,0 +1,166 @@
+"""
+Cross-process fan-out for live alerts.
+
+SSE connections live in whichever web process accepted them, but alerts are
+created in whichever process handled the request (or the Vapi webhook). The
+broker carries "message for user X" from the publisher to every process, and
+each process then fans out to its own connections via stream.deliver_local.
+Messages are {"alert": <payload>} or {"unread_count": <int>}.
+
+Backends (settings.ALERTS_BROKER_BACKEND):
+- PostgresBroker: NOTIFY on publish; one LISTEN connection per process.
+  Needs no infrastructure beyond the existing database.
+- InMemoryBroker: delivers in-process only. For tests and single-process dev.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import select
+import threading
+import time
+
+from django.conf import settings
+from django.db import close_old_connections, connections, transaction
+from django.utils.module_loading import import_string
+
+from .stream import deliver_local
+
+logger = logging.getLogger(__name__)
+
+
+class BaseBroker:
+    def publish(self, user_id: int, message: dict) -> None:
+        raise NotImplementedError
+
+    def start(self) -> None:
+        """Begin receiving published alerts in this process. Idempotent."""
+
+
+class InMemoryBroker(BaseBroker):
+    """Process-local broker: publish delivers straight to this process's connections."""
+
+    def publish(self, user_id: int, message: dict) -> None:
+        deliver_local(user_id, message)
+
+
+class PostgresBroker(BaseBroker):
+    """
+    PostgreSQL LISTEN/NOTIFY broker.
+
+    publish() runs pg_notify on the caller's DB connection, so the notification
+    is only sent once the surrounding transaction (the one that created the
+    Alert) commits. It runs in a savepoint, so a failed NOTIFY (e.g. a full
+    notification queue) doesn't abort the caller's transaction. A daemon
+    thread per process holds a dedicated autocommit connection that LISTENs
+    on the channel and reconnects with backoff.
+    """
+
+    channel = "elara_alerts"
+    # NOTIFY payloads must be under 8000 bytes; larger alerts are sent by id
+    # and re-serialized by the listener.
+    max_payload_bytes = 7900
+    poll_timeout = 5.0
+    max_backoff = 30.0
+
+    def __init__(self, using: str = "default") -> None:
+        self.using = using
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self._pid: int | None = None
+
+    def publish(self, user_id: int, message: dict) -> None:
+        raw = json.dumps({"user_id": user_id, **message})
+        if len(raw.encode("utf-8")) > self.max_payload_bytes and "alert" in message:
+            raw = json.dumps({"user_id": user_id, "alert_id": message["alert"].get("id")})
+        with transaction.atomic(using=self.using), connections[self.using].cursor() as cursor:
+            cursor.execute("SELECT pg_notify(%s, %s)", [self.channel, raw])
+
+    def start(self) -> None:
+        with self._lock:
+            # Re-start after fork (gunicorn --preload): threads don't survive fork
+            if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._thread = threading.Thread(
+                target=self._listen_forever,
+                name="alerts-broker-listener",
+                daemon=True,
+            )
+            self._thread.start()
+
+    def _connect(self):
+        wrapper = connections[self.using]
+        params = wrapper.get_connection_params()
+        # Bypass a transaction-mode PgBouncer, which can't hold LISTEN
+        if settings.ALERTS_BROKER_DB_HOST:
+            params["host"] = settings.ALERTS_BROKER_DB_HOST
+        if settings.ALERTS_BROKER_DB_PORT:
+            params["port"] = settings.ALERTS_BROKER_DB_PORT
+        conn = wrapper.Database.connect(**params)
+        conn.autocommit = True
+        with conn.cursor() as cursor:
+            cursor.execute(f'LISTEN "{self.channel}"')
+        return conn
+
+    def _listen_forever(self) -> None:
+        backoff = 1.0
+        while True:
+            conn = None
+            try:
+                conn = self._connect()
+                backoff = 1.0
+                logger.info("Alerts broker listening on %s (pid=%s)", self.channel, os.getpid())
+                while True:
+                    if select.select([conn], [], [], self.poll_timeout) == ([], [], []):
+                        continue
+                    conn.poll()
+                    while conn.notifies:
+                        self._dispatch(conn.notifies.pop(0).payload)
+            except Exception:
+                logger.exception("Alerts broker listener failed; reconnecting in %.0fs", backoff)
+                time.sleep(backoff)
+                backoff = min(backoff * 2, self.max_backoff)
+            finally:
+                if conn is not None:
+                    try:
+                        conn.close()
+                    except Exception:
+                        pass
+
+    def _dispatch(self, raw: str) -> None:
+        try:
+            message = json.loads(raw)
+            user_id = int(message.pop("user_id"))
+            if "alert_id" in message:
+                payload = self._load_alert_payload(message.pop("alert_id"))
+                if payload is None:
+                    return
+                message["alert"] = payload
+            deliver_local(user_id, message)
+        except Exception:
+            logger.exception("Alerts broker: could not dispatch notification")
+
+    def _load_alert_payload(self, alert_id) -> dict | None:
+        from .models import Alert
+        from .serializers import AlertSerializer
+
+        try:
+            alert = Alert.objects.unscoped().filter(pk=alert_id).first()
+            return AlertSerializer(alert).data if alert else None
+        finally:
+            close_old_connections()
+
+
+_broker: BaseBroker | None = None
+_broker_lock = threading.Lock()
+
+
+def get_broker() -> BaseBroker:
+    global _broker
+    if _broker is None:
+        with _broker_lock:
+            if _broker is None:
+                _broker = import_string(settings.ALERTS_BROKER_BACKEND)()
+    return _broker
@@ -0,0 +1,94 @@
+"""
+Denormalized unread-alert counter per owner.
+
+The count of unread alerts in the retention window lives in the cache and is
+adjusted in place as alerts are created, read or deleted, so the dashboard
+never needs a COUNT query per poll. A cache miss (first read, eviction, or
+TTL expiry) reconciles from the database; the TTL also bounds drift from
+alerts ageing out of the window. Every change is pushed to the owner's SSE
+connections as an unread_count event.
+
+Without a shared cache (settings.CACHE_SHARED) each worker would adjust its
+own copy, so the count is read with the indexed COUNT query instead.
+"""
+from __future__ import annotations
+
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+
+from .models import ALERT_RETENTION_DAYS, Alert
+from .stream import push_unread_count_to_user
+
+logger = logging.getLogger(__name__)
+
+# Seconds before the cached count is re-read from the database
+UNREAD_COUNT_TTL = 300
+
+
+def _key(owner_id: int) -> str:
+    return f"alerts:unread:{owner_id}"
+
+
+def count_unread_in_db(owner_id: int) -> int:
+    cutoff = timezone.now() - timedelta(days=ALERT_RETENTION_DAYS)
+    return Alert.objects.filter(
+        owner_id=owner_id,
+        is_read=False,
+        created_at__gte=cutoff,
+    ).count()
+
+
+def get_unread_count(owner_id: int) -> int:
+    if not settings.CACHE_SHARED:
+        return count_unread_in_db(owner_id)
+    count = cache.get(_key(owner_id))
+    if count is None:
+        count = count_unread_in_db(owner_id)
+        # add(): don't clobber a value another request adjusted meanwhile
+        cache.add(_key(owner_id), count, UNREAD_COUNT_TTL)
+    return count
+
+
+def _apply(owner_id: int, delta: int | None, value: int | None) -> None:
+    try:
+        _apply_and_push(owner_id, delta, value)
+    except Exception:
+        # Runs in on_commit: never break the request that already committed
+        logger.exception("Failed updating unread alert count for owner %s", owner_id)
+
+
+def _apply_and_push(owner_id: int, delta: int | None, value: int | None) -> None:
+    key = _key(owner_id)
+    count = None
+    if value is not None:
+        if settings.CACHE_SHARED:
+            cache.set(key, value, UNREAD_COUNT_TTL)
+        count = value
+    elif settings.CACHE_SHARED:
+        try:
+            count = cache.incr(key, delta)
+        except ValueError:
+            # Not cached: the next read reconciles from the database
+            pass
+        if count is not None and count < 0:
+            cache.delete(key)
+            count = None
+    if count is None:
+        count = get_unread_count(owner_id)
+    push_unread_count_to_user(owner_id, count)
+
+
+def adjust_unread_count(owner_id: int, delta: int) -> None:
+    """Add delta to the owner's counter once the current transaction commits."""
+    if delta:
+        transaction.on_commit(lambda: _apply(owner_id, delta, None))
+
+
+def set_unread_count(owner_id: int, value: int) -> None:
+    """Set the owner's counter (e.g. 0 after mark_all_read) once the current transaction commits."""
+    transaction.on_commit(lambda: _apply(owner_id, None, value))
@@ -0,0 +1,285 @@
+"""
+Outbound alert webhooks and transactional email, sent off the request path.
+
+on_alert_created writes an OutboundNotification row; OutboxDispatcher (run by
+`python manage.py dispatch_notifications`) claims due rows, groups them by
+destination, and sends each group concurrently over a pooled requests.Session
+per destination host. EmailDispatcher drains OutboundEmail rows over a single
+SMTP connection kept open while there is mail to send. Failures are retried with
+exponential backoff.
+
+Delivery is at-least-once, so every webhook alert carries an idempotency key
+(the outbox row's id, also sent as the Idempotency-Key header for single-alert
+POSTs) and every email a Message-ID derived from its row, for receivers to
+drop repeats. A claimed batch never outlives its lease: sends only start
+during the first half of it (SEND_WINDOW) and each is bounded by a timeout, so
+rows not reached by then are handed back instead of being claimed and sent a
+second time by another dispatcher.
+"""
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.core.mail.utils import DNS_NAME
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import OutboundEmail, OutboundNotification
+
+logger = logging.getLogger(__name__)
+
+REQUEST_TIMEOUT_SECONDS = 5
+MAX_ATTEMPTS = 6
+# Retry delays: 30s, 1m, 2m, 4m, 8m (capped at RETRY_MAX_DELAY)
+RETRY_BASE_DELAY = timedelta(seconds=30)
+RETRY_MAX_DELAY = timedelta(hours=1)
+# A claimed row is invisible to other dispatchers for this long; if the
+# claiming worker dies mid-send, the row becomes due again afterwards.
+CLAIM_LEASE = timedelta(minutes=2)
+CLAIM_BATCH_SIZE = 200
+# Sends start only this long after the claim. A webhook POST takes at most
+# connect + read timeout, an email two tries of EMAIL_TIMEOUT, so a send started
+# in the window ends well inside the lease.
+SEND_WINDOW = CLAIM_LEASE / 2
+
+
+def retry_delay(attempts: int) -> timedelta:
+    return min(RETRY_BASE_DELAY * (2 ** max(attempts - 1, 0)), RETRY_MAX_DELAY)
+
+
+def claim_due(model) -> list:
+    """Lease up to CLAIM_BATCH_SIZE due outbox rows; safe to run from several workers."""
+    now = timezone.now()
+    with transaction.atomic():
+        rows = list(
+            model.objects.select_for_update(skip_locked=True)
+            .filter(status='pending', next_attempt_at__lte=now)
+            .order_by('next_attempt_at')[:CLAIM_BATCH_SIZE]
+        )
+        if rows:
+            model.objects.filter(
+                pk__in=[row.pk for row in rows]
+            ).update(next_attempt_at=now + CLAIM_LEASE)
+    return rows
+
+
+def _record_failure(row, error: str, now) -> None:
+    row.attempts += 1
+    row.last_error = error
+    if row.attempts >= MAX_ATTEMPTS:
+        row.status = 'failed'
+    else:
+        row.next_attempt_at = now + retry_delay(row.attempts)
+
+
+def _finish(model, sent_ids: list[int], retry: list, now, released: list = ()) -> None:
+    if sent_ids:
+        model.objects.filter(pk__in=sent_ids).update(
+            status='sent',
+            sent_at=now,
+            attempts=F('attempts') + 1,
+            last_error='',
+        )
+    if retry:
+        model.objects.bulk_update(
+            retry, ['attempts', 'last_error', 'status', 'next_attempt_at']
+        )
+    if released:
+        # Not attempted before SEND_WINDOW ran out: due again right away
+        model.objects.filter(pk__in=[row.pk for row in released]).update(next_attempt_at=now)
+
+
+def idempotency_key(row: OutboundNotification) -> str:
+    return f"alert-webhook-{row.pk}"
+
+
+# _send_in_window() result for a chunk reached after SEND_WINDOW
+_NOT_STARTED = object()
+
+
+class OutboxDispatcher:
+    def __init__(
+        self,
+        max_workers: int | None = None,
+        batch_size: int | None = None,
+    ) -> None:
+        self.max_workers = max_workers or settings.NOTIFICATION_DISPATCH_WORKERS
+        # >1 sends {"alerts": [...]} envelopes; 1 keeps the one-alert-per-POST contract
+        self.batch_size = batch_size or settings.ALERT_WEBHOOK_BATCH_SIZE
+        self._sessions: dict[str, requests.Session] = {}
+        self._sessions_lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_workers,
+            thread_name_prefix="notification-dispatch",
+        )
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+        for session in self._sessions.values():
+            session.close()
+        self._sessions.clear()
+
+    def _session_for(self, url: str) -> requests.Session:
+        """One keep-alive session per scheme+host, so repeat sends skip TCP/TLS setup."""
+        parts = urlsplit(url)
+        key = f"{parts.scheme}://{parts.netloc}"
+        with self._sessions_lock:
+            session = self._sessions.get(key)
+            if session is None:
+                session = requests.Session()
+                session.mount(key, HTTPAdapter(pool_connections=1, pool_maxsize=self.max_workers))
+                self._sessions[key] = session
+        return session
+
+    def claim_due(self) -> list[OutboundNotification]:
+        return claim_due(OutboundNotification)
+
+    def _chunks(self, rows: list[OutboundNotification]):
+        by_destination: dict[str, list[OutboundNotification]] = defaultdict(list)
+        for row in rows:
+            by_destination[row.destination_url].append(row)
+        for url, group in by_destination.items():
+            for i in range(0, len(group), self.batch_size):
+                yield url, group[i:i + self.batch_size]
+
+    def _send(self, url: str, group: list[OutboundNotification]) -> str | None:
+        """POST one chunk. Returns an error string, or None on success."""
+        alerts = [{**row.payload, "idempotency_key": idempotency_key(row)} for row in group]
+        if self.batch_size > 1:
+            body, headers = {"alerts": alerts}, {}
+        else:
+            body, headers = alerts[0], {"Idempotency-Key": alerts[0]["idempotency_key"]}
+        try:
+            response = self._session_for(url).post(
+                url,
+                json=body,
+                headers=headers,
+                timeout=(REQUEST_TIMEOUT_SECONDS, REQUEST_TIMEOUT_SECONDS),
+            )
+            response.raise_for_status()
+        except requests.RequestException as e:
+            return str(e)[:1000]
+        return None
+
+    def _send_in_window(self, deadline: float, url: str, group: list[OutboundNotification]):
+        if time.monotonic() >= deadline:
+            return _NOT_STARTED
+        return self._send(url, group)
+
+    def dispatch_once(self) -> tuple[int, int]:
+        """Send everything currently due. Returns (sent, failed attempts)."""
+        rows = self.claim_due()
+        if not rows:
+            return 0, 0
+        deadline = time.monotonic() + SEND_WINDOW.total_seconds()
+        chunks = list(self._chunks(rows))
+        errors = self._executor.map(lambda chunk: self._send_in_window(deadline, *chunk), chunks)
+
+        now = timezone.now()
+        sent_ids: list[int] = []
+        retry: list[OutboundNotification] = []
+        released: list[OutboundNotification] = []
+        for (url, group), error in zip(chunks, errors):
+            if error is _NOT_STARTED:
+                released.extend(group)
+                continue
+            if error is None:
+                sent_ids.extend(row.pk for row in group)
+                continue
+            logger.warning("Alert webhook to %s failed: %s", url, error)
+            for row in group:
+                _record_failure(row, error, now)
+                retry.append(row)
+
+        if released:
+            logger.warning("Handing back %d alert webhook(s) not sent within the claim lease", len(released))
+        _finish(OutboundNotification, sent_ids, retry, now, released)
+        return len(sent_ids), len(retry)
+
+
+class EmailDispatcher:
+    """
+    Sends queued OutboundEmail rows. The backend connection is opened once and
+    reused for every message while mail keeps coming (one SMTP/TLS handshake
+    instead of one per email); it is closed when idle or after a failure.
+    """
+
+    def __init__(self) -> None:
+        self._connection = None
+
+    def close(self) -> None:
+        if self._connection is not None:
+            try:
+                self._connection.close()
+            except Exception:
+                pass
+            self._connection = None
+
+    def _open(self):
+        if self._connection is None:
+            connection = get_connection(fail_silently=False)
+            connection.open()
+            self._connection = connection
+        return self._connection
+
+    def _send(self, row: OutboundEmail) -> str | None:
+        """Send one email. Returns an error string, or None on success."""
+        message = EmailMessage(
+            subject=row.subject,
+            body=row.body,
+            from_email=row.from_email or None,
+            to=[row.to_email],
+            # Stable across retries, so a resend after a lost reply can be recognised
+            headers={"Message-ID": f"<outbound-email-{row.pk}@{DNS_NAME}>"},
+        )
+        for _ in range(2):
+            reused = self._connection is not None
+            try:
+                self._open().send_messages([message])
+                return None
+            except Exception as e:
+                # The connection may be half-closed; start fresh
+                self.close()
+                error = str(e)[:1000] or e.__class__.__name__
+                if not reused:
+                    break
+                # A reused connection may just have timed out: retry once on a new one
+        return error
+
+    def dispatch_once(self) -> tuple[int, int]:
+        """Send every email currently due. Returns (sent, failed attempts)."""
+        rows = claim_due(OutboundEmail)
+        if not rows:
+            # Don't hold an idle SMTP session the server will drop anyway
+            self.close()
+            return 0, 0
+        deadline = time.monotonic() + SEND_WINDOW.total_seconds()
+        sent_ids: list[int] = []
+        retry: list[OutboundEmail] = []
+        released: list[OutboundEmail] = []
+        now = timezone.now()
+        for i, row in enumerate(rows):
+            if time.monotonic() >= deadline:
+                released = rows[i:]
+                logger.warning("Handing back %d email(s) not sent within the claim lease", len(released))
+                break
+            error = self._send(row)
+            if error is None:
+                sent_ids.append(row.pk)
+                continue
+            logger.warning("Email %r to %s failed: %s", row.subject, row.to_email, error)
+            _record_failure(row, error, now)
+            retry.append(row)
+        _finish(OutboundEmail, sent_ids, retry, now, released)
+        return len(sent_ids), len(retry)
@@ -0,0 +1,34 @@
+"""
+Transactional email, queued through the OutboundEmail outbox.
+
+queue_email() only writes a row (inside the caller's transaction, so a rolled
+back save sends nothing); `python manage.py dispatch_notifications` sends it.
+"""
+from __future__ import annotations
+
+import logging
+
+from django.conf import settings
+
+from .models import OutboundEmail
+
+logger = logging.getLogger(__name__)
+
+
+def email_configured() -> bool:
+    """Outgoing mail needs SMTP credentials (e.g. a Gmail App Password)."""
+    return bool(getattr(settings, "EMAIL_HOST_USER", None))
+
+
+def queue_email(to_email: str, subject: str, body: str, owner_id: int | None = None) -> OutboundEmail | None:
+    """Queue one plain-text email. Returns None (and logs) when email is not configured."""
+    if not email_configured():
+        logger.info("Skipping email %r to %s: EMAIL_HOST_USER not set", subject, to_email)
+        return None
+    return OutboundEmail.objects.create(
+        owner_id=owner_id,
+        to_email=to_email,
+        from_email=getattr(settings, "DEFAULT_FROM_EMAIL", settings.EMAIL_HOST_USER),
+        subject=subject,
+        body=body,
+    )
@@ -1,13 +1,29 @@
 """
 Delete alerts older than 7 days. Run via cron (e.g. daily) to keep the DB lean.
   python manage.py delete_old_alerts
+
+When alerts are partitioned (see partition_alerts), whole weekly partitions that
+are entirely older than the cutoff are detached and dropped instead, and upcoming
+weeks are created. Rows in the partially expired week stay until their whole
+week expires; the API never shows them. Expired rows in the default partition
+(written while maintenance was behind) are deleted row by row.
 """
 from datetime import timedelta
 
 from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count
 from django.utils import timezone
 
-from notifications.models import Alert
+from notifications.counters import adjust_unread_count
+from notifications.models import ALERT_RETENTION_DAYS, Alert
+from notifications.partitions import (
+    drop_partitions_before,
+    ensure_partitions,
+    expired_boundary,
+    is_partitioned,
+    purge_default_before,
+)
 
 
 class Command(BaseCommand):
@@ -23,8 +39,40 @@ class Command(BaseCommand):
 
     def handle(self, *args, **options):
         days = options["days"]
-        cutoff = timezone.now() - timedelta(days=days)
-        deleted, _ = Alert.objects.filter(created_at__lt=cutoff).delete()
-        self.stdout.write(
-            self.style.SUCCESS(f"Deleted {deleted} alert(s) older than {days} days.")
-        )
+        now = timezone.now()
+        cutoff = now - timedelta(days=days)
+        window_start = now - timedelta(days=ALERT_RETENTION_DAYS)
+        partitioned = is_partitioned()
+        with transaction.atomic():
+            # Partitions end on week boundaries; only those wholly before cutoff go
+            boundary = expired_boundary(cutoff) if partitioned else cutoff
+            if boundary is not None and boundary > window_start:
+                # Purged alerts still inside the API window count towards unread counters;
+                # the adjustments are applied once the purge commits.
+                visible_unread = (
+                    Alert.objects.unscoped().filter(
+                        is_read=False,
+                        created_at__gte=window_start,
+                        created_at__lt=boundary,
+                    )
+                    .values("owner_id")
+                    .annotate(n=Count("id"))
+                )
+                for row in visible_unread:
+                    adjust_unread_count(row["owner_id"], -row["n"])
+            if partitioned:
+                dropped, _ = drop_partitions_before(cutoff)
+                # Unread rows before the boundary were already counted above
+                visible_since = max(window_start, boundary) if boundary is not None else window_start
+                purged, unread = purge_default_before(cutoff, visible_since)
+                for owner_id, n in unread.items():
+                    adjust_unread_count(owner_id, -n)
+                ensure_partitions()
+                message = (
+                    f"Dropped {len(dropped)} weekly alert partition(s) and {purged} default-partition "
+                    f"alert(s) older than {days} days."
+                )
+            else:
+                deleted, _ = Alert.objects.unscoped().filter(created_at__lt=cutoff).delete()
+                message = f"Deleted {deleted} alert(s) older than {days} days."
+        self.stdout.write(self.style.SUCCESS(message))
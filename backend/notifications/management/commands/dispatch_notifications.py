@@ -0,0 +1,56 @@
+"""
+Send queued outbound alert webhooks (SMS/WhatsApp bridges) and transactional
+emails (account approval, alert emails). Run as a long-lived
+worker next to the web process, or from cron with --once:
+  python manage.py dispatch_notifications
+  python manage.py dispatch_notifications --once
+"""
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from notifications.dispatcher import EmailDispatcher, OutboxDispatcher
+
+
+class Command(BaseCommand):
+    help = "Send queued alert webhooks and emails, retrying failures with backoff"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Send everything currently due, then exit",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=1.0,
+            help="Seconds to sleep when nothing is due (default: 1)",
+        )
+
+    def handle(self, *args, **options):
+        dispatcher = OutboxDispatcher()
+        email_dispatcher = EmailDispatcher()
+        try:
+            while True:
+                close_old_connections()
+                sent, failed = dispatcher.dispatch_once()
+                if sent or failed:
+                    self.stdout.write(f"Sent {sent} notification(s), {failed} failed attempt(s).")
+                emails_sent, emails_failed = email_dispatcher.dispatch_once()
+                if emails_sent or emails_failed:
+                    self.stdout.write(f"Sent {emails_sent} email(s), {emails_failed} failed attempt(s).")
+                sent += emails_sent
+                failed += emails_failed
+                if options["once"]:
+                    if not (sent or failed):
+                        break
+                    continue
+                if not (sent or failed):
+                    time.sleep(options["interval"])
+        except KeyboardInterrupt:
+            pass
+        finally:
+            dispatcher.close()
+            email_dispatcher.close()
@@ -0,0 +1,24 @@
+"""
+Convert the Alert table to weekly range partitions (PostgreSQL only, one-off).
+Afterwards delete_old_alerts drops whole expired weeks instead of deleting rows.
+  python manage.py partition_alerts
+"""
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from notifications.partitions import convert_to_partitioned, is_partitioned
+
+
+class Command(BaseCommand):
+    help = "Store alerts in weekly PostgreSQL range partitions"
+
+    def handle(self, *args, **options):
+        if connection.vendor != "postgresql":
+            raise CommandError("Alert partitioning requires PostgreSQL.")
+        if is_partitioned():
+            self.stdout.write(self.style.SUCCESS("Alerts are already partitioned."))
+            return
+        copied = convert_to_partitioned()
+        self.stdout.write(
+            self.style.SUCCESS(f"Partitioned alerts by week ({copied} alert(s) copied).")
+        )
@@ -0,0 +1,41 @@
+# Generated by Django 5.0.14 on 2026-10-19 18:19
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import F
+
+
+def backfill_updated_at(apps, schema_editor):
+    Alert = apps.get_model('notifications', 'Alert')
+    Alert.objects.update(updated_at=F('created_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0003_service_category'),
+        ('clients', '0002_client_notes_client_tags'),
+        ('notifications', '0002_outbound_notification'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='alert',
+            name='notificatio_owner_i_afe436_idx',
+        ),
+        migrations.AddField(
+            model_name='alert',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.RunPython(backfill_updated_at, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='alert',
+            index=models.Index(fields=['owner', 'is_read', '-created_at'], name='notificatio_owner_i_f3f75b_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='alert',
+            index=models.Index(fields=['owner', 'updated_at'], name='notificatio_owner_i_d19068_idx'),
+        ),
+    ]
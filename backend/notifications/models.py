@@ -2,6 +2,12 @@ from __future__ import annotations
 
 from django.conf import settings
 from django.db import models
+from django.utils import timezone
+
+from accounts.tenancy import TenantManager
+
+# Alerts older than this are excluded from the API (auto-removed from user's view)
+ALERT_RETENTION_DAYS = 7
 
 
 class Alert(models.Model):
@@ -45,12 +51,17 @@ class Alert(models.Model):
     )
     created_at = models.DateTimeField(auto_now_add=True)
     read_at = models.DateTimeField(null=True, blank=True)
+    # Bumped on every change (including bulk read updates) for ?since= delta sync
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = TenantManager()
 
     class Meta:
         ordering = ['-created_at']
         indexes = [
             models.Index(fields=['owner', '-created_at']),
-            models.Index(fields=['owner', 'is_read']),
+            models.Index(fields=['owner', 'is_read', '-created_at']),
+            models.Index(fields=['owner', 'updated_at']),
         ]
 
     def __str__(self) -> str:
@@ -61,4 +72,90 @@ class Alert(models.Model):
         from django.utils import timezone
         self.is_read = True
         self.read_at = timezone.now()
-        self.save(update_fields=['is_read', 'read_at'])
+        self.save(update_fields=['is_read', 'read_at', 'updated_at'])
+
+
+class OutboundNotification(models.Model):
+    """
+    Outbox row for an alert that must be delivered to an owner's external
+    webhook (SMS/WhatsApp bridge). Written in the same transaction as the
+    Alert and drained by the dispatch_notifications worker, so request
+    handlers never wait on third-party HTTP.
+    """
+
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('sent', 'Sent'),
+        ('failed', 'Failed'),
+    ]
+
+    owner = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='outbound_notifications',
+    )
+    # Plain id rather than a FK: the payload is a snapshot and must survive alert purges.
+    alert_id = models.BigIntegerField(null=True, blank=True)
+    destination_url = models.URLField(max_length=500)
+    payload = models.JSONField()
+    status = models.CharField(
+        max_length=16,
+        choices=STATUS_CHOICES,
+        default='pending',
+    )
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['created_at']
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at']),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.destination_url} ({self.status})"
+
+
+class OutboundEmail(models.Model):
+    """
+    Outbox row for a transactional email (account approval, alert emails).
+    Written in the caller's transaction and sent by the dispatch_notifications
+    worker over one reused SMTP connection, so saves never wait on (or fail
+    because of) the mail server.
+    """
+
+    STATUS_CHOICES = OutboundNotification.STATUS_CHOICES
+
+    owner = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='outbound_emails',
+    )
+    to_email = models.EmailField()
+    from_email = models.CharField(max_length=255, blank=True)
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    status = models.CharField(
+        max_length=16,
+        choices=STATUS_CHOICES,
+        default='pending',
+    )
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['created_at']
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at']),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.subject} → {self.to_email} ({self.status})"
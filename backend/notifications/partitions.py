@@ -0,0 +1,227 @@
+"""
+Optional weekly range partitioning of the Alert table (PostgreSQL only).
+
+`python manage.py partition_alerts` converts notifications_alert into a table
+partitioned by created_at, one partition per ISO week (Monday 00:00 UTC), plus
+a default partition so inserts never fail if maintenance falls behind.
+delete_old_alerts detects the partitioned layout and then detaches and drops
+whole expired weeks instead of deleting rows, and creates upcoming weeks.
+Rows that landed in the default partition are moved into their week's
+partition when it is created (PostgreSQL refuses to create it otherwise), and
+expired ones still in the default partition are deleted row by row.
+
+Partitioned tables need the partition key in the primary key, so the table's
+PK becomes (id, created_at); ids still come from a single sequence and stay
+unique. No other table references Alert, so no foreign keys are affected.
+"""
+from __future__ import annotations
+
+import re
+from datetime import date, datetime, time, timedelta, timezone as dt_timezone
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .models import Alert
+
+TABLE = Alert._meta.db_table
+DEFAULT_PARTITION = f"{TABLE}_default"
+# Upcoming weeks kept ready, so a missed maintenance run doesn't spill into the default partition
+WEEKS_AHEAD = 4
+
+_PARTITION_RE = re.compile(rf"^{TABLE}_p(\d{{8}})$")
+
+
+def week_start(day: date) -> date:
+    return day - timedelta(days=day.weekday())
+
+
+def _bound(day: date) -> datetime:
+    return datetime.combine(day, time.min, tzinfo=dt_timezone.utc)
+
+
+def _partition_name(start: date) -> str:
+    return f"{TABLE}_p{start:%Y%m%d}"
+
+
+def is_partitioned() -> bool:
+    if connection.vendor != "postgresql":
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(%s)",
+            [TABLE],
+        )
+        return cursor.fetchone() is not None
+
+
+def list_partitions() -> list[tuple[str, date]]:
+    """Weekly partitions as (name, week start), oldest first. Excludes the default partition."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT child.relname
+            FROM pg_inherits
+            JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+            WHERE pg_inherits.inhparent = to_regclass(%s)
+            """,
+            [TABLE],
+        )
+        names = [row[0] for row in cursor.fetchall()]
+    weeks = []
+    for name in names:
+        match = _PARTITION_RE.match(name)
+        if match:
+            weeks.append((name, datetime.strptime(match.group(1), "%Y%m%d").date()))
+    return sorted(weeks, key=lambda item: item[1])
+
+
+def _create_week(cursor, start: date) -> None:
+    """Create the week's partition, moving its rows out of the default partition first."""
+    qn = connection.ops.quote_name
+    name = _partition_name(start)
+    cursor.execute("SELECT to_regclass(%s) IS NOT NULL", [name])
+    if cursor.fetchone()[0]:
+        return
+    bounds = [_bound(start), _bound(start + timedelta(days=7))]
+    # No new rows for the week can reach the default partition until it exists
+    cursor.execute(f"LOCK TABLE {qn(DEFAULT_PARTITION)} IN ACCESS EXCLUSIVE MODE")
+    cursor.execute(
+        f"SELECT EXISTS (SELECT 1 FROM {qn(DEFAULT_PARTITION)} WHERE created_at >= %s AND created_at < %s)",
+        bounds,
+    )
+    spilled = cursor.fetchone()[0]
+    if spilled:
+        # The partition can't be created while the default one holds rows in its range
+        holding = f"{name}_moving"
+        cursor.execute(f"CREATE TEMPORARY TABLE {qn(holding)} (LIKE {qn(TABLE)})")
+        cursor.execute(
+            f"WITH moved AS (DELETE FROM {qn(DEFAULT_PARTITION)} "
+            f"WHERE created_at >= %s AND created_at < %s RETURNING *) "
+            f"INSERT INTO {qn(holding)} SELECT * FROM moved",
+            bounds,
+        )
+    cursor.execute(
+        f"CREATE TABLE {qn(name)} PARTITION OF {qn(TABLE)} FOR VALUES FROM (%s) TO (%s)",
+        bounds,
+    )
+    if spilled:
+        cursor.execute(f"INSERT INTO {qn(TABLE)} SELECT * FROM {qn(holding)}")
+        cursor.execute(f"DROP TABLE {qn(holding)}")
+
+
+def ensure_partitions(weeks_ahead: int = WEEKS_AHEAD) -> None:
+    """Create partitions for the current week and the next `weeks_ahead` weeks."""
+    first = week_start(timezone.now().date())
+    for i in range(weeks_ahead + 1):
+        with transaction.atomic(), connection.cursor() as cursor:
+            _create_week(cursor, first + timedelta(weeks=i))
+
+
+def _expired(cutoff: datetime) -> list[tuple[str, datetime]]:
+    """(name, week end) of weekly partitions that end at or before cutoff, oldest first."""
+    ends = [(name, _bound(start + timedelta(days=7))) for name, start in list_partitions()]
+    return [(name, end) for name, end in ends if end <= cutoff]
+
+
+def expired_boundary(cutoff: datetime) -> datetime | None:
+    """End of the newest partition drop_partitions_before(cutoff) would drop, or None."""
+    expired = _expired(cutoff)
+    return expired[-1][1] if expired else None
+
+
+def drop_partitions_before(cutoff: datetime) -> tuple[list[str], datetime | None]:
+    """
+    Detach and drop every weekly partition that ends at or before cutoff.
+    Returns (dropped partition names, end of the newest dropped week).
+    """
+    qn = connection.ops.quote_name
+    dropped: list[str] = []
+    boundary = None
+    for name, end in _expired(cutoff):
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(f"ALTER TABLE {qn(TABLE)} DETACH PARTITION {qn(name)}")
+            cursor.execute(f"DROP TABLE {qn(name)}")
+        dropped.append(name)
+        boundary = end
+    return dropped, boundary
+
+
+def purge_default_before(cutoff: datetime, visible_since: datetime) -> tuple[int, dict[int, int]]:
+    """
+    Delete default-partition rows older than cutoff. Returns (rows deleted,
+    {owner id: deleted unread alerts created at or after visible_since}).
+    """
+    qn = connection.ops.quote_name
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"WITH purged AS (DELETE FROM {qn(DEFAULT_PARTITION)} WHERE created_at < %s "
+            f"RETURNING owner_id, is_read, created_at) "
+            f"SELECT owner_id, count(*), count(*) FILTER (WHERE NOT is_read AND created_at >= %s) "
+            f"FROM purged GROUP BY owner_id",
+            [cutoff, visible_since],
+        )
+        rows = cursor.fetchall()
+    return sum(total for _, total, _ in rows), {owner_id: n for owner_id, _, n in rows if n}
+
+
+def convert_to_partitioned() -> int:
+    """
+    Rebuild notifications_alert as a weekly-partitioned table, copying existing
+    rows. Takes an exclusive lock for the duration; alerts are short-lived, so
+    the table is small. Returns the number of rows copied.
+    """
+    qn = connection.ops.quote_name
+    legacy = f"{TABLE}_unpartitioned"
+    seq = f"{TABLE}_pk_seq"
+    indexes = [
+        (index.name, index.fields) for index in Alert._meta.indexes
+    ]
+    fks = [
+        (field.column, field.related_model._meta.db_table)
+        for field in Alert._meta.concrete_fields
+        if field.is_relation
+    ]
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(f"LOCK TABLE {qn(TABLE)} IN ACCESS EXCLUSIVE MODE")
+        cursor.execute(f"SELECT min(created_at), coalesce(max(id), 0) FROM {qn(TABLE)}")
+        oldest, max_id = cursor.fetchone()
+        cursor.execute(f"ALTER TABLE {qn(TABLE)} RENAME TO {qn(legacy)}")
+        # Copies columns, NOT NULL and defaults but not the identity, PK or indexes
+        cursor.execute(
+            f"CREATE TABLE {qn(TABLE)} (LIKE {qn(legacy)} INCLUDING DEFAULTS) "
+            f"PARTITION BY RANGE (created_at)"
+        )
+        cursor.execute(f"CREATE SEQUENCE {qn(seq)} OWNED BY {qn(TABLE)}.id")
+        cursor.execute("SELECT setval(%s, %s, false)", [seq, max_id + 1])
+        cursor.execute(f"ALTER TABLE {qn(TABLE)} ALTER COLUMN id SET DEFAULT nextval(%s)", [seq])
+        cursor.execute(f"ALTER TABLE {qn(TABLE)} ADD PRIMARY KEY (id, created_at)")
+        cursor.execute(
+            f"CREATE TABLE {qn(DEFAULT_PARTITION)} PARTITION OF {qn(TABLE)} DEFAULT"
+        )
+        start = week_start((oldest or timezone.now()).date())
+        last = week_start(timezone.now().date()) + timedelta(weeks=WEEKS_AHEAD)
+        while start <= last:
+            _create_week(cursor, start)
+            start += timedelta(weeks=1)
+        cursor.execute(f"INSERT INTO {qn(TABLE)} SELECT * FROM {qn(legacy)}")
+        copied = cursor.rowcount
+        cursor.execute(f"DROP TABLE {qn(legacy)}")
+        # Recreate the model's indexes under their original names (legacy ones are gone)
+        for name, fields in indexes:
+            columns = ", ".join(
+                f"{qn(Alert._meta.get_field(f.lstrip('-')).column)}{' DESC' if f.startswith('-') else ''}"
+                for f in fields
+            )
+            cursor.execute(f"CREATE INDEX {qn(name)} ON {qn(TABLE)} ({columns})")
+        # Foreign keys last: deferred FK checks queued by the copy would block CREATE INDEX
+        for column, target in fks:
+            cursor.execute(
+                f"ALTER TABLE {qn(TABLE)} ADD CONSTRAINT {qn(f'{TABLE}_{column}_fk')} "
+                f"FOREIGN KEY ({qn(column)}) REFERENCES {qn(target)} (id) "
+                f"DEFERRABLE INITIALLY DEFERRED"
+            )
+            cursor.execute(
+                f"CREATE INDEX {qn(f'{TABLE}_{column}_idx')} ON {qn(TABLE)} ({qn(column)})"
+            )
+    return copied
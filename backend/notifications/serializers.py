@@ -1,14 +1,24 @@
 from __future__ import annotations
 
+from datetime import timedelta
+
+from django.utils import timezone
+from django.utils.functional import cached_property
 from rest_framework import serializers
 
 from .models import Alert
 
 
 class AlertSerializer(serializers.ModelSerializer):
+    """
+    Serializes alerts without touching related rows: FK ids come straight from
+    the *_id columns and time_ago uses one `now` per serializer, so a list of
+    any length costs only the list query itself.
+    """
+
     time_ago = serializers.SerializerMethodField()
-    related_booking_id = serializers.IntegerField(source='related_booking.id', read_only=True, allow_null=True)
-    related_client_id = serializers.IntegerField(source='related_client.id', read_only=True, allow_null=True)
+    related_booking_id = serializers.IntegerField(read_only=True, allow_null=True)
+    related_client_id = serializers.IntegerField(read_only=True, allow_null=True)
 
     class Meta:
         model = Alert
@@ -22,17 +32,19 @@ class AlertSerializer(serializers.ModelSerializer):
             'related_client_id',
             'created_at',
             'read_at',
+            'updated_at',
             'time_ago',
         ]
-        read_only_fields = ['id', 'created_at', 'read_at', 'time_ago']
+        read_only_fields = ['id', 'created_at', 'read_at', 'updated_at', 'time_ago']
+
+    @cached_property
+    def _now(self):
+        # Shared by every row of a many=True list (the child serializer is reused)
+        return self.context.get('now') or timezone.now()
 
     def get_time_ago(self, obj) -> str:
         """Calculate human-readable time ago."""
-        from django.utils import timezone
-        from datetime import timedelta
-
-        now = timezone.now()
-        diff = now - obj.created_at
+        diff = self._now - obj.created_at
 
         if diff < timedelta(minutes=1):
             return 'Just now'
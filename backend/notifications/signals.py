@@ -1,18 +1,28 @@
 from __future__ import annotations
 
+from django.contrib.auth import get_user_model
+from django.db import transaction
 from django.db.models.signals import post_save
 from django.dispatch import receiver
 import logging
 
-import requests
+from accounts.cache_versions import ALERTS, bump_version
 
-from .models import Alert
+from .counters import adjust_unread_count
+from .models import Alert, OutboundNotification
 from .serializers import AlertSerializer
 from .stream import push_alert_to_user
 
+User = get_user_model()
 logger = logging.getLogger(__name__)
 
 
+@receiver(post_save, sender=Alert)
+def _bump_alert_version(sender, instance: Alert, **kwargs) -> None:
+    # No post_delete receiver, so clear_all stays a single DELETE; views bump after bulk changes
+    bump_version(instance.owner_id, ALERTS)
+
+
 @receiver(post_save, sender=Alert)
 def on_alert_created(sender, instance: Alert, created: bool, **kwargs) -> None:
     if not created:
@@ -23,28 +33,50 @@ def on_alert_created(sender, instance: Alert, created: bool, **kwargs) -> None:
     except Exception:
         # Never break main flow due to notification streaming issues
         logger.exception("Failed pushing alert to SSE stream")
+    if not instance.is_read:
+        adjust_unread_count(instance.owner_id, 1)
 
     # Optionally send alert payload to an external webhook for SMS/WhatsApp/etc.
+    # Only queued here (same transaction as the alert); dispatch_notifications
+    # sends it. The insert runs in its own savepoint: alerts are often created
+    # inside the caller's atomic block, and a failed statement there would
+    # otherwise abort the caller's whole transaction.
     try:
-        owner = instance.owner
-        if not getattr(owner, "sms_notifications", False):
-            return
-        webhook_url = (getattr(owner, "sms_webhook_url", "") or "").strip()
+        if Alert.owner.is_cached(instance):
+            owner = instance.owner
+            if not owner.sms_notifications:
+                return
+            owner_email, webhook_url = owner.email, owner.sms_webhook_url
+        else:
+            # Only the two columns we need, and only when SMS is enabled
+            row = (
+                User.objects.filter(pk=instance.owner_id, sms_notifications=True)
+                .values_list("email", "sms_webhook_url")
+                .first()
+            )
+            if row is None:
+                return
+            owner_email, webhook_url = row
+        webhook_url = (webhook_url or "").strip()
         if not webhook_url:
             return
-
         data = {
             "id": instance.id,
             "type": instance.type,
             "title": instance.title,
             "message": instance.message,
-            "owner_email": owner.email,
+            "owner_email": owner_email,
             "related_booking_id": instance.related_booking_id,
             "related_client_id": instance.related_client_id,
             "created_at": instance.created_at.isoformat(),
         }
-        # Small timeout so we don't block request processing
-        requests.post(webhook_url, json=data, timeout=3)
+        with transaction.atomic():
+            OutboundNotification.objects.create(
+                owner_id=instance.owner_id,
+                alert_id=instance.id,
+                destination_url=webhook_url,
+                payload=data,
+            )
     except Exception:
         # Swallow external notification errors; they should not affect core app
-        logger.exception("Failed sending alert to external SMS/WhatsApp webhook")
+        logger.exception("Failed queueing alert for external SMS/WhatsApp webhook")
@@ -1,34 +1,165 @@
 """
 Server-Sent Events for live alerts.
-Maintains per-user queues; when an Alert is created, it is pushed to all
+Maintains per-user queues; when an Alert is created, it is published through
+the broker (see broker.py) and every process delivers it to all of its
 connected clients for that user.
+
+Two kinds of subscribers share the same registry:
+- SyncSubscriber for the sync (WSGI) stream, consumed by a blocking generator.
+- AsyncSubscriber for the ASGI stream, backed by an asyncio.Queue that is
+  fed thread-safely from whichever thread created the alert.
+
+Both buffer at most SSE_QUEUE_MAXSIZE payloads. Once full, further alerts are
+only counted (keeping the newest one), and the stream reports them as a
+single coalesced event, so memory per connection stays bounded under alert storms.
+Unread-count updates are not queued at all: only the latest value is kept
+and a wake-up marker nudges the consumer.
 """
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
 import queue
 import threading
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
 if TYPE_CHECKING:
     from .models import Alert
 
 logger = logging.getLogger(__name__)
 
-# user_id -> list of queue.Queue (one per SSE connection)
-_alert_queues: dict[int, list[queue.Queue]] = {}
+# Payloads buffered per SSE connection before alerts are only counted.
+SSE_QUEUE_MAXSIZE = 100
+
+# Queued to wake a consumer whose only news is a new unread count
+_WAKE = object()
+
+
+class _BoundedSubscriber:
+    """Overflow bookkeeping shared by both subscriber kinds."""
+
+    queue: queue.Queue | asyncio.Queue
+
+    def __init__(self) -> None:
+        self.dropped = 0
+        self.latest_dropped: dict | None = None
+        self.unread_count: int | None = None
+
+    def _record_overflow(self, item: Any) -> None:
+        if item is _WAKE:
+            # Buffer is non-empty, so the consumer is already awake
+            return
+        self.dropped += 1
+        self.latest_dropped = item
+
+    def take_dropped(self) -> tuple[int, dict | None]:
+        dropped, latest = self.dropped, self.latest_dropped
+        self.dropped, self.latest_dropped = 0, None
+        return dropped, latest
+
+    def take_unread_count(self) -> int | None:
+        count, self.unread_count = self.unread_count, None
+        return count
+
+
+class SyncSubscriber(_BoundedSubscriber):
+    """One WSGI SSE connection, read by a blocking generator in its worker thread."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.queue: queue.Queue = queue.Queue(maxsize=SSE_QUEUE_MAXSIZE)
+        self._overflow_lock = threading.Lock()
+
+    def put_nowait(self, item: Any) -> None:
+        try:
+            self.queue.put_nowait(item)
+        except queue.Full:
+            with self._overflow_lock:
+                self._record_overflow(item)
+
+    def set_unread_count(self, count: int) -> None:
+        with self._overflow_lock:
+            self.unread_count = count
+        self.put_nowait(_WAKE)
+
+    def take_dropped(self) -> tuple[int, dict | None]:
+        with self._overflow_lock:
+            return super().take_dropped()
+
+    def take_unread_count(self) -> int | None:
+        with self._overflow_lock:
+            return super().take_unread_count()
+
+
+class AsyncSubscriber(_BoundedSubscriber):
+    """
+    One ASGI SSE connection. Alerts are created in sync code (views run in a
+    worker thread under ASGI), so deliveries are handed to the connection's
+    event loop with call_soon_threadsafe instead of touching the queue directly.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop) -> None:
+        super().__init__()
+        self.loop = loop
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=SSE_QUEUE_MAXSIZE)
+
+    def _put(self, item: Any) -> None:
+        # Runs on self.loop, so no locking is needed
+        try:
+            self.queue.put_nowait(item)
+        except asyncio.QueueFull:
+            self._record_overflow(item)
+
+    def _set_unread(self, count: int) -> None:
+        self.unread_count = count
+        self._put(_WAKE)
+
+    def _call_in_loop(self, callback, arg: Any) -> None:
+        try:
+            self.loop.call_soon_threadsafe(callback, arg)
+        except RuntimeError:
+            # Event loop already closed (connection torn down mid-push)
+            pass
+
+    def put_nowait(self, item: Any) -> None:
+        self._call_in_loop(self._put, item)
+
+    def set_unread_count(self, count: int) -> None:
+        self._call_in_loop(self._set_unread, count)
+
+
+Subscriber = SyncSubscriber | AsyncSubscriber
+
+# user_id -> list of subscribers (one per SSE connection)
+_alert_queues: dict[int, list[Subscriber]] = {}
 _lock = threading.Lock()
 
 
-def register_queue(user_id: int) -> queue.Queue:
-    q: queue.Queue = queue.Queue()
+def _add_subscriber(user_id: int, subscriber: Subscriber) -> None:
+    from .broker import get_broker
+
+    # Start this process's listener on first use, so processes without SSE
+    # clients (management commands, workers) never hold one.
+    get_broker().start()
     with _lock:
-        _alert_queues.setdefault(user_id, []).append(q)
-    return q
+        _alert_queues.setdefault(user_id, []).append(subscriber)
+
+
+def register_queue(user_id: int) -> SyncSubscriber:
+    subscriber = SyncSubscriber()
+    _add_subscriber(user_id, subscriber)
+    return subscriber
+
+
+def register_async_queue(user_id: int) -> AsyncSubscriber:
+    """Register an asyncio-backed subscriber. Must be called from the connection's event loop."""
+    subscriber = AsyncSubscriber(asyncio.get_running_loop())
+    _add_subscriber(user_id, subscriber)
+    return subscriber
 
 
-def unregister_queue(user_id: int, q: queue.Queue) -> None:
+def unregister_queue(user_id: int, q: Subscriber) -> None:
     with _lock:
         if user_id in _alert_queues:
             try:
@@ -39,12 +170,42 @@ def unregister_queue(user_id: int, q: queue.Queue) -> None:
                 del _alert_queues[user_id]
 
 
+def take_backlog(subscriber: Subscriber, first: Any) -> tuple[list[dict], int, dict | None]:
+    """
+    Drain whatever is already buffered behind `first` without blocking.
+    Returns (buffered alert payloads in arrival order, overflow count, newest overflowed payload).
+    """
+    batch = [first]
+    while True:
+        try:
+            batch.append(subscriber.queue.get_nowait())
+        except (queue.Empty, asyncio.QueueEmpty):
+            break
+    dropped, latest_dropped = subscriber.take_dropped()
+    return [item for item in batch if item is not _WAKE], dropped, latest_dropped
+
+
 def push_alert_to_user(user_id: int, alert_payload: dict) -> None:
-    """Push a serialized alert to all SSE connections for this user."""
+    """Publish a serialized alert to all SSE connections for this user, in any process."""
+    from .broker import get_broker
+
+    get_broker().publish(user_id, {"alert": alert_payload})
+
+
+def push_unread_count_to_user(user_id: int, count: int) -> None:
+    """Publish the user's new unread-alert count to all of their SSE connections."""
+    from .broker import get_broker
+
+    get_broker().publish(user_id, {"unread_count": count})
+
+
+def deliver_local(user_id: int, message: dict) -> None:
+    """Hand a broker message to this process's SSE connections for this user."""
     with _lock:
         queues = list(_alert_queues.get(user_id, []))
     for q in queues:
-        try:
-            q.put_nowait(alert_payload)
-        except queue.Full:
-            pass
+        # Subscribers never raise on a full buffer; they count the overflow instead
+        if "alert" in message:
+            q.put_nowait(message["alert"])
+        if "unread_count" in message:
+            q.set_unread_count(message["unread_count"])
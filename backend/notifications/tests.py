@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from bookings.models import Booking, Service
+from clients.models import Client
+
+from .broker import InMemoryBroker, PostgresBroker
+from .models import Alert, OutboundNotification
+from .partitions import (
+    DEFAULT_PARTITION,
+    TABLE,
+    WEEKS_AHEAD,
+    convert_to_partitioned,
+    ensure_partitions,
+    week_start,
+)
+
+User = get_user_model()
+
+
+class AlertQueryCountTests(TestCase):
+    """Listing alerts and creating one cost a fixed number of queries."""
+
+    def setUp(self) -> None:
+        cache.clear()
+        # The default PostgresBroker would add a NOTIFY per published alert
+        patcher = mock.patch("notifications.broker._broker", InMemoryBroker())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.owner = User.objects.create_user(
+            email="owner@example.com",
+            password="secret-pass-123",
+            sms_notifications=True,
+            sms_webhook_url="https://hooks.example.com/alerts",
+        )
+        self.service = Service.objects.create(owner=self.owner, name="Cut", price=Decimal("20.00"))
+        self.api = APIClient()
+        self.api.force_authenticate(self.owner)
+
+    def _create_alerts(self, count: int) -> None:
+        start = timezone.now() + timedelta(days=1)
+        for i in range(count):
+            client = Client.objects.create(owner=self.owner, name=f"Client {i}")
+            booking = Booking.objects.create(
+                owner=self.owner,
+                client=client,
+                service=self.service,
+                starts_at=start + timedelta(hours=i),
+                ends_at=start + timedelta(hours=i, minutes=30),
+            )
+            Alert.objects.create(
+                owner=self.owner,
+                type="info",
+                title=f"Booking {i}",
+                message="New booking",
+                related_booking=booking,
+                related_client=client,
+            )
+
+    def _list_alerts(self) -> int:
+        # One SELECT of the page: no per-row booking/client lookups
+        with self.assertNumQueries(1):
+            response = self.api.get("/api/v1/alerts/")
+        self.assertEqual(response.status_code, 200)
+        return len(response.json())
+
+    def test_list_queries_do_not_grow_with_alerts(self) -> None:
+        self._create_alerts(1)
+        self.assertEqual(self._list_alerts(), 1)
+        self._create_alerts(9)
+        self.assertEqual(self._list_alerts(), 10)
+
+    def _alert(self, **kwargs) -> Alert:
+        return Alert.objects.create(type="info", title="Booking", message="New booking", **kwargs)
+
+    def test_on_alert_created_with_cached_owner(self) -> None:
+        # INSERT alert, then the webhook outbox row in a savepoint; preferences come from the instance
+        with self.assertNumQueries(4):
+            alert = self._alert(owner=self.owner)
+        self.assertTrue(OutboundNotification.objects.filter(alert_id=alert.pk).exists())
+
+    def test_on_alert_created_without_cached_owner(self) -> None:
+        # As above, plus one query for the owner's notification preferences
+        with self.assertNumQueries(5):
+            alert = self._alert(owner_id=self.owner.pk)
+        self.assertTrue(OutboundNotification.objects.filter(alert_id=alert.pk).exists())
+
+    def test_failed_outbox_insert_leaves_callers_transaction_usable(self) -> None:
+        # Longer than OutboundNotification.destination_url allows: the INSERT fails in PostgreSQL
+        self.owner.sms_webhook_url = "https://hooks.example.com/" + "x" * 600
+        with transaction.atomic():
+            with self.assertLogs("notifications.signals", "ERROR"):
+                alert = self._alert(owner=self.owner)
+            self.assertTrue(Alert.objects.for_owner(self.owner).filter(pk=alert.pk).exists())
+        self.assertFalse(OutboundNotification.objects.filter(alert_id=alert.pk).exists())
+
+    def test_failed_notify_leaves_callers_transaction_usable(self) -> None:
+        broker = PostgresBroker()
+        # PostgreSQL rejects NOTIFY on an empty channel name
+        broker.channel = ""
+        with mock.patch("notifications.broker._broker", broker), transaction.atomic():
+            with self.assertLogs("notifications.signals", "ERROR"):
+                alert = self._alert(owner=self.owner)
+            self.assertTrue(OutboundNotification.objects.filter(alert_id=alert.pk).exists())
+
+
+class AlertPartitionTests(TestCase):
+    """Rows that spill into the default partition are moved or purged, never stranded."""
+
+    def setUp(self) -> None:
+        convert_to_partitioned()
+        self.owner = User.objects.create_user(email="owner@example.com", password="secret-pass-123")
+
+    def _alert_at(self, created_at) -> Alert:
+        alert = Alert.objects.create(owner=self.owner, type="info", title="Alert", message="")
+        # auto_now_add can't be overridden on create; moving the row re-routes it
+        Alert.objects.unscoped().filter(pk=alert.pk).update(created_at=created_at)
+        return alert
+
+    def _partition_of(self, alert: Alert) -> str | None:
+        with connection.cursor() as cursor:
+            cursor.execute(f"SELECT tableoid::regclass::text FROM {TABLE} WHERE id = %s", [alert.pk])
+            row = cursor.fetchone()
+        return row[0] if row else None
+
+    def test_creating_a_week_moves_its_rows_out_of_the_default_partition(self) -> None:
+        later = timezone.now() + timedelta(weeks=WEEKS_AHEAD + 3)
+        alert = self._alert_at(later)
+        self.assertEqual(self._partition_of(alert), DEFAULT_PARTITION)
+        ensure_partitions(weeks_ahead=WEEKS_AHEAD + 3)
+        self.assertEqual(self._partition_of(alert), f"{TABLE}_p{week_start(later.date()):%Y%m%d}")
+
+    def test_delete_old_alerts_purges_expired_default_partition_rows(self) -> None:
+        old = self._alert_at(timezone.now() - timedelta(days=30))
+        recent = self._alert_at(timezone.now())
+        self.assertEqual(self._partition_of(old), DEFAULT_PARTITION)
+        call_command("delete_old_alerts", stdout=StringIO())
+        self.assertIsNone(self._partition_of(old))
+        self.assertIsNotNone(self._partition_of(recent))
@@ -1,9 +1,10 @@
 from __future__ import annotations
 
+from django.conf import settings
 from django.urls import path
 from rest_framework import routers
 
-from .views import AlertViewSet, alerts_stream
+from .views import AlertViewSet, alerts_stream, alerts_stream_async
 
 app_name = 'notifications'
 
@@ -13,7 +14,7 @@ router.register('', AlertViewSet, basename='alert')
 # List actions must be registered before router.urls so they match before the
 # detail route (which would otherwise capture "clear_all" etc. as pk and return 405 for POST)
 urlpatterns: list = [
-    path('stream/', alerts_stream),
+    path('stream/', alerts_stream_async if settings.ALERTS_STREAM_ASYNC else alerts_stream),
     path('clear_all/', AlertViewSet.as_view(actions={'post': 'clear_all'}), name='alert-clear-all'),
     path('mark_all_read/', AlertViewSet.as_view(actions={'post': 'mark_all_read'}), name='alert-mark-all-read'),
     path('unread_count/', AlertViewSet.as_view(actions={'get': 'unread_count'}), name='alert-unread-count'),
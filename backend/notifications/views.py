@@ -1,9 +1,12 @@
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
 from datetime import timedelta
 
+from asgiref.sync import sync_to_async
+from django.db import connection
 from django.http import HttpResponse, StreamingHttpResponse
 from django.utils import timezone
 from rest_framework import permissions, status, viewsets
@@ -11,30 +14,43 @@ from rest_framework.decorators import action
 from rest_framework.request import Request
 from rest_framework.response import Response
 
-from .models import Alert
+from accounts.cache_versions import ALERTS, bump_version
+
+from .counters import adjust_unread_count, get_unread_count, set_unread_count
+from .models import ALERT_RETENTION_DAYS, Alert
+from .pagination import AlertCursorPagination, changes_since
 from .serializers import AlertSerializer
-from .stream import register_queue, unregister_queue
+from .stream import register_async_queue, register_queue, take_backlog, unregister_queue
 
 logger = logging.getLogger(__name__)
 
-# Alerts older than this are excluded from the API (auto-removed from user's view)
-ALERT_RETENTION_DAYS = 7
+# Seconds of silence before an SSE comment is sent to keep proxies from closing the stream
+SSE_HEARTBEAT_SECONDS = 30
+
+# A backlog (buffered or replayed) of this many alerts is sent as one "N new alerts" event
+SSE_COALESCE_THRESHOLD = 10
 
 
 class AlertViewSet(viewsets.ReadOnlyModelViewSet):
     """
     ViewSet for managing alerts/notifications.
     Alerts older than 7 days are excluded and can be purged via management command.
+    The list is keyset-paginated when ?cursor= or ?page_size= is given, and
+    ?since=<cursor> returns only alerts created or changed since a previous sync.
     """
     serializer_class = AlertSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = AlertCursorPagination
 
     def get_queryset(self):
         """Return alerts for the current user (last 7 days only)."""
-        cutoff = timezone.now() - timedelta(days=ALERT_RETENTION_DAYS)
-        queryset = Alert.objects.filter(
-            owner=self.request.user,
-            created_at__gte=cutoff,
+        # When alerts are partitioned (see partitions.py), bounding created_at on
+        # both sides lets PostgreSQL prune to the one or two weekly partitions
+        # covering the window, skipping pre-created future weeks and the default.
+        now = timezone.now()
+        queryset = Alert.objects.for_owner(self.request.user).filter(
+            created_at__gte=now - timedelta(days=ALERT_RETENTION_DAYS),
+            created_at__lt=now + timedelta(days=1),
         )
 
         # Filter by read/unread status
@@ -50,6 +66,16 @@ class AlertViewSet(viewsets.ReadOnlyModelViewSet):
 
         return queryset.order_by('-created_at')
 
+    def list(self, request: Request, *args, **kwargs) -> Response:
+        if 'since' not in request.query_params:
+            return super().list(request, *args, **kwargs)
+        now = timezone.now()
+        alerts, since, has_more = changes_since(
+            self.get_queryset(), request.query_params.get('since'), now
+        )
+        serializer = self.get_serializer(alerts, many=True, context={**self.get_serializer_context(), 'now': now})
+        return Response({'results': serializer.data, 'since': since, 'has_more': has_more})
+
     @action(detail=True, methods=['post'])
     def mark_read(self, request: Request, pk: int = None) -> Response:
         """Mark a specific alert as read."""
@@ -59,31 +85,37 @@ class AlertViewSet(viewsets.ReadOnlyModelViewSet):
                 {'detail': 'Not found.'},
                 status=status.HTTP_404_NOT_FOUND,
             )
+        was_unread = not alert.is_read
         alert.mark_as_read()
+        if was_unread:
+            adjust_unread_count(request.user.id, -1)
         return Response(AlertSerializer(alert).data)
 
     @action(detail=False, methods=['post'])
     def mark_all_read(self, request: Request) -> Response:
-        """Mark all unread alerts as read."""
+        """Mark all unread alerts as read (last 7 days; older ones are never shown)."""
+        now = timezone.now()
+        cutoff = now - timedelta(days=ALERT_RETENTION_DAYS)
         updated = Alert.objects.filter(
             owner=request.user,
             is_read=False,
+            created_at__gte=cutoff,
         ).update(
             is_read=True,
-            read_at=timezone.now(),
+            read_at=now,
+            updated_at=now,
         )
+        set_unread_count(request.user.id, 0)
+        bump_version(request.user.id, ALERTS)
         return Response({'marked_read': updated})
 
     @action(detail=False, methods=['get'])
     def unread_count(self, request: Request) -> Response:
-        """Get count of unread alerts (last 7 days)."""
-        cutoff = timezone.now() - timedelta(days=ALERT_RETENTION_DAYS)
-        count = Alert.objects.filter(
-            owner=request.user,
-            is_read=False,
-            created_at__gte=cutoff,
-        ).count()
-        return Response({'count': count})
+        """
+        Get count of unread alerts (last 7 days), served from the cached counter.
+        The SSE stream also pushes it as an unread_count event, so polling is optional.
+        """
+        return Response({'count': get_unread_count(request.user.id)})
 
     @action(detail=False, methods=['post'])
     def clear_all(self, request: Request) -> Response:
@@ -93,6 +125,8 @@ class AlertViewSet(viewsets.ReadOnlyModelViewSet):
             owner=request.user,
             created_at__gte=cutoff,
         ).delete()
+        set_unread_count(request.user.id, 0)
+        bump_version(request.user.id, ALERTS)
         return Response({'deleted': deleted})
 
 
@@ -103,6 +137,8 @@ def _get_user_from_token(access_token: str):
 
     if not access_token:
         return None
+    from accounts.authentication import get_cached_user
+
     try:
         token = AccessToken(access_token)
         user_id = token.get("user_id")
@@ -110,33 +146,168 @@ def _get_user_from_token(access_token: str):
             return None
         from django.contrib.auth import get_user_model
         User = get_user_model()
-        return User.objects.filter(pk=user_id, is_active=True).first()
+        return get_cached_user(
+            user_id,
+            access_token,
+            lambda: User.objects.filter(pk=user_id, is_active=True).first(),
+        )
     except (InvalidToken, TokenError):
         return None
 
 
-def _event_stream(user_id: int):
-    """Generator yielding SSE events (new alerts or heartbeat)."""
+def _sse_alert(payload: dict) -> str:
+    # The alert id doubles as the SSE event id, so EventSource reconnects with Last-Event-ID
+    return f"id: {payload['id']}\ndata: {json.dumps(payload)}\n\n"
+
+
+def _sse_unread_count(count: int) -> str:
+    return f"event: unread_count\ndata: {json.dumps({'count': count})}\n\n"
+
+
+def _sse_coalesced(count: int, latest: dict) -> str:
+    data = json.dumps({"count": count, "latest": latest})
+    return f"id: {latest['id']}\nevent: alerts_coalesced\ndata: {data}\n\n"
+
+
+def _render_alerts(alerts: list[dict], extra: int = 0, latest: dict | None = None) -> str:
+    """
+    Render alerts (oldest first) as individual events, or as a single coalesced
+    event when there are too many or some were never buffered (`extra`).
+    """
+    latest = latest or (alerts[-1] if alerts else None)
+    if latest is None:
+        return ""
+    total = len(alerts) + extra
+    if extra or total >= SSE_COALESCE_THRESHOLD:
+        return _sse_coalesced(total, latest)
+    return "".join(_sse_alert(payload) for payload in alerts)
+
+
+def _parse_last_event_id(request) -> int | None:
+    raw = request.headers.get("Last-Event-ID") or request.GET.get("last_event_id") or ""
+    try:
+        return int(raw)
+    except ValueError:
+        return None
+
+
+def _replay_missed(user_id: int, last_event_id: int | None) -> tuple[str, int]:
+    """
+    Current unread count, then alerts created after last_event_id while the
+    client was disconnected, read from the (owner, -created_at) index.
+    Returns (SSE text, highest id sent).
+    """
+    unread = _sse_unread_count(get_unread_count(user_id))
+    if last_event_id is None:
+        return unread, 0
+    cutoff = timezone.now() - timedelta(days=ALERT_RETENTION_DAYS)
+    missed = Alert.objects.filter(
+        owner_id=user_id,
+        created_at__gte=cutoff,
+        pk__gt=last_event_id,
+    ).order_by('-created_at')
+    recent = list(missed[:SSE_COALESCE_THRESHOLD])
+    if not recent:
+        return unread, last_event_id
+    payloads = AlertSerializer(reversed(recent), many=True).data
+    extra = missed.count() - len(recent) if len(recent) == SSE_COALESCE_THRESHOLD else 0
+    sent_id = max(last_event_id, *(payload['id'] for payload in payloads))
+    text = _render_alerts(list(payloads), extra, payloads[-1] if extra else None)
+    return unread + text, sent_id
+
+
+def _replay_and_release(user_id: int, last_event_id: int | None) -> tuple[str, int]:
+    """
+    _replay_missed, then close this thread's DB connection: the stream may stay
+    open for hours without touching the database, and a persistent connection
+    (or PgBouncer server slot) shouldn't sit idle behind it meanwhile.
+    """
+    try:
+        return _replay_missed(user_id, last_event_id)
+    finally:
+        connection.close()
+
+
+def _render_backlog(subscriber, first, last_sent_id: int) -> tuple[str, int]:
+    """
+    Render `first` plus anything queued or overflowed behind it, skipping
+    already-replayed ids, followed by the latest unread count if it changed.
+    """
+    batch, dropped, latest_dropped = take_backlog(subscriber, first)
+    fresh = [payload for payload in batch if payload.get('id', 0) > last_sent_id]
+    text = _render_alerts(fresh, dropped, latest_dropped)
+    unread = subscriber.take_unread_count()
+    if unread is not None:
+        text += _sse_unread_count(unread)
+    newest = latest_dropped or (fresh[-1] if fresh else None)
+    return text, max(last_sent_id, newest['id']) if newest else last_sent_id
+
+
+def _event_stream(user_id: int, last_event_id: int | None = None):
+    """Generator yielding SSE events (missed alerts on reconnect, new alerts, or heartbeat)."""
     import queue
-    q = register_queue(user_id)
+    # Register before replaying so nothing created in between is lost
+    subscriber = register_queue(user_id)
     try:
+        text, last_sent_id = _replay_and_release(user_id, last_event_id)
+        if text:
+            yield text
         while True:
             try:
-                payload = q.get(timeout=30)
-                yield f"data: {json.dumps(payload)}\n\n"
+                first = subscriber.queue.get(timeout=SSE_HEARTBEAT_SECONDS)
             except queue.Empty:
                 yield ": heartbeat\n\n"
+                continue
+            text, last_sent_id = _render_backlog(subscriber, first, last_sent_id)
+            if text:
+                yield text
     except GeneratorExit:
         pass
     finally:
-        unregister_queue(user_id, q)
+        unregister_queue(user_id, subscriber)
+
+
+async def _async_event_stream(user_id: int, last_event_id: int | None = None):
+    """
+    Async generator yielding SSE events (missed alerts on reconnect, new alerts, or heartbeat).
+    Holds no thread while idle; on client disconnect the ASGI handler cancels
+    the iteration and the subscriber is unregistered in finally.
+    """
+    subscriber = register_async_queue(user_id)
+    try:
+        text, last_sent_id = await sync_to_async(_replay_and_release)(user_id, last_event_id)
+        if text:
+            yield text
+        while True:
+            try:
+                first = await asyncio.wait_for(
+                    subscriber.queue.get(), timeout=SSE_HEARTBEAT_SECONDS
+                )
+            except asyncio.TimeoutError:
+                yield ": heartbeat\n\n"
+                continue
+            text, last_sent_id = _render_backlog(subscriber, first, last_sent_id)
+            if text:
+                yield text
+    finally:
+        unregister_queue(user_id, subscriber)
+
+
+def _sse_response(stream) -> StreamingHttpResponse:
+    response = StreamingHttpResponse(stream, content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
 
 
 def alerts_stream(request) -> HttpResponse:
     """
     Server-Sent Events stream for live alerts.
     Requires ?access_token=<jwt> (EventSource does not send custom headers).
+    Each alert carries its id as the SSE id; on reconnect the browser sends
+    Last-Event-ID and alerts missed in between are replayed first.
     Plain Django view to avoid DRF content negotiation (which returns 406 for Accept: text/event-stream).
+    Under WSGI each open stream occupies a worker thread; see alerts_stream_async for ASGI.
     """
     if request.method != "GET":
         return HttpResponse(status=405)
@@ -144,10 +315,20 @@ def alerts_stream(request) -> HttpResponse:
     user = _get_user_from_token(access_token)
     if not user:
         return HttpResponse(status=401)
-    response = StreamingHttpResponse(
-        _event_stream(user.id),
-        content_type="text/event-stream",
-    )
-    response["Cache-Control"] = "no-cache"
-    response["X-Accel-Buffering"] = "no"
-    return response
+    return _sse_response(_event_stream(user.id, _parse_last_event_id(request)))
+
+
+async def alerts_stream_async(request) -> HttpResponse:
+    """
+    ASGI variant of alerts_stream with the same ?access_token=<jwt> contract.
+    Idle connections are just an asyncio.Queue awaiting on the event loop, so a
+    single process can hold thousands of them. Only usable under config.asgi;
+    selected via settings.ALERTS_STREAM_ASYNC.
+    """
+    if request.method != "GET":
+        return HttpResponse(status=405)
+    access_token = request.GET.get("access_token") or request.GET.get("token")
+    user = await sync_to_async(_get_user_from_token)(access_token)
+    if not user:
+        return HttpResponse(status=401)
+    return _sse_response(_async_event_stream(user.id, _parse_last_event_id(request)))
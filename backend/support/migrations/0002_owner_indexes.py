@@ -0,0 +1,19 @@
+# Generated by Django 5.0.14 on 2026-10-19 18:24
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('support', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='supportrequest',
+            index=models.Index(fields=['owner', '-created_at'], name='support_sup_owner_i_d4e30d_idx'),
+        ),
+    ]
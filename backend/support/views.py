@@ -15,7 +15,7 @@ class SupportRequestViewSet(viewsets.ModelViewSet):
     permission_classes = [permissions.IsAuthenticated]
 
     def get_queryset(self):
-        return SupportRequest.objects.filter(owner=self.request.user).order_by(
+        return SupportRequest.objects.for_owner(self.request.user).order_by(
             "-created_at"
         )
 
@@ -1,6 +1,6 @@
 'use client';
 
-import { useState, useRef, useEffect, useMemo } from 'react';
+import { useState, useRef, useEffect, useMemo, useCallback } from 'react';
 import Link from 'next/link';
 import { usePathname, useRouter } from 'next/navigation';
 import { Bell, User, Settings, LogOut, Search, X, Menu } from 'lucide-react';
@@ -28,6 +28,8 @@ interface MenuItem {
 export default function TopBar() {
   const [notificationsOpen, setNotificationsOpen] = useState(false);
   const [notifications, setNotifications] = useState<Notification[]>([]);
+  // Server-side unread total (last 7 days), pushed over SSE; null until the stream reports it
+  const [serverUnreadCount, setServerUnreadCount] = useState<number | null>(null);
   const [userMenuOpen, setUserMenuOpen] = useState(false);
   const [mobileNavOpen, setMobileNavOpen] = useState(false);
   const [searchQuery, setSearchQuery] = useState('');
@@ -50,36 +52,37 @@ export default function TopBar() {
       .toUpperCase() ||
     'EL';
 
-  // Load initial alerts for notification dropdown
+  // Load unread alerts for notification dropdown
+  const loadAlerts = useCallback(async () => {
+    try {
+      const res = await authenticatedFetch(
+        `${API_BASE_URL}/api/v1/alerts/?is_read=false`,
+      );
+      if (!res.ok) return;
+      const data = (await res.json()) as Array<{
+        id: number;
+        title: string;
+        message: string;
+        time_ago: string;
+        is_read: boolean;
+      }>;
+      const mapped: Notification[] = data.map((a) => ({
+        id: a.id,
+        title: a.title,
+        message: a.message,
+        time: a.time_ago || '',
+        unread: !a.is_read,
+      }));
+      setNotifications(mapped);
+    } catch (err) {
+      console.error('Failed to load alerts for notifications:', err);
+    }
+  }, []);
+
   useEffect(() => {
     if (typeof window === 'undefined') return;
-    const loadAlerts = async () => {
-      try {
-        const res = await authenticatedFetch(
-          `${API_BASE_URL}/api/v1/alerts/?is_read=false`,
-        );
-        if (!res.ok) return;
-        const data = (await res.json()) as Array<{
-          id: number;
-          title: string;
-          message: string;
-          time_ago: string;
-          is_read: boolean;
-        }>;
-        const mapped: Notification[] = data.map((a) => ({
-          id: a.id,
-          title: a.title,
-          message: a.message,
-          time: a.time_ago || '',
-          unread: !a.is_read,
-        }));
-        setNotifications(mapped);
-      } catch (err) {
-        console.error('Failed to load alerts for notifications:', err);
-      }
-    };
     loadAlerts();
-  }, []);
+  }, [loadAlerts]);
 
   // Live alerts via Server-Sent Events (SSE)
   useEffect(() => {
@@ -121,6 +124,20 @@ export default function TopBar() {
       }
     };
 
+    es.addEventListener('unread_count', (event) => {
+      try {
+        const { count } = JSON.parse((event as MessageEvent).data) as { count: number };
+        setServerUnreadCount(count);
+      } catch (err) {
+        console.error('Failed to parse unread count event:', err);
+      }
+    });
+
+    // Bursts arrive as one "N new alerts" event; refetch instead of replaying each alert
+    es.addEventListener('alerts_coalesced', () => {
+      loadAlerts();
+    });
+
     es.onerror = (err) => {
       console.error('Alerts stream error:', err);
     };
@@ -128,7 +145,7 @@ export default function TopBar() {
     return () => {
       es.close();
     };
-  }, []);
+  }, [loadAlerts]);
 
   // Close dropdowns when clicking outside
   useEffect(() => {
@@ -157,7 +174,8 @@ export default function TopBar() {
     return () => document.removeEventListener('mousedown', handleClickOutside);
   }, []);
 
-  const unreadCount = notifications.filter((n) => n.unread).length;
+  const unreadCount =
+    serverUnreadCount ?? notifications.filter((n) => n.unread).length;
 
   const searchTargets = useMemo(
     () => [